@@ -9,8 +9,7 @@ from pathlib import Path
 
 # Add backend to path
 sys.path.append(str(Path(__file__).parent))
-from backend.data_loader import DataLoader
-from backend.ml_predictor import MLPredictor
+from frontend.market_views import load_indicator_data, price_action_figure
 
 # Page configuration
 st.set_page_config(
@@ -51,12 +50,6 @@ st.markdown("""
     </style>
     """, unsafe_allow_html=True)
 
-# Initialize session state
-if 'data_loader' not in st.session_state:
-    st.session_state.data_loader = DataLoader()
-if 'ml_predictor' not in st.session_state:
-    st.session_state.ml_predictor = MLPredictor()
-
 # Main content
 st.title("AI Technical Analysis")
 st.subheader("Welcome to the AI-powered Technical Analysis Platform")
@@ -82,49 +75,47 @@ with col2:
 # Fetch initial data
 if symbol:
     with st.spinner("Loading market data..."):
-        data = st.session_state.data_loader.get_market_data(symbol, timeframe)
+        # Cached per (symbol, timeframe), so other widget events don't fetch again
+        data = load_indicator_data(symbol, timeframe)
         if data is not None:
-            data = st.session_state.data_loader.get_technical_indicators(data)
-            if data is not None:
-                # Display current price and metrics
-                col1, col2, col3 = st.columns(3)
-                with col1:
-                    st.metric(
-                        "Current Price",
-                        f"${data['Close'].iloc[-1]:.2f}",
-                        f"{((data['Close'].iloc[-1] / data['Close'].iloc[-2]) - 1):.2%}"
-                    )
-                with col2:
-                    st.metric(
-                        "Volume",
-                        f"{data['Volume'].iloc[-1]:,.0f}",
-                        f"{((data['Volume'].iloc[-1] / data['Volume'].iloc[-2]) - 1):.2%}"
-                    )
-                with col3:
-                    st.metric(
-                        "RSI",
-                        f"{data['RSI'].iloc[-1]:.2f}",
-                        "Overbought" if data['RSI'].iloc[-1] > 70 else "Oversold" if data['RSI'].iloc[-1] < 30 else "Neutral"
-                    )
+            # Display current price and metrics
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                st.metric(
+                    "Current Price",
+                    f"${data['Close'].iloc[-1]:.2f}",
+                    f"{((data['Close'].iloc[-1] / data['Close'].iloc[-2]) - 1):.2%}"
+                )
+            with col2:
+                st.metric(
+                    "Volume",
+                    f"{data['Volume'].iloc[-1]:,.0f}",
+                    f"{((data['Volume'].iloc[-1] / data['Volume'].iloc[-2]) - 1):.2%}"
+                )
+            with col3:
+                st.metric(
+                    "RSI",
+                    f"{data['RSI'].iloc[-1]:.2f}",
+                    "Overbought" if data['RSI'].iloc[-1] > 70 else "Oversold" if data['RSI'].iloc[-1] < 30 else "Neutral"
+                )
 
-                # Display candlestick chart
-                st.subheader("Price Action")
-                fig = go.Figure(data=[go.Candlestick(
-                    x=data.index,
-                    open=data['Open'],
-                    high=data['High'],
-                    low=data['Low'],
-                    close=data['Close']
-                )])
-                fig.update_layout(
-                    template="plotly_dark",
-                    plot_bgcolor="#222831",
-                    paper_bgcolor="#222831",
-                    title=f"{symbol} Price Action",
-                    xaxis_title="Date",
-                    yaxis_title="Price ($)",
-                    showlegend=True
+            # Display candlestick chart
+            st.subheader("Price Action")
+            first_day, last_day = data.index[0].date(), data.index[-1].date()
+            x_range = None
+            if first_day < last_day:
+                zoom = st.slider(
+                    "Zoom",
+                    min_value=first_day,
+                    max_value=last_day,
+                    value=(first_day, last_day),
+                    format="YYYY-MM-DD"
                 )
+                # The full range is the shared cached chart; a narrower one shows every bar in it
+                if zoom != (first_day, last_day):
+                    x_range = (zoom[0].isoformat(), zoom[1].isoformat())
+            fig = price_action_figure(symbol, timeframe, x_range)
+            if fig is not None:
                 st.plotly_chart(fig, use_container_width=True)
 
 # Feature cards
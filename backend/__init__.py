@@ -0,0 +1,7 @@
+"""Data, indicator, model and forecasting code shared by the Streamlit pages.
+
+yfinance, scipy, scikit-learn, joblib and prophet take most of a page's
+import time, so backend modules import them at the top of the functions
+that use them instead of at module level. Pages only pay for them on their
+first fetch, indicator or fit; benchmarks/IMPORT_TIME.md has the numbers.
+"""
@@ -1,6 +1,18 @@
-from prophet import Prophet
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
 import pandas as pd
-from typing import Tuple, Dict
+from typing import TYPE_CHECKING, Tuple, Dict, Optional
+
+from backend.shared_cache import estimate_size
+
+if TYPE_CHECKING:
+    from prophet import Prophet
+
+# Refit from the previous model's parameters when at most this many rows were appended
+WARM_START_MAX_ROWS = 30
 
 def prepare_data_for_prophet(data: pd.DataFrame) -> pd.DataFrame:
     """Prepare stock data for Prophet model"""
@@ -9,13 +21,185 @@ def prepare_data_for_prophet(data: pd.DataFrame) -> pd.DataFrame:
         'y': data['Close']
     })
 
-def train_prophet_model(data: pd.DataFrame) -> Prophet:
-    """Train Prophet model"""
-    model = Prophet()
-    model.fit(data)
+def prophet_fingerprint(data: pd.DataFrame) -> tuple:
+    """Cheap identity of a Prophet frame: first and last date, row count and last value"""
+    if not len(data):
+        return None, None, 0, None
+    return str(data['ds'].iloc[0]), str(data['ds'].iloc[-1]), len(data), float(data['y'].iloc[-1])
+
+def stan_init(model: 'Prophet') -> Dict:
+    """Get a fitted model's parameters as initial values for the next fit"""
+    params = {name: model.params[name][0][0] for name in ['k', 'm', 'sigma_obs']}
+    params.update({name: model.params[name][0] for name in ['delta', 'beta']})
+    return params
+
+def _read_model(path: Path) -> 'Prophet':
+    """Load a model ProphetModelCache wrote as Prophet JSON"""
+    from prophet.serialize import model_from_json
+
+    return model_from_json(path.read_text())
+
+def _model_json(model: 'Prophet') -> str:
+    from prophet.serialize import model_to_json
+
+    return model_to_json(model)
+
+class ProphetModelCache:
+    """LRU cache of fitted Prophet models keyed by ticker, data fingerprint and config.
+
+    Models are also written to persist_dir as Prophet JSON when it is set. The
+    latest model of each ticker and config is remembered for warm starts.
+    """
+
+    def __init__(self, max_entries: int = 16, persist_dir: Optional[Path] = None):
+        self.max_entries = max_entries
+        self.persist_dir = Path(persist_dir) if persist_dir else None
+        self._entries = OrderedDict()
+        self._sizes = {}
+        self._latest = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _hash(raw) -> str:
+        return hashlib.sha1(repr(raw).encode()).hexdigest()
+
+    def make_key(self, ticker: Optional[str], data: pd.DataFrame, config: Dict) -> str:
+        """Build a stable key for a ticker, Prophet frame and model config"""
+        return self._hash((ticker, prophet_fingerprint(data), sorted(config.items())))
+
+    def series_key(self, ticker: Optional[str], config: Dict) -> str:
+        """Build the key under which the latest model of a ticker and config is remembered"""
+        return self._hash((ticker, sorted(config.items())))
+
+    def _path(self, key: str) -> Path:
+        return self.persist_dir / f"{key}.json"
+
+    def get(self, key: str) -> Optional['Prophet']:
+        """Get a cached model, falling back to disk, or None"""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key]
+
+        if self.persist_dir is None or not self._path(key).exists():
+            return None
+        try:
+            model = _read_model(self._path(key))
+        except Exception:
+            return None
+        self._remember(key, model)
+        return model
+
+    def put(self, key: str, model: 'Prophet', series_key: str = None) -> None:
+        """Cache a fitted model, evicting the least recently used ones"""
+        self._remember(key, model)
+        if series_key is not None:
+            with self._lock:
+                self._latest[series_key] = key
+        if self.persist_dir is not None:
+            self.persist_dir.mkdir(parents=True, exist_ok=True)
+            self._write(self._path(key), _model_json(model))
+            if series_key is not None:
+                self._write(self.persist_dir / f"{series_key}.latest", key)
+
+    def latest(self, series_key: str) -> Optional['Prophet']:
+        """Get the most recently fitted model of a ticker and config, or None"""
+        with self._lock:
+            key = self._latest.get(series_key)
+        if key is None and self.persist_dir is not None:
+            pointer = self.persist_dir / f"{series_key}.latest"
+            key = pointer.read_text().strip() if pointer.exists() else None
+        return self.get(key) if key else None
+
+    @staticmethod
+    def _write(path: Path, text: str) -> None:
+        tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp_path.write_text(text)
+        os.replace(tmp_path, path)
+
+    def _remember(self, key: str, model: 'Prophet') -> None:
+        # Sizing pickles the model, so it is done once here rather than on every describe()
+        size = estimate_size(model)
+        with self._lock:
+            self._entries[key] = model
+            self._sizes[key] = size
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                evicted, _ = self._entries.popitem(last=False)
+                self._sizes.pop(evicted, None)
+
+    def describe(self) -> list:
+        """Get the key, estimated size and history length of every model in memory"""
+        with self._lock:
+            entries = [(key, model, self._sizes[key]) for key, model in self._entries.items()]
+        return [
+            {
+                'key': key,
+                'type': type(model).__name__,
+                'bytes': size,
+                'history_rows': len(model.history) if getattr(model, 'history', None) is not None else 0
+            }
+            for key, model, size in entries
+        ]
+
+    def clear(self) -> None:
+        """Drop every cached model, including persisted ones"""
+        with self._lock:
+            self._entries.clear()
+            self._sizes.clear()
+            self._latest.clear()
+        if self.persist_dir is not None and self.persist_dir.exists():
+            for path in [*self.persist_dir.glob("*.json"), *self.persist_dir.glob("*.latest")]:
+                path.unlink(missing_ok=True)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+# Shared by every session in the process; set AITA_MODEL_DIR to persist models
+default_prophet_cache = ProphetModelCache(
+    persist_dir=Path(os.environ["AITA_MODEL_DIR"]) / "prophet" if os.environ.get("AITA_MODEL_DIR") else None
+)
+
+def _can_warm_start(previous: 'Prophet', data: pd.DataFrame) -> bool:
+    """Check that data only appends a few rows to the previous model's history"""
+    history = previous.history
+    if history is None or not len(history) or not len(data):
+        return False
+    appended = len(data) - len(history)
+    return (
+        0 <= appended <= WARM_START_MAX_ROWS
+        and pd.Timestamp(data['ds'].iloc[0]) == history['ds'].iloc[0]
+        and pd.Timestamp(history['ds'].iloc[-1]) in set(pd.to_datetime(data['ds']))
+    )
+
+def train_prophet_model(data: pd.DataFrame, ticker: str = None, config: Dict = None,
+                        warm_start: bool = True, cache: ProphetModelCache = None) -> 'Prophet':
+    """Train Prophet model, reusing a cached fit of the same data.
+
+    When the ticker's previous model covers all but a few appended rows, the
+    refit starts from that model's parameters instead of from scratch.
+    """
+    from prophet import Prophet
+
+    config = config or {}
+    cache = cache if cache is not None else default_prophet_cache
+    key = cache.make_key(ticker, data, config)
+    model = cache.get(key)
+    if model is not None:
+        return model
+
+    series_key = cache.series_key(ticker, config)
+    previous = cache.latest(series_key) if warm_start else None
+    
+    model = Prophet(**config)
+    if previous is not None and _can_warm_start(previous, data):
+        model.fit(data, init=stan_init(previous))
+    else:
+        model.fit(data)
+    cache.put(key, model, series_key)
     return model
 
-def make_predictions(model: Prophet, periods: int = 30) -> Tuple[pd.DataFrame, Dict]:
+def make_predictions(model: 'Prophet', periods: int = 30) -> Tuple[pd.DataFrame, Dict]:
     """Make predictions using Prophet model"""
     future = model.make_future_dataframe(periods=periods)
     forecast = model.predict(future)
@@ -0,0 +1,128 @@
+import asyncio
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Iterable, Optional, Tuple
+
+import pandas as pd
+
+from backend.data_loader import (
+    DataLoader, fetch_download, fetch_history, normalize_symbol, resolve_period, slice_period
+)
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncMarketDataClient:
+    """Fetches many symbols and intervals concurrently with bounded concurrency.
+
+    yfinance is synchronous, so each request runs on the client's own thread
+    pool while the semaphore caps how many are in flight. yfinance keeps one
+    shared HTTP session per process, so all requests reuse its connections.
+    Frames have the same shape as DataLoader.get_market_data, but failures
+    return None instead of demo data and nothing is written to Streamlit.
+    """
+
+    def __init__(self, max_concurrency: int = 8, timeout: float = 15.0, use_store: bool = True):
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self.use_store = use_store
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="market-data")
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def close(self) -> None:
+        """Release the worker threads"""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    async def get_market_data(self, symbol: str, period: str = '1y', interval: str = '1d') -> Optional[pd.DataFrame]:
+        """Fetch one symbol, or None on failure or timeout"""
+        actual_period = resolve_period(period)
+        symbol = normalize_symbol(symbol)
+        loop = asyncio.get_running_loop()
+
+        async with self._semaphore:
+            try:
+                # A timed-out call keeps its worker thread until yfinance returns,
+                # but its semaphore slot is released for the next request
+                return await asyncio.wait_for(
+                    loop.run_in_executor(self._executor, self._fetch, symbol, actual_period, interval),
+                    self.timeout
+                )
+            except asyncio.TimeoutError:
+                logger.debug(f"Timed out fetching {symbol} ({interval})")
+            except Exception as e:
+                logger.debug(f"Error fetching {symbol} ({interval}): {str(e)}")
+        return None
+
+    async def get_many(self, symbols: Iterable[str], period: str = '1y',
+                       intervals: Iterable[str] = ('1d',)) -> Dict[Tuple[str, str], Optional[pd.DataFrame]]:
+        """Fetch every symbol/interval pair concurrently, keyed by (symbol, interval)"""
+        keys = [(normalize_symbol(symbol), interval) for symbol in symbols for interval in intervals]
+        keys = list(dict.fromkeys(keys))
+        frames = await asyncio.gather(
+            *(self.get_market_data(symbol, period, interval) for symbol, interval in keys)
+        )
+        return dict(zip(keys, frames))
+
+    def _fetch(self, symbol: str, actual_period: str, interval: str) -> Optional[pd.DataFrame]:
+        """Blocking fetch run on the worker threads"""
+        if self.use_store:
+            data = DataLoader._load_from_store(symbol, actual_period, interval)
+            if data is not None:
+                return data
+
+        data = fetch_history(symbol, interval, period=actual_period)
+        if data.empty:
+            data = fetch_download(symbol, interval, period=actual_period)
+        if data.empty:
+            return None
+
+        if self.use_store:
+            return slice_period(DataLoader.store.append(symbol, interval, data), actual_period)
+        return data
+
+
+class BackgroundLoop:
+    """An event loop on a daemon thread, for running coroutines from Streamlit scripts"""
+
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self.loop.run_forever, name="asyncio-background", daemon=True)
+        self._thread.start()
+
+    def submit(self, coro) -> Future:
+        """Schedule a coroutine and return a concurrent future for its result"""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def run(self, coro, timeout: float = None):
+        """Run a coroutine on the background loop and wait for its result"""
+        return self.submit(coro).result(timeout)
+
+
+_BACKGROUND_LOOP = None
+_BACKGROUND_LOCK = threading.Lock()
+
+
+def get_background_loop() -> BackgroundLoop:
+    """Get the process-wide background event loop, starting it on first use"""
+    global _BACKGROUND_LOOP
+    with _BACKGROUND_LOCK:
+        if _BACKGROUND_LOOP is None:
+            _BACKGROUND_LOOP = BackgroundLoop()
+        return _BACKGROUND_LOOP
+
+
+def refresh_symbols(symbols: Iterable[str], period: str = '1y', intervals: Iterable[str] = ('1d',),
+                    max_concurrency: int = 8, timeout: float = 15.0) -> Dict[Tuple[str, str], Optional[pd.DataFrame]]:
+    """Fetch many symbols concurrently from synchronous code"""
+    async def fetch_all():
+        async with AsyncMarketDataClient(max_concurrency, timeout) as client:
+            return await client.get_many(symbols, period, intervals)
+
+    return get_background_loop().run(fetch_all())
@@ -0,0 +1,147 @@
+import numpy as np
+import pandas as pd
+from dataclasses import dataclass
+from typing import Callable, Dict, Union
+
+from backend.indicator_engine import IndicatorEngine, _as_float_array, _ffill
+
+# Signal functions take an IndicatorEngine over a (time x symbol) close matrix
+# plus keyword parameters and return the target position for each bar (0 = flat,
+# 1 = long). A position set on a bar's close earns the next bar's return.
+SignalFunction = Callable[..., np.ndarray]
+
+TRADING_DAYS = 252
+
+
+def sma_crossover(engine: IndicatorEngine, fast: int = 20, slow: int = 50) -> np.ndarray:
+    """Long while the fast SMA is above the slow SMA"""
+    return (engine.sma(fast) > engine.sma(slow)).astype(np.float64)
+
+
+def rsi_reversion(engine: IndicatorEngine, window: int = 14, lower: float = 30, upper: float = 70) -> np.ndarray:
+    """Buy when RSI falls below lower (oversold), hold until it rises above upper (overbought)"""
+    rsi = engine.rsi(window)
+    state = np.where(rsi < lower, 1.0, np.where(rsi > upper, 0.0, np.nan))
+    return np.nan_to_num(_ffill(state))
+
+
+def macd_crossover(engine: IndicatorEngine, fast: int = 12, slow: int = 26, signal: int = 9) -> np.ndarray:
+    """Long while the MACD line is above its signal line"""
+    line, signal_line = engine.macd(fast, slow, signal, fast_min_periods=fast,
+                                    slow_min_periods=slow, signal_min_periods=signal)
+    return (line > signal_line).astype(np.float64)
+
+
+# Strategies offered on the Trading Strategies page
+STRATEGIES: Dict[str, SignalFunction] = {
+    "Moving Average Crossover": sma_crossover,
+    "RSI Strategy": rsi_reversion,
+    "MACD Strategy": macd_crossover,
+}
+
+
+@dataclass
+class BacktestResult:
+    """Per-symbol backtest output, each frame indexed like the close panel"""
+    close: pd.DataFrame
+    positions: pd.DataFrame
+    returns: pd.DataFrame
+    equity: pd.DataFrame
+    drawdown: pd.DataFrame
+    trades: pd.DataFrame
+
+    def summary(self) -> pd.DataFrame:
+        """Total return, Sharpe ratio, max drawdown, trade count and win rate per symbol"""
+        columns = self.close.columns
+        with np.errstate(invalid='ignore', divide='ignore'):
+            sharpe = self.returns.mean() / self.returns.std() * np.sqrt(TRADING_DAYS)
+        closed = self.trades[~self.trades['open']]
+        return pd.DataFrame({
+            'total_return': self.equity.iloc[-1] - 1,
+            'sharpe_ratio': sharpe,
+            'max_drawdown': self.drawdown.min(),
+            'trades': self.trades['symbol'].value_counts().reindex(columns, fill_value=0),
+            'win_rate': (closed['return'] > 0).groupby(closed['symbol']).mean().reindex(columns),
+        }, index=columns)
+
+
+def backtest_arrays(close: np.ndarray, positions: np.ndarray, fee: float = 0.0) -> Dict[str, np.ndarray]:
+    """Backtest positions over a (time x symbol) close matrix, returning raw arrays.
+
+    Bars without a close (e.g. before a symbol listed) are forced flat. fee is
+    charged as a fraction of the position change on the bar it happens.
+    """
+    close = _as_float_array(close)
+    return strategy_arrays(asset_returns(close), np.isnan(close), positions, fee)
+
+
+def asset_returns(close: np.ndarray) -> np.ndarray:
+    """Bar-to-bar close returns, zero where a close is missing"""
+    close = _as_float_array(close)
+    out = np.zeros_like(close)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        out[1:] = close[1:] / _ffill(close)[:-1] - 1
+    out[~np.isfinite(out)] = 0.0
+    return out
+
+
+def strategy_arrays(bar_returns: np.ndarray, missing: np.ndarray, positions: np.ndarray,
+                    fee: float = 0.0) -> Dict[str, np.ndarray]:
+    """Apply positions to precomputed asset returns (see backtest_arrays)"""
+    positions = np.where(missing, 0.0, np.nan_to_num(_as_float_array(positions)))
+    returns = np.zeros_like(bar_returns)
+    returns[1:] = positions[:-1] * bar_returns[1:]
+    if fee:
+        turnover = np.abs(np.diff(positions, axis=0, prepend=0.0))
+        returns -= fee * turnover
+
+    equity = np.cumprod(1.0 + returns, axis=0)
+    drawdown = equity / np.maximum.accumulate(equity, axis=0) - 1
+    return {'positions': positions, 'returns': returns, 'equity': equity, 'drawdown': drawdown}
+
+
+def _trades(close: pd.DataFrame, positions: np.ndarray, equity: np.ndarray) -> pd.DataFrame:
+    """Turn runs of non-zero positions into a trade list without looping over bars"""
+    held = positions != 0
+    edges = np.diff(held.astype(np.int8), axis=0, prepend=0, append=0)
+    # Transposing orders the hits by symbol then time, so entries and exits pair up
+    entry_symbol, entry_bar = np.nonzero(edges.T == 1)
+    _, exit_bar = np.nonzero(edges.T == -1)
+
+    is_open = exit_bar == len(close)
+    exit_bar = np.minimum(exit_bar, len(close) - 1)
+    values = close.to_numpy(dtype=np.float64)
+    return pd.DataFrame({
+        'symbol': close.columns[entry_symbol],
+        'entry_date': close.index[entry_bar],
+        'exit_date': close.index[exit_bar],
+        'entry_price': values[entry_bar, entry_symbol],
+        'exit_price': values[exit_bar, entry_symbol],
+        'bars': exit_bar - entry_bar,
+        'return': equity[exit_bar, entry_symbol] / equity[entry_bar, entry_symbol] - 1,
+        'open': is_open,
+    })
+
+
+def run_backtest(close: Union[pd.Series, pd.DataFrame], signal: SignalFunction, fee: float = 0.0,
+                 engine: IndicatorEngine = None, **params) -> BacktestResult:
+    """Run a signal function over a close price panel (time x symbol) or a single close series.
+
+    Pass an existing engine over the same prices to reuse its cached indicators.
+    """
+    if isinstance(close, pd.Series):
+        close = close.to_frame(close.name or 'Close')
+    engine = engine if engine is not None else IndicatorEngine(close)
+    arrays = backtest_arrays(engine.close, signal(engine, **params), fee)
+
+    def wide(values):
+        return pd.DataFrame(values, index=close.index, columns=close.columns)
+
+    return BacktestResult(
+        close=close,
+        positions=wide(arrays['positions']),
+        returns=wide(arrays['returns']),
+        equity=wide(arrays['equity']),
+        drawdown=wide(arrays['drawdown']),
+        trades=_trades(close, arrays['positions'], arrays['equity']),
+    )
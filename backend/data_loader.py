@@ -1,109 +1,177 @@
-import yfinance as yf
 import pandas as pd
+from pandas.tseries.holiday import USFederalHolidayCalendar
+from pandas.tseries.offsets import CustomBusinessDay
 import streamlit as st
 from datetime import datetime, timedelta
-import time
+from dataclasses import replace
+import logging
+
+from backend.data_store import OHLCVStore, has_new_actions, merge_bars
+from backend.indicator_engine import TECHNICAL_INDICATORS, IndicatorEngine, fill_gaps
+from backend.streaming_indicators import STATE_VERSION, IndicatorState
+from backend.retry import FetchMethod, RetryEngine, RetryPolicy, get_breaker, is_present, is_usable
+
+# Calendar length of each supported period, used to slice stored history
+PERIOD_OFFSETS = {
+    '1mo': pd.DateOffset(months=1),
+    '3mo': pd.DateOffset(months=3),
+    '6mo': pd.DateOffset(months=6),
+    '1y': pd.DateOffset(years=1),
+    '2y': pd.DateOffset(years=2),
+    '5y': pd.DateOffset(years=5)
+}
+
+# US trading sessions (federal holidays are an approximation of the NYSE calendar)
+TRADING_DAY = CustomBusinessDay(calendar=USFederalHolidayCalendar())
+
+# Slack allowed between the requested start and the first stored bar
+# (weekends, holidays and Yahoo's own rounding of the period start)
+COVERAGE_TOLERANCE = pd.Timedelta(days=7)
+
+# Saved state recording the first bar Yahoo has for a symbol, when that is
+# later than a requested window's start (new listings, intraday limits)
+FIRST_BAR_STATE = "first_bar"
+
+# Circuit breaker key shared by every Yahoo Finance request
+YAHOO_HOST = "query1.finance.yahoo.com"
+
+logger = logging.getLogger(__name__)
+
+
+def period_start(period, index):
+    """Get the first timestamp of a period window, in the index's timezone."""
+    now = pd.Timestamp.now(tz=getattr(index, 'tz', None))
+    return now - PERIOD_OFFSETS.get(period, PERIOD_OFFSETS['1y'])
+
+
+def slice_period(data, period):
+    """Trim a frame of bars to the requested period window."""
+    return data.loc[data.index >= period_start(period, data.index)]
+
+
+def period_window(period):
+    """Get explicit (start, end) download dates for a period.
+
+    The start is rolled back to the previous trading session, and the end is
+    tomorrow because yfinance treats it as exclusive.
+    """
+    today = pd.Timestamp.now().normalize()
+    start = TRADING_DAY.rollback(today - PERIOD_OFFSETS.get(period, PERIOD_OFFSETS['1y']))
+    return start, today + pd.Timedelta(days=1)
+
+
+def resolve_period(period):
+    """Convert a period to a valid yfinance period, defaulting to '1y'."""
+    return period if period in PERIOD_OFFSETS else '1y'
+
+
+def normalize_symbol(symbol):
+    """Append -USD to bare crypto symbols."""
+    if symbol.upper() in ["BTC", "ETH"] and not symbol.endswith("-USD"):
+        symbol = f"{symbol}-USD"
+    return symbol
+
+
+def flatten_columns(data):
+    """Drop the ticker level that yf.download adds to single-symbol frames."""
+    if isinstance(data.columns, pd.MultiIndex):
+        data = data.copy()
+        data.columns = data.columns.get_level_values(0)
+    return data
+
+
+def fetch_history(symbol, interval, period=None, start=None):
+    """Fetch bars with Ticker.history(). Safe to call from worker threads."""
+    import yfinance as yf
+
+    return yf.Ticker(symbol).history(
+        period=period,
+        start=start,
+        interval=interval,
+        auto_adjust=True,
+        actions=True,
+        prepost=True
+    )
+
+
+def fetch_download(symbol, interval, period=None, start=None, end=None):
+    """Fetch bars with yf.download(). Safe to call from worker threads."""
+    import yfinance as yf
+
+    data = yf.download(
+        symbol,
+        period=period,
+        start=start,
+        end=end,
+        interval=interval,
+        auto_adjust=True,
+        actions=True,
+        prepost=True,
+        ignore_tz=False,
+        progress=False
+    )
+    return flatten_columns(data)
+
+
+def fetch_window(symbol, interval, period, stored=None):
+    """Fetch only the bars of the period window that are not already stored.
+
+    Uses explicit start/end dates instead of downloading period='max', so the
+    degraded path transfers about as much as a normal period request.
+    """
+    start, end = period_window(period)
+    newer = None
+    if stored is not None and not stored.empty:
+        # Re-fetch from the last stored bar, which may have been partial
+        newer = fetch_download(symbol, interval, start=stored.index[-1].tz_localize(None), end=end)
+        if has_new_actions(newer, stored):
+            # A dividend or split re-adjusted every stored price, so none can be reused
+            stored = None
+    if stored is None or stored.empty:
+        data = fetch_download(symbol, interval, start=start, end=end)
+    else:
+        first = stored.index[0].tz_localize(None)
+        data = stored
+        if start < first:
+            data = merge_bars(fetch_download(symbol, interval, start=start, end=first), data)
+        data = merge_bars(data, newer)
+    return data.loc[data.index >= period_start(period, data.index)] if not data.empty else data
+
 
 class DataLoader:
-    @staticmethod
-    def get_market_data(symbol, period='1y', interval='1d', max_retries=3):
-        """Fetch market data from Yahoo Finance with enhanced error handling and fallbacks."""
-        
-        # Convert period to valid yfinance format
-        period_map = {
-            '1mo': '1mo',
-            '3mo': '3mo',
-            '6mo': '6mo',
-            '1y': '1y',
-            '2y': '2y',
-            '5y': '5y'
-        }
+    store = OHLCVStore()
+    retry_policy = RetryPolicy()
+
+    @classmethod
+    def get_market_data(cls, symbol, period='1y', interval='1d', max_retries=3, use_store=True,
+                        demo_fallback=True):
+        """Fetch market data from Yahoo Finance with enhanced error handling and fallbacks.
+
+        When use_store is set, bars are served from the local OHLCV store and only
+        the bars after the last stored timestamp are downloaded. When every fetch
+        fails, synthetic demo bars are returned, or None if demo_fallback is off.
+        """
         
         # Get the actual period value or default to '1y'
-        actual_period = period_map.get(period, '1y')
-        
-        # For crypto, append -USD if not already present
-        if symbol.upper() in ["BTC", "ETH"] and not symbol.endswith("-USD"):
-            symbol = f"{symbol}-USD"
-        
-        # Try different methods with retries
-        for attempt in range(max_retries):
-            # Method 1: Try using Ticker.history()
-            try:
-                ticker = yf.Ticker(symbol)
-                data = ticker.history(
-                    period=actual_period,
-                    interval=interval,
-                    auto_adjust=True,
-                    actions=True,
-                    prepost=True
-                )
-                
-                if not data.empty and len(data) > 0:
-                    st.success(f"Successfully fetched data for {symbol}")
-                    return data
-                
-                # Wait before trying the next method
-                time.sleep(0.5)
-            except Exception as e:
-                st.debug(f"Method 1 error for {symbol}: {str(e)}")
-                time.sleep(0.5)
-            
-            # Method 2: Try using yf.download() which can be more reliable
-            try:
-                data = yf.download(
-                    symbol,
-                    period=actual_period,
-                    interval=interval,
-                    auto_adjust=True,
-                    prepost=True,
-                    progress=False,
-                    show_errors=False
-                )
-                
-                if not data.empty and len(data) > 0:
-                    st.success(f"Successfully fetched data for {symbol} using alternate method")
-                    return data
-                
-                # Wait before retry
-                time.sleep(0.5)
-            except Exception as e:
-                st.debug(f"Method 2 error for {symbol}: {str(e)}")
-                
-            # Try a different period as fallback
-            if attempt == max_retries - 2:
-                try:
-                    st.info(f"Trying fallback period 'max' for {symbol}...")
-                    data = yf.download(
-                        symbol,
-                        period="max",
-                        interval=interval,
-                        auto_adjust=True,
-                        progress=False,
-                        show_errors=False
-                    )
-                    
-                    if not data.empty and len(data) > 0:
-                        st.success(f"Successfully fetched data for {symbol} using fallback period")
-                        # Filter to requested timeframe
-                        if period == '1mo':
-                            data = data.iloc[-30:]
-                        elif period == '3mo':
-                            data = data.iloc[-90:]
-                        elif period == '6mo':
-                            data = data.iloc[-180:]
-                        elif period == '1y':
-                            data = data.iloc[-365:]
-                        elif period == '2y':
-                            data = data.iloc[-730:]
-                        return data
-                except Exception as e:
-                    st.debug(f"Fallback error for {symbol}: {str(e)}")
-            
-            time.sleep(1)  # Wait before retrying
+        actual_period = resolve_period(period)
+        symbol = normalize_symbol(symbol)
+        
+        if use_store:
+            data = cls._load_from_store(symbol, actual_period, interval)
+            if data is not None:
+                return data
+        
+        data = cls._download(symbol, actual_period, interval, max_retries)
+        if data is not None:
+            if use_store:
+                cls._remember_first_bar(symbol, actual_period, interval, data)
+                return slice_period(cls.store.append(symbol, interval, data), actual_period)
+            return data
         
         # If all methods failed
         st.error(f"Failed to fetch data for {symbol} after multiple attempts. Please check your network connection and try again later.")
+        if not demo_fallback:
+            return None
         
         # Return some demo data for testing purposes
         start_date = datetime.now() - timedelta(days=365)
@@ -127,6 +195,231 @@ class DataLoader:
         st.warning(f"Using demo data for {symbol} as real data couldn't be fetched")
         return demo_data
 
+    @classmethod
+    def get_market_data_many(cls, symbols, period='1y', interval='1d', max_retries=3, use_store=True):
+        """Fetch market data for several symbols with grouped downloads.
+
+        Returns a dict mapping each normalized symbol to a frame shaped like the
+        result of get_market_data. Symbols still missing after the grouped
+        retries fall back to get_market_data one at a time.
+        """
+        actual_period = resolve_period(period)
+        symbols = list(dict.fromkeys(normalize_symbol(symbol) for symbol in symbols))
+        
+        results = {}
+        top_up = {}
+        missing = []
+        for symbol in symbols:
+            stored = cls._covering_store(symbol, actual_period, interval) if use_store else None
+            if stored is None:
+                missing.append(symbol)
+            elif cls.store.is_fresh(symbol, interval):
+                results[symbol] = slice_period(stored, actual_period)
+            else:
+                top_up[symbol] = stored
+        
+        # One request tops up every stale symbol from the oldest last bar
+        if top_up:
+            start = min(stored.index[-1].tz_localize(None) for stored in top_up.values())
+            fetched = cls._download_many(list(top_up), interval, max_retries, start=start)
+            for symbol, stored in top_up.items():
+                new_data = fetched.get(symbol)
+                if new_data is not None and has_new_actions(new_data, stored):
+                    cls.store.clear(symbol, interval)
+                    missing.append(symbol)
+                    continue
+                if new_data is not None:
+                    stored = cls.store.append(symbol, interval, new_data)
+                else:
+                    cls.store.touch(symbol, interval)
+                results[symbol] = slice_period(stored, actual_period)
+        
+        if missing:
+            fetched = cls._download_many(missing, interval, max_retries, period=actual_period)
+            for symbol in missing:
+                data = fetched.get(symbol)
+                if data is None:
+                    # Same per-symbol retries and fallbacks as a single fetch
+                    results[symbol] = cls.get_market_data(symbol, period, interval, max_retries, use_store)
+                elif use_store:
+                    cls._remember_first_bar(symbol, actual_period, interval, data)
+                    results[symbol] = slice_period(cls.store.append(symbol, interval, data), actual_period)
+                else:
+                    results[symbol] = data
+        
+        return {symbol: results[symbol] for symbol in symbols}
+
+    @classmethod
+    def _download_many(cls, symbols, interval, max_retries, period=None, start=None):
+        """Download several symbols in one grouped request and split the result."""
+        frames = {}
+
+        def download_remaining():
+            import yfinance as yf
+
+            # Each retry only asks for the symbols that are still missing
+            remaining = [symbol for symbol in symbols if symbol not in frames]
+            data = yf.download(
+                remaining,
+                period=period,
+                start=start,
+                interval=interval,
+                group_by='ticker',
+                auto_adjust=True,
+                actions=True,
+                prepost=True,
+                ignore_tz=False,
+                threads=True,
+                progress=False
+            )
+            for symbol in remaining:
+                if isinstance(data.columns, pd.MultiIndex):
+                    if symbol not in data.columns.get_level_values(0):
+                        continue
+                    frame = data[symbol]
+                else:
+                    frame = data
+                frame = frame.dropna(how='all')
+                if not frame.empty:
+                    frames[symbol] = frame
+            return len(frames) == len(symbols)
+
+        engine = cls._retry_engine(max_retries)
+        engine.call(download_remaining, "grouped download")
+        if engine.errors:
+            logger.debug(f"Grouped download errors: {engine.errors}")
+        # Copy, since an abandoned attempt may still be filling in frames
+        return dict(frames)
+
+    @classmethod
+    def _covering_store(cls, symbol, actual_period, interval):
+        """Get stored bars if they reach back to the start of the period window.
+
+        Bars that start later still cover the window when they reach back to
+        the symbol's first available bar.
+        """
+        stored = cls.store.load(symbol, interval)
+        if stored is None:
+            return None
+        if stored.index[0] > period_start(actual_period, stored.index) + COVERAGE_TOLERANCE:
+            first_bar = cls.store.load_state(symbol, interval, FIRST_BAR_STATE)
+            if first_bar is None or stored.index[0] > pd.Timestamp(first_bar['timestamp']):
+                return None
+        return stored
+
+    @classmethod
+    def _remember_first_bar(cls, symbol, actual_period, interval, data):
+        """Record the first bar of a full-window download that started after the window did."""
+        if not data.empty and data.index[0] > period_start(actual_period, data.index) + COVERAGE_TOLERANCE:
+            # Yahoo has no older bars, so later requests can be served from the store
+            cls.store.save_state(symbol, interval, FIRST_BAR_STATE, {'timestamp': data.index[0].isoformat()})
+
+    @classmethod
+    def _load_from_store(cls, symbol, actual_period, interval):
+        """Serve bars from the local store, topping up with any newer bars."""
+        stored = cls._covering_store(symbol, actual_period, interval)
+        if stored is None:
+            return None
+        
+        if not cls.store.is_fresh(symbol, interval):
+            # Re-fetch from the last stored bar, which may have been partial
+            # An empty answer is valid: nothing new since the last bar (e.g. the market is closed)
+            engine = cls._retry_engine(max_attempts=2, is_valid=is_present)
+            new_data = engine.call(
+                lambda: fetch_history(symbol, interval, start=stored.index[-1]),
+                "incremental history"
+            )
+            if new_data is None:
+                # Stale bars are still better than a full re-download failing too
+                logger.debug(f"Incremental fetch errors for {symbol}: {engine.errors}")
+                return slice_period(stored, actual_period)
+            if new_data.empty:
+                cls.store.touch(symbol, interval)
+                return slice_period(stored, actual_period)
+            
+            # A new dividend or split makes the stored history stale, so the
+            # full window must be downloaded
+            if has_new_actions(new_data, stored):
+                cls.store.clear(symbol, interval)
+                return None
+            
+            stored = cls.store.append(symbol, interval, new_data)
+        
+        return slice_period(stored, actual_period)
+
+    @classmethod
+    def _download(cls, symbol, actual_period, interval, max_retries):
+        """Download a full period window, racing the fetch methods under the retry policy."""
+        methods = [
+            # Method 1: Ticker.history()
+            ("history", lambda: fetch_history(symbol, interval, period=actual_period)),
+            # Method 2: yf.download(), which can be more reliable
+            ("download", lambda: fetch_download(symbol, interval, period=actual_period)),
+            # Method 3: explicit date window, reusing any stored bars for the overlap.
+            # It makes several requests, so it only starts once the others have failed
+            FetchMethod(
+                "fallback",
+                lambda: fetch_window(symbol, interval, actual_period, cls.store.load(symbol, interval)),
+                hedge=False
+            )
+        ]
+        
+        engine = cls._retry_engine(max_retries)
+        method, data = engine.first_success(methods)
+        if method is None:
+            logger.debug(f"Fetch errors for {symbol}: {engine.errors}")
+            return None
+        
+        if method == "history":
+            st.success(f"Successfully fetched data for {symbol}")
+        elif method == "download":
+            st.success(f"Successfully fetched data for {symbol} using alternate method")
+        else:
+            st.success(f"Successfully fetched data for {symbol} using fallback period")
+        return data
+
+    @classmethod
+    def _retry_engine(cls, max_attempts, is_valid=is_usable):
+        """Build a retry engine for Yahoo requests with the given attempt budget."""
+        return RetryEngine(
+            replace(cls.retry_policy, max_attempts=max_attempts),
+            breaker=get_breaker(YAHOO_HOST),
+            is_valid=is_valid
+        )
+
+    @classmethod
+    def get_indicator_state(cls, symbol, interval='1d', spec=TECHNICAL_INDICATORS, name='technical'):
+        """Get streaming indicator state for the stored bars, catching up on new ones.
+
+        The state is saved next to the stored bars and only the bars added since
+        it was last saved are folded in. It covers every bar but the last, which
+        may still be forming; use state.peek(last_bar) for its values.
+        """
+        symbol = normalize_symbol(symbol)
+        data = cls.store.load(symbol, interval)
+        if data is None or len(data) < 2:
+            return None
+        completed = data.iloc[:-1]
+        
+        state = None
+        saved = cls.store.load_state(symbol, interval, name)
+        # States saved by an older version of the accumulators are re-seeded
+        if saved is not None and saved.get('version') == STATE_VERSION:
+            state = IndicatorState.from_dict(saved, spec)
+            # Re-seed if the stored history was replaced since the state was saved
+            if state.last_timestamp is None or state.last_timestamp not in completed.index:
+                state = None
+        
+        if state is None:
+            state = IndicatorState(spec)
+            state.seed(completed)
+        else:
+            for timestamp, bar in completed.loc[completed.index > state.last_timestamp].iterrows():
+                state.update(bar, timestamp)
+        
+        cls.store.save_state(symbol, interval, name, state.to_dict())
+        return state
+
     @staticmethod
     def get_technical_indicators(data):
         """Calculate technical indicators with enhanced error handling."""
@@ -135,33 +428,20 @@ class DataLoader:
             return None
         
         try:
-            df = data.copy()
-            
-            # Calculate moving averages with minimum periods
-            df['SMA20'] = df['Close'].rolling(window=20, min_periods=5).mean()
-            df['SMA50'] = df['Close'].rolling(window=50, min_periods=10).mean()
-            
-            # Calculate RSI with proper gain/loss handling
-            delta = df['Close'].diff()
-            gain = delta.where(delta > 0, 0).rolling(window=14, min_periods=1).mean()
-            loss = (-delta.where(delta < 0, 0)).rolling(window=14, min_periods=1).mean()
-            rs = gain / loss.replace(0, float('inf'))  # Handle division by zero
-            df['RSI'] = 100 - (100 / (1 + rs))
-            
-            # Calculate MACD with proper spans
-            exp1 = df['Close'].ewm(span=12, adjust=False, min_periods=12).mean()
-            exp2 = df['Close'].ewm(span=26, adjust=False, min_periods=26).mean()
-            df['MACD'] = exp1 - exp2
-            df['Signal_Line'] = df['MACD'].ewm(span=9, adjust=False, min_periods=9).mean()
+            # Shallow copy: new columns go into the result only, the bars are shared
+            df = data.copy(deep=False)
             
-            # Forward fill NaN values at the beginning of the dataset
-            df = df.fillna(method='ffill')
+            # SMA20/SMA50, RSI and MACD/Signal_Line in one pass over the close prices
+            volume = df['Volume'] if 'Volume' in df.columns else None
+            indicators = IndicatorEngine(df['Close'], volume).compute(TECHNICAL_INDICATORS)
             
-            # Backward fill any remaining NaN values
-            df = df.fillna(method='bfill')
+            # Fill gaps column by column, so only columns with NaNs are rewritten
+            for name in df.columns[df.isna().any().to_numpy()]:
+                df[name] = df[name].ffill().bfill().fillna(0)
             
-            # Set any remaining NaN values to 0
-            df = df.fillna(0)
+            # Each indicator column is allocated once, with its warm-up NaNs filled
+            for name, values in indicators.items():
+                df[name] = fill_gaps(values)
             
             return df
             
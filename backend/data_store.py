@@ -0,0 +1,275 @@
+import json
+import os
+import re
+import time
+import threading
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_STORE_DIR = Path(
+    os.environ.get("AITA_DATA_DIR", Path(__file__).parent.parent / "data")
+) / "ohlcv"
+
+# How long a stored window is considered fresh before it is topped up
+REFRESH_SECONDS = {
+    '1m': 60,
+    '2m': 120,
+    '5m': 300,
+    '15m': 900,
+    '30m': 1800,
+    '60m': 3600,
+    '90m': 3600,
+    '1h': 3600,
+    '1d': 3600,
+    '5d': 6 * 3600,
+    '1wk': 6 * 3600,
+    '1mo': 24 * 3600,
+    '3mo': 24 * 3600,
+}
+
+PRICE_COLUMNS = ['Open', 'High', 'Low', 'Close', 'Adj Close']
+ACTION_COLUMNS = ['Dividends', 'Stock Splits', 'Capital Gains']
+
+# attrs entry naming the all-zero action columns compact_ohlcv dropped
+EMPTY_ACTIONS_ATTR = 'empty_actions'
+
+# Largest price change float32 storage may introduce (a hundredth of a cent)
+PRICE_TOLERANCE = 1e-4
+
+# Relative close change beyond which re-fetched bars count as re-adjusted
+ADJUSTMENT_TOLERANCE = 1e-5
+
+
+class OHLCVStore:
+    """Local Parquet store of OHLCV bars, one file per symbol and interval"""
+
+    def __init__(self, root: Path = DEFAULT_STORE_DIR):
+        self.root = Path(root)
+        self._lock = threading.Lock()
+
+    def _path(self, symbol: str, interval: str) -> Path:
+        """Get the file path for a symbol/interval pair"""
+        safe_symbol = re.sub(r'[^A-Za-z0-9._-]', '_', symbol.upper())
+        return self.root / interval / f"{safe_symbol}.parquet"
+
+    def load(self, symbol: str, interval: str = '1d') -> Optional[pd.DataFrame]:
+        """Load stored bars, or None if nothing usable is stored
+
+        Bars come back with the dtypes and columns they were saved with,
+        whatever the compact on-disk representation.
+        """
+        path = self._path(symbol, interval)
+        if not path.exists():
+            return None
+        try:
+            data = pd.read_parquet(path)
+        except Exception:
+            # A corrupt or partially written file is treated as a cache miss
+            return None
+        return expand_ohlcv(data) if not data.empty else None
+
+    def save(self, symbol: str, interval: str, data: pd.DataFrame) -> None:
+        """Write bars atomically and compactly, replacing any previous file"""
+        if data is None or data.empty:
+            return
+        path = self._path(symbol, interval)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        with self._lock:
+            compact_ohlcv(data).to_parquet(tmp_path)
+            os.replace(tmp_path, path)
+
+    def append(self, symbol: str, interval: str, new_data: pd.DataFrame) -> pd.DataFrame:
+        """Merge new bars into the stored history and persist the result
+
+        When the new bars disagree with stored prices, a dividend or split has
+        re-adjusted the history, so the stored bars are replaced rather than
+        merged with the newly adjusted ones.
+        """
+        stored = self.load(symbol, interval)
+        if stored is not None and adjustments_changed(stored, new_data):
+            self.clear(symbol, interval)
+            stored = None
+        merged = merge_bars(stored, new_data)
+        self.save(symbol, interval, merged)
+        return merged
+
+    def _state_path(self, symbol: str, interval: str, name: str) -> Path:
+        """Get the file path for saved state that accompanies stored bars"""
+        return self._path(symbol, interval).with_suffix(f".{name}.json")
+
+    def save_state(self, symbol: str, interval: str, name: str, state: dict) -> None:
+        """Save JSON state (e.g. streaming indicators) next to the stored bars"""
+        path = self._state_path(symbol, interval, name)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        with self._lock:
+            tmp_path.write_text(json.dumps(state))
+            os.replace(tmp_path, path)
+
+    def load_state(self, symbol: str, interval: str, name: str) -> Optional[dict]:
+        """Load state saved with save_state, or None"""
+        path = self._state_path(symbol, interval, name)
+        try:
+            return json.loads(path.read_text())
+        except (OSError, ValueError):
+            return None
+
+    def touch(self, symbol: str, interval: str = '1d') -> None:
+        """Mark stored bars as checked without rewriting them"""
+        path = self._path(symbol, interval)
+        if path.exists():
+            os.utime(path)
+
+    def age_seconds(self, symbol: str, interval: str = '1d') -> Optional[float]:
+        """Seconds since the stored file was last written"""
+        path = self._path(symbol, interval)
+        if not path.exists():
+            return None
+        return time.time() - path.stat().st_mtime
+
+    def is_fresh(self, symbol: str, interval: str = '1d') -> bool:
+        """Check whether the stored bars are recent enough to skip a top-up"""
+        age = self.age_seconds(symbol, interval)
+        return age is not None and age < REFRESH_SECONDS.get(interval, 3600)
+
+    def clear(self, symbol: str = None, interval: str = None) -> None:
+        """Delete stored files, optionally filtered by symbol and interval"""
+        if not self.root.exists():
+            return
+        # Saved state is derived from the bars, so it goes with them
+        stem = self._path(symbol, interval or '1d').stem if symbol else "*"
+        for suffix in (".parquet", ".*.json"):
+            for path in self.root.glob(f"{interval or '*'}/{stem}{suffix}"):
+                path.unlink(missing_ok=True)
+
+
+def align_timezone(data: pd.DataFrame, index: pd.DatetimeIndex) -> pd.DataFrame:
+    """Express a frame's timestamps in the timezone of another index"""
+    if data.index.tz == index.tz:
+        return data
+    if index.tz is None:
+        return data.tz_localize(None)
+    if data.index.tz is None:
+        return data.tz_localize(index.tz)
+    return data.tz_convert(index.tz)
+
+
+def adjustments_changed(stored: pd.DataFrame, new_data: Optional[pd.DataFrame]) -> bool:
+    """Check whether re-fetched bars give different closes for stored bars.
+
+    Adjusted prices only change when a dividend or split re-adjusts the
+    history. The last stored bar is skipped, since it may have been partial.
+    """
+    if new_data is None or new_data.empty or len(stored) < 2 or 'Close' not in new_data.columns:
+        return False
+    new_data = align_timezone(new_data, stored.index)
+    old = stored['Close'].iloc[:-1]
+    overlap = old.index.intersection(new_data.index)
+    if overlap.empty:
+        return False
+    old = old.loc[overlap].to_numpy(dtype=np.float64)
+    new = new_data.loc[overlap, 'Close'].to_numpy(dtype=np.float64)
+    with np.errstate(invalid='ignore'):
+        changed = np.abs(new - old) > PRICE_TOLERANCE + ADJUSTMENT_TOLERANCE * np.abs(old)
+    return bool(changed.any())
+
+
+def has_new_actions(new_data: pd.DataFrame, stored: pd.DataFrame) -> bool:
+    """Check re-fetched bars for a dividend or split the stored bars do not have.
+
+    A new action re-adjusts all earlier prices. Actions already stored on
+    overlapping bars are not new, but one that appears on the re-fetched
+    last bar (which may have been partial) is.
+    """
+    if new_data is None or new_data.empty:
+        return False
+    new_data = align_timezone(new_data, stored.index)
+    columns = ['Dividends', 'Stock Splits']
+    new = new_data.reindex(columns=columns).fillna(0).to_numpy(dtype=np.float64)
+    old = stored.reindex(index=new_data.index, columns=columns).fillna(0).to_numpy(dtype=np.float64)
+    return bool(((new != 0) & ~np.isclose(new, old)).any())
+
+
+def merge_bars(stored: Optional[pd.DataFrame], new_data: Optional[pd.DataFrame]) -> pd.DataFrame:
+    """Combine two bar frames, preferring the newer copy of overlapping bars"""
+    if stored is None or stored.empty:
+        return new_data
+    if new_data is None or new_data.empty:
+        return stored
+
+    # Align timezones so overlapping bars are recognised as duplicates
+    new_data = align_timezone(new_data, stored.index)
+
+    # The last stored bar may have been partial, so the re-fetched copy wins
+    merged = pd.concat([stored, new_data[stored.columns.intersection(new_data.columns)]])
+    merged = merged[~merged.index.duplicated(keep='last')]
+    return merged.sort_index()
+
+
+def _fits_float32(values: np.ndarray) -> bool:
+    """Check that prices survive a round trip through float32"""
+    with np.errstate(invalid='ignore', over='ignore'):
+        error = np.abs(values.astype(np.float32).astype(np.float64) - values)
+    return bool(np.all(error[~np.isnan(values)] <= PRICE_TOLERANCE))
+
+
+def compact_ohlcv(data: Optional[pd.DataFrame]) -> Optional[pd.DataFrame]:
+    """Shrink an OHLCV frame for storage without losing information.
+
+    Prices become float32 where that changes no price by more than
+    PRICE_TOLERANCE, volume becomes uint32 (or int64) when it is whole,
+    action columns with no actions are dropped (their names are kept in
+    attrs for expand_ohlcv) and a Symbol column becomes categorical. Already
+    compact columns are not copied.
+    """
+    if data is None or data.empty:
+        return data
+
+    columns = {}
+    # Compacting an already compact frame keeps the columns it had dropped
+    empty_actions = [name for name in data.attrs.get(EMPTY_ACTIONS_ATTR, []) if name not in data.columns]
+    for name in data.columns:
+        column = data[name]
+        if name in ACTION_COLUMNS and not column.fillna(0).any():
+            empty_actions.append(name)
+            continue
+        if name in PRICE_COLUMNS and column.dtype == np.float64 and _fits_float32(column.to_numpy()):
+            column = column.astype(np.float32)
+        elif name == 'Volume' and column.dtype.kind in 'iuf' and column.dtype != np.uint32:
+            values = column.to_numpy()
+            if not np.isnan(values).any() and np.all(values == np.round(values)) and values.min(initial=0) >= 0:
+                column = column.astype(np.uint32 if values.max(initial=0) < 2 ** 32 else np.int64)
+        elif name == 'Symbol' and column.dtype != 'category':
+            column = column.astype('category')
+        columns[name] = column
+    compact = pd.DataFrame(columns, index=data.index, copy=False)
+    compact.attrs[EMPTY_ACTIONS_ATTR] = [name for name in ACTION_COLUMNS if name in empty_actions]
+    return compact
+
+
+def expand_ohlcv(data: Optional[pd.DataFrame]) -> Optional[pd.DataFrame]:
+    """Undo compact_ohlcv: float64 prices, int64 volume and every dropped action column"""
+    if data is None:
+        return data
+
+    columns = {}
+    for name in data.columns:
+        column = data[name]
+        if name in PRICE_COLUMNS and column.dtype == np.float32:
+            column = column.astype(np.float64)
+        elif name == 'Volume' and column.dtype.kind == 'u':
+            column = column.astype(np.int64)
+        elif name == 'Symbol' and column.dtype == 'category':
+            column = column.astype(object)
+        columns[name] = column
+    for name in data.attrs.get(EMPTY_ACTIONS_ATTR, []):
+        columns.setdefault(name, pd.Series(0.0, index=data.index))
+    # Action columns follow Volume, in yfinance's order, ahead of any added columns
+    order = [name for name in columns if name not in ACTION_COLUMNS]
+    at = order.index('Volume') + 1 if 'Volume' in order else len(order)
+    order[at:at] = [name for name in ACTION_COLUMNS if name in columns]
+    return pd.DataFrame({name: columns[name] for name in order}, index=data.index, copy=False)
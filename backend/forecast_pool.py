@@ -0,0 +1,185 @@
+import multiprocessing
+import os
+import sys
+import threading
+import types
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Callable
+
+import pandas as pd
+
+# Forecasts that may run at once across every session in the server process
+FORECAST_WORKERS = int(os.environ.get('AITA_FORECAST_WORKERS', 2))
+
+
+class _WorkerProcess(multiprocessing.context.SpawnProcess):
+    """Spawned worker that does not run the Streamlit page again on startup
+
+    Streamlit installs the running page as __main__, with its __file__, and a
+    spawned child re-executes __main__'s file before taking jobs. While the
+    child starts, __main__ is swapped for an empty module.
+    """
+
+    def start(self):
+        main = sys.modules.get('__main__')
+        stand_in = sys.modules['__main__'] = types.ModuleType('__main__')
+        try:
+            super().start()
+        finally:
+            # Another script run may have installed its own page meanwhile
+            if sys.modules.get('__main__') is stand_in:
+                sys.modules['__main__'] = main
+
+
+class _WorkerContext(multiprocessing.context.SpawnContext):
+    Process = _WorkerProcess
+
+
+# Start method for worker pools: spawn, since forking a threaded server is unsafe
+WORKER_CONTEXT = _WorkerContext()
+
+
+def _prophet_job(data: pd.DataFrame, ticker: str, periods: int):
+    """Fit (or reuse) a Prophet model and forecast, returning the model as JSON"""
+    from backend.ai_model import make_predictions, train_prophet_model
+    from prophet.serialize import model_to_json
+
+    model = train_prophet_model(data, ticker)
+    forecast, analysis = make_predictions(model, periods)
+    return model_to_json(model), forecast, analysis
+
+
+def _prophet_result(result):
+    from prophet.serialize import model_from_json
+
+    model_json, forecast, analysis = result
+    return model_from_json(model_json), forecast, analysis
+
+
+def _ml_job(data: pd.DataFrame, prediction_days: int, symbol: str, horizon_mode: str, n_jobs: int):
+    """Predict with MLPredictor, returning (prediction, confidence metrics, fitted (key, entry) pairs)"""
+    from backend.ml_predictor import MLPredictor
+    from backend.model_registry import ModelRegistry
+
+    registry = ModelRegistry()
+    predictor = MLPredictor(registry, n_jobs, horizon_mode)
+    prediction = predictor.predict(data, prediction_days, symbol)
+    confidence = predictor.get_confidence_metrics(data, symbol, prediction_days)
+    return prediction, confidence, registry.items()
+
+
+def _chain(future: Future, transform: Callable) -> Future:
+    """Get a future for transform(result) of another future"""
+    chained = Future()
+
+    def done(source):
+        if chained.cancelled():
+            return
+        try:
+            chained.set_result(transform(source.result()))
+        except BaseException as e:
+            chained.set_exception(e)
+
+    # Cancelling the chained future cancels the job if it is still queued
+    chained.add_done_callback(lambda f: f.cancelled() and future.cancel())
+    future.add_done_callback(done)
+    return chained
+
+
+class ForecastPool:
+    """Runs Prophet and RandomForest forecasts in worker processes.
+
+    Jobs queue up behind max_workers processes, which caps concurrent fits and
+    keeps them off the Streamlit script threads and their GIL. Results come
+    back as futures, which TaskManager.track_future can follow. Workers are
+    started with WORKER_CONTEXT.
+
+    Each worker has its own model caches, so fitted models are also kept in
+    this process's default_prophet_cache and model registry, where every
+    session and the shared PredictorPool find them.
+    """
+
+    def __init__(self, max_workers: int = FORECAST_WORKERS):
+        self.max_workers = max_workers
+        self._executor = ProcessPoolExecutor(max_workers, mp_context=WORKER_CONTEXT)
+
+    def submit(self, fn: Callable, *args, **kwargs) -> Future:
+        """Queue any picklable module-level function"""
+        return self._executor.submit(fn, *args, **kwargs)
+
+    def submit_prophet(self, data: pd.DataFrame, ticker: str = None, periods: int = 30) -> Future:
+        """Queue a Prophet forecast; the future gives (model, forecast, analysis)
+
+        Data already fitted by an earlier job is forecast from the cached model
+        without queueing a job.
+        """
+        from backend.ai_model import default_prophet_cache as cache, make_predictions
+
+        key = cache.make_key(ticker, data, {})
+        model = cache.get(key)
+        if model is not None:
+            future = Future()
+            try:
+                future.set_result((model, *make_predictions(model, periods)))
+            except Exception as e:
+                future.set_exception(e)
+            return future
+
+        def remember(result):
+            model, forecast, analysis = _prophet_result(result)
+            cache.put(key, model, cache.series_key(ticker, {}))
+            return model, forecast, analysis
+
+        return _chain(self.submit(_prophet_job, data, ticker, periods), remember)
+
+    def submit_ml(self, data: pd.DataFrame, prediction_days: int = 7, symbol: str = None,
+                  horizon_mode: str = 'direct') -> Future:
+        """Queue an MLPredictor forecast; the future gives (prediction, confidence metrics)
+
+        Data the server already has a fitted model for is predicted with the
+        symbol's shared predictor without queueing a job.
+        """
+        from backend.ml_predictor import ML_THREAD_BUDGET, MLPredictor
+        from backend.resources import get_predictor_pool
+
+        # Uses the same registry as the shared predictors
+        local = MLPredictor(horizon_mode=horizon_mode)
+        if local.has_model(data, symbol, prediction_days):
+            future = Future()
+            try:
+                with get_predictor_pool().borrow(symbol, horizon_mode) as predictor:
+                    future.set_result((
+                        predictor.predict(data, prediction_days, symbol),
+                        predictor.get_confidence_metrics(data, symbol, prediction_days)
+                    ))
+            except Exception as e:
+                future.set_exception(e)
+            return future
+
+        def remember(result):
+            prediction, confidence, fitted = result
+            for key, entry in fitted:
+                local.registry.put(key, entry)
+            return prediction, confidence
+
+        # Split the ML thread budget between the workers so they don't oversubscribe cores
+        n_jobs = max(1, ML_THREAD_BUDGET // self.max_workers)
+        job = self.submit(_ml_job, data, prediction_days, symbol, horizon_mode, n_jobs)
+        return _chain(job, remember)
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop the worker processes, cancelling queued jobs"""
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+
+_FORECAST_POOL = None
+_FORECAST_POOL_LOCK = threading.Lock()
+
+
+def get_forecast_pool() -> ForecastPool:
+    """Get the process-wide forecast pool, starting it on first use"""
+    global _FORECAST_POOL
+    with _FORECAST_POOL_LOCK:
+        if _FORECAST_POOL is None:
+            _FORECAST_POOL = ForecastPool()
+        return _FORECAST_POOL
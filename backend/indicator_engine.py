@@ -0,0 +1,292 @@
+import numpy as np
+import pandas as pd
+from typing import Dict, Tuple, Union
+
+# Indicator specs map an output column (or tuple of columns for multi-line
+# indicators) to an (indicator, params) pair understood by IndicatorEngine.compute
+IndicatorSpec = Dict[Union[str, Tuple[str, ...]], Tuple[str, dict]]
+
+# Columns added by DataLoader.get_technical_indicators
+TECHNICAL_INDICATORS: IndicatorSpec = {
+    'SMA20': ('sma', {'window': 20, 'min_periods': 5}),
+    'SMA50': ('sma', {'window': 50, 'min_periods': 10}),
+    'RSI': ('rsi', {'window': 14, 'min_periods': 1}),
+    ('MACD', 'Signal_Line'): ('macd', {
+        'fast_min_periods': 12, 'slow_min_periods': 26, 'signal_min_periods': 9
+    }),
+}
+
+
+def _as_float_array(values) -> np.ndarray:
+    """Get a contiguous float64 array, without copying when already one"""
+    if isinstance(values, (pd.Series, pd.DataFrame)):
+        values = values.to_numpy(dtype=np.float64)
+    return np.ascontiguousarray(values, dtype=np.float64)
+
+
+def _window_sum(cumsum: np.ndarray, window: int) -> np.ndarray:
+    """Turn a cumulative sum along axis 0 into trailing window sums"""
+    out = cumsum.copy()
+    out[window:] -= cumsum[:-window]
+    return out
+
+
+def _ffill(values: np.ndarray) -> np.ndarray:
+    """Forward fill NaNs along axis 0"""
+    mask = np.isnan(values)
+    if not mask.any():
+        return values
+    index = np.where(~mask, np.arange(len(values)).reshape(-1, *([1] * (values.ndim - 1))), 0)
+    np.maximum.accumulate(index, axis=0, out=index)
+    if values.ndim == 1:
+        return values[index]
+    return np.take_along_axis(values, index, axis=0)
+
+
+def fill_gaps(values: np.ndarray) -> np.ndarray:
+    """Forward fill NaNs along axis 0, back fill the leading ones and zero all-NaN columns.
+
+    Same result as fillna(method='ffill'), then 'bfill', then fillna(0), but
+    only allocates when there are gaps after the first value; warm-up NaNs
+    of a 1-D array are filled in place.
+    """
+    mask = np.isnan(values)
+    if not mask.any():
+        return values
+    if values.ndim == 1:
+        first = int(np.argmax(~mask)) if not mask.all() else len(values)
+        if not mask[first:].any():
+            values[:first] = values[first] if first < len(values) else 0.0
+            return values
+    values = _ffill(values)
+    mask = np.isnan(values)
+    # After a forward fill only leading NaNs remain; take each column's first value
+    first = np.take_along_axis(values, np.argmax(~mask, axis=0, keepdims=True), axis=0)
+    return np.where(mask, np.nan_to_num(first), values)
+
+
+def _ewm_across_gaps(column: np.ndarray, alpha: float) -> np.ndarray:
+    """pandas' adjust=False recursion for a 1-D column with gaps after its first value
+
+    A gap keeps decaying the weight of the running mean, so the next value
+    counts for more than alpha; that is not a fixed linear filter.
+    """
+    out = np.empty_like(column)
+    weighted, old_weight = np.nan, 1.0
+    for i, value in enumerate(column):
+        if weighted == weighted:
+            old_weight *= 1.0 - alpha
+            if value == value:
+                weighted = (old_weight * weighted + alpha * value) / (old_weight + alpha)
+                old_weight = 1.0
+        elif value == value:
+            weighted = value
+        out[i] = weighted
+    return out
+
+
+def ewm_mean(values: np.ndarray, alpha: float, adjust: bool = True, min_periods: int = 0) -> np.ndarray:
+    """Exponentially weighted mean along axis 0, matching pandas ewm().mean().
+
+    Runs as a linear filter in C. With adjust=False leading NaNs are skipped
+    the same way; columns with gaps after their first value fall back to
+    pandas' recursion, row by row.
+    """
+    from scipy.signal import lfilter
+
+    values = _as_float_array(values)
+    valid = ~np.isnan(values)
+    decay = 1.0 - alpha
+    if adjust:
+        num = lfilter([1.0], [1.0, -decay], np.where(valid, values, 0.0), axis=0)
+        den = lfilter([1.0], [1.0, -decay], valid.astype(np.float64), axis=0)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            out = num / den
+    else:
+        seen = np.logical_or.accumulate(valid, axis=0)
+        filled = _ffill(values)
+        # Start each column at its first observation, so leading NaNs are skipped
+        first = np.take_along_axis(filled, np.argmax(valid, axis=0, keepdims=True), axis=0)
+        filled = np.where(seen, filled, first)
+        zi = np.expand_dims(decay * filled[0], 0)
+        out, _ = lfilter([alpha], [1.0, -decay], filled, axis=0, zi=zi)
+        out[~seen] = np.nan
+        gaps = (seen & ~valid).any(axis=0)
+        if gaps.any():
+            if out.ndim == 1:
+                out = _ewm_across_gaps(values, alpha)
+            else:
+                for column in np.flatnonzero(gaps.reshape(-1)):
+                    out.reshape(len(out), -1)[:, column] = _ewm_across_gaps(
+                        values.reshape(len(values), -1)[:, column], alpha
+                    )
+    out[np.cumsum(valid, axis=0) < max(min_periods, 1)] = np.nan
+    return out
+
+
+class IndicatorEngine:
+    """Computes many indicators over one price series, sharing intermediate arrays.
+
+    Works along axis 0, so a wide (time x symbol) close matrix gives one
+    column of results per symbol. Leading rows without a close (e.g. before
+    a symbol listed) are skipped, but gaps after the first close still count
+    as bars; the panel functions in indicators.py give each symbol's column
+    only its own rows. The close (and volume) data are converted to contiguous float64
+    arrays once. Cumulative sums, price differences, gains/losses and EWM results are
+    cached, so e.g. SMA20, SMA50 and Bollinger Bands share one cumulative sum
+    and an EMA12 request reuses the fast leg of MACD.
+    """
+
+    def __init__(self, close, volume=None):
+        self.close = _as_float_array(close)
+        self.volume = _as_float_array(volume) if volume is not None else None
+        self._cache = {}
+
+    def _cached(self, key, compute):
+        """Compute an intermediate array once"""
+        if key not in self._cache:
+            self._cache[key] = compute()
+        return self._cache[key]
+
+    def _valid_count(self) -> np.ndarray:
+        return self._cached('count', lambda: np.cumsum(~np.isnan(self.close), axis=0))
+
+    def _cumsum(self) -> np.ndarray:
+        return self._cached('cumsum', lambda: np.nancumsum(self.close, axis=0))
+
+    def _anchored_cumsum_sq(self) -> np.ndarray:
+        # Squares are taken around the mean price to limit cancellation error
+        def compute():
+            centered = self.close - self._anchor()
+            return np.nancumsum(centered * centered, axis=0)
+        return self._cached('cumsum_sq', compute)
+
+    def _anchor(self):
+        return self._cached('anchor', lambda: np.nan_to_num(np.nanmean(self.close, axis=0)))
+
+    def _delta(self) -> np.ndarray:
+        def compute():
+            delta = np.empty_like(self.close)
+            delta[0] = np.nan
+            np.subtract(self.close[1:], self.close[:-1], out=delta[1:])
+            return delta
+        return self._cached('delta', compute)
+
+    def _gain_loss(self) -> Tuple[np.ndarray, np.ndarray]:
+        # The leading NaN difference counts as a zero gain/loss, as in pandas' where(),
+        # but rows without a close (e.g. before a symbol listed) stay missing
+        def compute():
+            delta = self._delta()
+            missing = np.isnan(self.close)
+            gain = np.where(delta > 0, delta, 0.0)
+            loss = np.where(delta < 0, -delta, 0.0)
+            gain[missing] = np.nan
+            loss[missing] = np.nan
+            return gain, loss
+        return self._cached('gain_loss', compute)
+
+    def rolling_count(self, window: int) -> np.ndarray:
+        """Number of valid observations in each trailing window"""
+        return self._cached(('rolling_count', window), lambda: _window_sum(self._valid_count(), window))
+
+    def sma(self, window: int, min_periods: int = None) -> np.ndarray:
+        """Simple moving average"""
+        min_periods = window if min_periods is None else min_periods
+
+        def compute():
+            count = self.rolling_count(window)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                out = _window_sum(self._cumsum(), window) / count
+            out[count < max(min_periods, 1)] = np.nan
+            return out
+        return self._cached(('sma', window, min_periods), compute)
+
+    def rolling_std(self, window: int, min_periods: int = None, ddof: int = 1) -> np.ndarray:
+        """Rolling standard deviation"""
+        min_periods = window if min_periods is None else min_periods
+
+        def compute():
+            count = self.rolling_count(window)
+            centered_sum = _window_sum(self._cumsum(), window) - count * self._anchor()
+            sum_sq = _window_sum(self._anchored_cumsum_sq(), window)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                var = (sum_sq - centered_sum * centered_sum / count) / (count - ddof)
+            out = np.sqrt(np.maximum(var, 0.0))
+            out[(count < max(min_periods, 1)) | (count - ddof <= 0)] = np.nan
+            return out
+        return self._cached(('std', window, min_periods, ddof), compute)
+
+    def ema(self, span: int, adjust: bool = True, min_periods: int = 0) -> np.ndarray:
+        """Exponential moving average"""
+        return self._cached(
+            ('ema', span, adjust, min_periods),
+            lambda: ewm_mean(self.close, 2.0 / (span + 1.0), adjust, min_periods)
+        )
+
+    def bollinger(self, window: int = 20, num_std: float = 2.0, ddof: int = 1,
+                  min_periods: int = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Bollinger Bands as (upper, middle, lower)"""
+        middle = self.sma(window, min_periods)
+        width = num_std * self.rolling_std(window, min_periods, ddof)
+        return middle + width, middle, middle - width
+
+    def rsi(self, window: int = 14, method: str = 'sma', min_periods: int = None) -> np.ndarray:
+        """Relative Strength Index, averaging gains/losses with a rolling mean or Wilder smoothing"""
+        min_periods = window if min_periods is None else min_periods
+
+        def compute():
+            gain, loss = self._gain_loss()
+            if method == 'wilder':
+                avg_gain = ewm_mean(gain, 1.0 / window, adjust=False, min_periods=min_periods)
+                avg_loss = ewm_mean(loss, 1.0 / window, adjust=False, min_periods=min_periods)
+            else:
+                count = self.rolling_count(window)
+                with np.errstate(invalid='ignore', divide='ignore'):
+                    avg_gain = _window_sum(np.nancumsum(gain, axis=0), window) / count
+                    avg_loss = _window_sum(np.nancumsum(loss, axis=0), window) / count
+                avg_gain[count < max(min_periods, 1)] = np.nan
+            # Equivalent to 100 - 100 / (1 + gain / loss), and 100 when there were no losses
+            with np.errstate(invalid='ignore', divide='ignore'):
+                return 100.0 * avg_gain / (avg_gain + avg_loss)
+        return self._cached(('rsi', window, method, min_periods), compute)
+
+    def macd(self, fast: int = 12, slow: int = 26, signal: int = 9, adjust: bool = False,
+             fast_min_periods: int = 0, slow_min_periods: int = 0,
+             signal_min_periods: int = 0) -> Tuple[np.ndarray, np.ndarray]:
+        """MACD line and signal line"""
+        def compute():
+            line = self.ema(fast, adjust, fast_min_periods) - self.ema(slow, adjust, slow_min_periods)
+            return line, ewm_mean(line, 2.0 / (signal + 1.0), adjust, signal_min_periods)
+        return self._cached(('macd', fast, slow, signal, adjust, fast_min_periods,
+                             slow_min_periods, signal_min_periods), compute)
+
+    def vwap(self) -> np.ndarray:
+        """Cumulative volume weighted average price"""
+        if self.volume is None:
+            raise ValueError("VWAP requires volume data")
+
+        def compute():
+            with np.errstate(invalid='ignore', divide='ignore'):
+                out = np.nancumsum(self.close * self.volume, axis=0) / np.nancumsum(self.volume, axis=0)
+            out[np.isnan(self.close)] = np.nan
+            return out
+        return self._cached('vwap', compute)
+
+    def compute(self, spec: IndicatorSpec) -> Dict[str, np.ndarray]:
+        """Compute every indicator in a spec, returning output column -> array"""
+        columns = {}
+        for names, (indicator, params) in spec.items():
+            result = getattr(self, indicator)(**params)
+            if isinstance(names, tuple):
+                # A None name drops that line of a multi-line indicator
+                columns.update((name, line) for name, line in zip(names, result) if name is not None)
+            else:
+                columns[names] = result
+        return columns
+
+
+def compute_indicators(data: pd.DataFrame, spec: IndicatorSpec = TECHNICAL_INDICATORS) -> pd.DataFrame:
+    """Compute an indicator spec over a price frame, returning the indicator columns"""
+    volume = data['Volume'] if 'Volume' in data.columns else None
+    columns = IndicatorEngine(data['Close'], volume).compute(spec)
+    return pd.DataFrame(columns, index=data.index)
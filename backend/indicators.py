@@ -1,38 +1,123 @@
 import pandas as pd
 import numpy as np
+from typing import Callable, Dict
+
+from backend.indicator_engine import IndicatorEngine, IndicatorSpec, compute_indicators
+
+def _engine(data: pd.DataFrame) -> IndicatorEngine:
+    """Build an indicator engine over a price frame"""
+    volume = data['Volume'] if 'Volume' in data.columns else None
+    return IndicatorEngine(data['Close'], volume)
+
+def calculate_indicators(data: pd.DataFrame, spec: IndicatorSpec) -> pd.DataFrame:
+    """Calculate a set of indicators in one pass, sharing intermediate results"""
+    return compute_indicators(data, spec)
 
 def calculate_sma(data: pd.DataFrame, window: int) -> pd.Series:
     """Calculate Simple Moving Average"""
-    return data['Close'].rolling(window=window).mean()
+    return pd.Series(_engine(data).sma(window), index=data.index, name='Close')
 
 def calculate_ema(data: pd.DataFrame, span: int) -> pd.Series:
     """Calculate Exponential Moving Average"""
-    return data['Close'].ewm(span=span).mean()
+    return pd.Series(_engine(data).ema(span), index=data.index, name='Close')
 
 def calculate_bollinger_bands(data: pd.DataFrame, window: int = 20) -> tuple:
     """Calculate Bollinger Bands"""
-    sma = data['Close'].rolling(window=window).mean()
-    std = data['Close'].rolling(window=window).std()
-    bb_upper = sma + 2 * std
-    bb_lower = sma - 2 * std
-    return bb_upper, bb_lower
+    bb_upper, _, bb_lower = _engine(data).bollinger(window)
+    return pd.Series(bb_upper, index=data.index), pd.Series(bb_lower, index=data.index)
 
 def calculate_vwap(data: pd.DataFrame) -> pd.Series:
     """Calculate Volume Weighted Average Price"""
-    return (data['Close'] * data['Volume']).cumsum() / data['Volume'].cumsum()
+    return pd.Series(_engine(data).vwap(), index=data.index)
 
 def calculate_rsi(data: pd.DataFrame, window: int = 14) -> pd.Series:
     """Calculate Relative Strength Index"""
-    delta = data['Close'].diff()
-    gain = (delta.where(delta > 0, 0)).rolling(window=window).mean()
-    loss = (-delta.where(delta < 0, 0)).rolling(window=window).mean()
-    rs = gain / loss
-    return 100 - (100 / (1 + rs))
+    return pd.Series(_engine(data).rsi(window), index=data.index)
 
 def calculate_macd(data: pd.DataFrame) -> tuple:
     """Calculate MACD and Signal Line"""
-    ema_12 = data['Close'].ewm(span=12).mean()
-    ema_26 = data['Close'].ewm(span=26).mean()
-    macd = ema_12 - ema_26
-    signal = macd.ewm(span=9).mean()
-    return macd, signal 
\ No newline at end of file
+    macd, signal = _engine(data).macd(adjust=True)
+    return pd.Series(macd, index=data.index), pd.Series(signal, index=data.index)
+
+# Panel versions: each takes a wide (time x symbol) matrix, e.g. from build_panel,
+# and returns wide indicator matrices with the same semantics per symbol column
+
+def build_panel(frames: Dict[str, pd.DataFrame], column: str = 'Close') -> pd.DataFrame:
+    """Align one column of several symbols' frames into a wide (time x symbol) matrix"""
+    series = {}
+    for symbol, frame in frames.items():
+        values = frame[column]
+        # Exchanges report daily bars in their own timezone, so align on wall-clock time
+        if values.index.tz is not None:
+            values = values.tz_localize(None)
+        series[symbol] = values
+    return pd.DataFrame(series).sort_index()
+
+def _wide(values, close: pd.DataFrame) -> pd.DataFrame:
+    return pd.DataFrame(values, index=close.index, columns=close.columns)
+
+def _panel_columns(close: pd.DataFrame, compute: Callable[[IndicatorEngine], Dict[str, np.ndarray]],
+                   volume: pd.DataFrame = None) -> Dict[str, pd.DataFrame]:
+    """Run an engine computation over a panel, each symbol on its own bars
+
+    The outer join in build_panel leaves NaN rows where a symbol did not trade
+    (e.g. weekends for a stock next to a crypto pair), and those must not count
+    as bars. Columns with the same rows of data share one engine over just
+    those rows, and the results are scattered back with NaN elsewhere.
+    """
+    values = close.to_numpy(dtype=np.float64)
+    volumes = None
+    if volume is not None:
+        volumes = volume.reindex(index=close.index, columns=close.columns).to_numpy(dtype=np.float64)
+    valid = ~np.isnan(values)
+
+    groups = {}
+    for column in range(values.shape[1]):
+        groups.setdefault(valid[:, column].tobytes(), []).append(column)
+
+    results = {}
+    for columns in groups.values():
+        rows = valid[:, columns[0]]
+        engine = IndicatorEngine(
+            values[np.ix_(rows, columns)],
+            volumes[np.ix_(rows, columns)] if volumes is not None else None
+        )
+        for name, result in compute(engine).items():
+            if name not in results:
+                results[name] = np.full(values.shape, np.nan)
+            results[name][np.ix_(rows, columns)] = result
+    return {name: _wide(result, close) for name, result in results.items()}
+
+def calculate_sma_panel(close: pd.DataFrame, window: int) -> pd.DataFrame:
+    """Calculate Simple Moving Average for every symbol"""
+    return _panel_columns(close, lambda engine: {'SMA': engine.sma(window)})['SMA']
+
+def calculate_ema_panel(close: pd.DataFrame, span: int) -> pd.DataFrame:
+    """Calculate Exponential Moving Average for every symbol"""
+    return _panel_columns(close, lambda engine: {'EMA': engine.ema(span)})['EMA']
+
+def calculate_bollinger_bands_panel(close: pd.DataFrame, window: int = 20) -> tuple:
+    """Calculate Bollinger Bands for every symbol"""
+    def compute(engine):
+        bb_upper, _, bb_lower = engine.bollinger(window)
+        return {'upper': bb_upper, 'lower': bb_lower}
+    bands = _panel_columns(close, compute)
+    return bands['upper'], bands['lower']
+
+def calculate_vwap_panel(close: pd.DataFrame, volume: pd.DataFrame) -> pd.DataFrame:
+    """Calculate Volume Weighted Average Price for every symbol"""
+    return _panel_columns(close, lambda engine: {'VWAP': engine.vwap()}, volume)['VWAP']
+
+def calculate_rsi_panel(close: pd.DataFrame, window: int = 14) -> pd.DataFrame:
+    """Calculate Relative Strength Index for every symbol"""
+    return _panel_columns(close, lambda engine: {'RSI': engine.rsi(window)})['RSI']
+
+def calculate_macd_panel(close: pd.DataFrame) -> tuple:
+    """Calculate MACD and Signal Line for every symbol"""
+    lines = _panel_columns(close, lambda engine: dict(zip(('MACD', 'Signal'), engine.macd(adjust=True))))
+    return lines['MACD'], lines['Signal']
+
+def calculate_indicators_panel(close: pd.DataFrame, spec: IndicatorSpec,
+                               volume: pd.DataFrame = None) -> Dict[str, pd.DataFrame]:
+    """Calculate a set of indicators for every symbol, keyed by output column"""
+    return _panel_columns(close, lambda engine: engine.compute(spec), volume)
@@ -1,23 +1,129 @@
 import numpy as np
 import streamlit as st
 import pandas as pd
-from sklearn.preprocessing import MinMaxScaler
-from sklearn.model_selection import train_test_split
-from sklearn.ensemble import RandomForestRegressor
+from contextlib import contextmanager
 from datetime import datetime, timedelta
+from typing import Iterator
+import os
+import threading
+
+from backend.indicator_engine import compute_indicators
+from backend.model_registry import ModelEntry, ModelRegistry, default_registry
+
+# Threads RandomForest training may use at once, across every predictor in the
+# process. Set AITA_ML_THREADS to leave cores free for other sessions.
+ML_THREAD_BUDGET = int(os.environ.get('AITA_ML_THREADS', os.cpu_count() or 1))
+
+class ThreadBudget:
+    """Process-wide count of the threads training may use.
+
+    Each fit asks for its n_jobs and gets what is free, at least one thread,
+    waiting while none is, so concurrent fits split the budget instead of
+    each taking all of it. Forecast pool workers have budgets of their own
+    and are given a share of ML_THREAD_BUDGET as n_jobs.
+    """
+    
+    def __init__(self, total: int):
+        self.total = max(1, total)
+        self._free = self.total
+        self._changed = threading.Condition()
+        
+    @contextmanager
+    def threads(self, wanted: int = None) -> Iterator[int]:
+        """Hold up to `wanted` threads (the whole budget for None or -1), yielding how many were granted"""
+        wanted = self.total if wanted is None or wanted < 1 else wanted
+        with self._changed:
+            self._changed.wait_for(lambda: self._free > 0)
+            granted = min(wanted, self._free)
+            self._free -= granted
+        try:
+            yield granted
+        finally:
+            with self._changed:
+                self._free += granted
+                self._changed.notify_all()
+
+thread_budget = ThreadBudget(ML_THREAD_BUDGET)
+
+def _fit_fold(params, X_train, y_train, X_test):
+    """Fit one walk-forward fold and predict its test rows (runs in a worker process)."""
+    from sklearn.ensemble import RandomForestRegressor
+    from sklearn.preprocessing import MinMaxScaler
+    
+    scaler = MinMaxScaler().fit(X_train)
+    model = RandomForestRegressor(n_jobs=1, **params)
+    model.fit(scaler.transform(X_train), y_train)
+    return model.predict(scaler.transform(X_test))
 
 class MLPredictor:
-    def __init__(self):
-        self.model = RandomForestRegressor(n_estimators=100, random_state=42)
-        self.scaler = MinMaxScaler()
+    def __init__(self, registry: ModelRegistry = None, n_jobs: int = None, horizon_mode: str = 'recursive'):
+        """Create a predictor.
+
+        horizon_mode 'recursive' predicts one day at a time, feeding each
+        prediction back in as the next close. 'direct' trains one multi-output
+        forest on every horizon and predicts all days in a single call.
+        """
+        self.params = {'n_estimators': 100, 'random_state': 42}
+        # n_jobs only changes speed (results are identical), so it is not in params.
+        # Fits get at most what is free of thread_budget.
+        self.n_jobs = n_jobs if n_jobs is not None else ML_THREAD_BUDGET
+        self.horizon_mode = horizon_mode
+        self.model = None  # Set by fit()
+        self.scaler = None
+        self.entry = None  # The registered ModelEntry of model, if any
         self.confidence = {}
+        self.registry = registry if registry is not None else default_registry
+        self.latest_features = None
+        
+    def _new_model(self, n_jobs):
+        """Create an unfitted forest with the predictor's hyperparameters."""
+        from sklearn.ensemble import RandomForestRegressor
+        return RandomForestRegressor(n_jobs=n_jobs, **self.params)
+        
+    def _horizon(self, prediction_days):
+        """Number of target columns to train on for a prediction length."""
+        return prediction_days if self.horizon_mode == 'direct' else 1
+        
+    def _targets(self, df, horizon):
+        """Get the target column(s): next close, or the next `horizon` closes."""
+        if horizon == 1:
+            return df['Target'].values
+        return df[[f'Target_{step}' for step in range(1, horizon + 1)]].values
         
     def prepare_data(self, df):
         """Prepare data for ML model."""
+        df, features = self._build_features(df)
         if df is None:
-            st.error("No data available for prediction.")
             return None, None, None, None
             
+        X_scaled = self._fit_scaler(df, features)
+        if X_scaled is None:
+            return None, None, None, None
+            
+        return X_scaled, df['Target'].values, df, features
+        
+    def _fit_scaler(self, df, features):
+        """Scale the feature columns with a newly fitted scaler."""
+        from sklearn.preprocessing import MinMaxScaler
+        
+        try:
+            # Registered models keep their scaler, so never refit it in place
+            self.scaler = MinMaxScaler()
+            return self.scaler.fit_transform(df[features].values)
+        except Exception as e:
+            st.error(f"Error preparing data for ML model: {str(e)}")
+            return None
+        
+    def _build_features(self, df, horizon=1):
+        """Add indicator and target columns, returning the training frame and feature names.
+
+        The latest feature row, which has no target yet, is kept in
+        self.latest_features for direct multi-day predictions.
+        """
+        if df is None:
+            st.error("No data available for prediction.")
+            return None, None
+            
         try:
             # If dataframe doesn't have the required columns, calculate them
             if 'SMA_20' not in df.columns and 'SMA20' in df.columns:
@@ -33,26 +139,25 @@ class MLPredictor:
             if not all(col in df.columns for col in required_columns):
                 missing = [col for col in required_columns if col not in df.columns]
                 st.error(f"Missing required columns: {', '.join(missing)}")
-                return None, None, None, None
+                return None, None
                 
             # Calculate technical indicators if not present
+            spec = {}
             if 'SMA_20' not in df.columns and 'SMA20' not in df.columns:
-                df['SMA_20'] = df['Close'].rolling(window=20, min_periods=5).mean()
+                spec['SMA_20'] = ('sma', {'window': 20, 'min_periods': 5})
                 
             if 'SMA_50' not in df.columns and 'SMA50' not in df.columns:
-                df['SMA_50'] = df['Close'].rolling(window=50, min_periods=10).mean()
+                spec['SMA_50'] = ('sma', {'window': 50, 'min_periods': 10})
                 
             if 'RSI' not in df.columns:
-                delta = df['Close'].diff()
-                gain = delta.where(delta > 0, 0).rolling(window=14, min_periods=1).mean()
-                loss = (-delta.where(delta < 0, 0)).rolling(window=14, min_periods=1).mean()
-                rs = gain / loss.replace(0, float('inf'))
-                df['RSI'] = 100 - (100 / (1 + rs))
+                spec['RSI'] = ('rsi', {'window': 14, 'min_periods': 1})
                 
             if 'MACD' not in df.columns:
-                exp1 = df['Close'].ewm(span=12, adjust=False, min_periods=5).mean()
-                exp2 = df['Close'].ewm(span=26, adjust=False, min_periods=10).mean()
-                df['MACD'] = exp1 - exp2
+                spec[('MACD', None)] = ('macd', {'fast_min_periods': 5, 'slow_min_periods': 10})
+            
+            if spec:
+                indicators = compute_indicators(df, spec)
+                df[indicators.columns] = indicators
             
             features = ['Open', 'High', 'Low', 'Close', 'Volume']
             
@@ -78,36 +183,86 @@ class MLPredictor:
             
             if len(df) < 50:  # Require minimum amount of data
                 st.error("Insufficient data for reliable predictions. Need at least 50 data points.")
-                return None, None, None, None
+                return None, None
+            
+            self.latest_features = df[features].iloc[[-1]]
             
             # Create target variable (next day's closing price)
             df['Target'] = df['Close'].shift(-1)
-            df = df[:-1]  # Remove last row since it won't have a target
-            
-            # Prepare features and target
-            X = df[features].values
-            y = df['Target'].values
+            if horizon > 1:
+                # One target column per day ahead for direct multi-output training
+                for step in range(1, horizon + 1):
+                    df[f'Target_{step}'] = df['Close'].shift(-step)
+            df = df[:-horizon]  # Remove last rows since they won't have every target
             
-            # Scale features
-            X_scaled = self.scaler.fit_transform(X)
-            
-            return X_scaled, y, df, features
+            return df, features
         except Exception as e:
             st.error(f"Error preparing data for ML model: {str(e)}")
+            return None, None
+        
+    def _model_key(self, symbol, df, features, horizon):
+        """Registry key of the model fit() trains on a feature frame."""
+        return self.registry.make_key(symbol, df, features, {**self.params, 'horizon': horizon, 'split': 'time'})
+        
+    def has_model(self, data, symbol=None, prediction_days=1):
+        """Check whether the registry holds the model predict() would train on data."""
+        horizon = self._horizon(prediction_days)
+        df, features = self._build_features(data, horizon)
+        return df is not None and self.registry.get(self._model_key(symbol, df, features, horizon)) is not None
+        
+    def fit(self, data, symbol=None, horizon=1):
+        """Prepare data and train, reusing a registered model fitted on the same data.
+
+        Models are keyed by symbol, data fingerprint, hyperparameters and
+        horizon, so repeated calls for unchanged data skip the RandomForest fit.
+        """
+        df, features = self._build_features(data, horizon)
+        if df is None:
             return None, None, None, None
         
+        key = self._model_key(symbol, df, features, horizon)
+        entry = self.registry.get(key)
+        if entry is not None:
+            self.model, self.scaler, self.confidence = entry.model, entry.scaler, entry.confidence
+            self.entry = entry
+            try:
+                return self.scaler.transform(df[features].values), self._targets(df, horizon), df, features
+            except Exception as e:
+                st.error(f"Error preparing data for ML model: {str(e)}")
+                return None, None, None, None
+        
+        X = self._fit_scaler(df, features)
+        if X is None:
+            return None, None, None, None
+        y = self._targets(df, horizon)
+        self.confidence = {}
+        self.entry = None
+        self.train(X, y)
+        if self.confidence:  # Only successfully trained models are registered
+            self.entry = ModelEntry(self.model, self.scaler, self.confidence)
+            self.registry.put(key, self.entry)
+        return X, y, df, features
+        
     def train(self, X, y):
         """Train the ML model."""
+        from sklearn.model_selection import train_test_split
+        
         if X is None or y is None:
             return 0.0
             
         try:
+            # Hold out the most recent rows, so the score never sees future prices
             X_train, X_test, y_train, y_test = train_test_split(
-                X, y, test_size=0.2, random_state=42
+                X, y, test_size=0.2, shuffle=False
             )
             
-            self.model.fit(X_train, y_train)
-            score = self.model.score(X_test, y_test)
+            # Registered models must not be refit in place, so always fit a new one
+            with thread_budget.threads(self.n_jobs) as n_jobs:
+                self.model = self._new_model(n_jobs)
+                self.model.fit(X_train, y_train)
+                score = self.model.score(X_test, y_test)
+            # Predictions run outside the budget, on the few rows ahead, so one thread is plenty
+            self.model.n_jobs = 1
             
             # Store confidence metrics
             self.confidence = {
@@ -121,20 +276,76 @@ class MLPredictor:
             st.error(f"Error training ML model: {str(e)}")
             return 0.0
         
-    def predict(self, data, prediction_days=7):
+    def walk_forward(self, data, n_splits=5, horizon=1, n_jobs=None):
+        """Evaluate the model on expanding-window walk-forward folds.
+
+        Features are built once and sliced per fold; each fold fits its own
+        scaler and forest on past rows only and is scored on the rows that
+        follow. Folds train in parallel worker processes. Returns one row of
+        metrics per fold, or None when there is not enough data.
+        """
+        from joblib import Parallel, delayed
+        from sklearn.metrics import r2_score
+        from sklearn.model_selection import TimeSeriesSplit
+        
+        df, features = self._build_features(data, horizon)
+        if df is None:
+            return None
+        
+        X = df[features].values
+        y = self._targets(df, horizon)
+        try:
+            # A gap keeps multi-day targets of the last training rows out of the test window
+            splits = list(TimeSeriesSplit(n_splits=n_splits, gap=horizon - 1).split(X))
+        except ValueError as e:
+            st.error(f"Insufficient data for walk-forward evaluation: {str(e)}")
+            return None
+        
+        # Fold processes count against the thread budget like forest threads
+        with thread_budget.threads(min(len(splits), n_jobs or self.n_jobs)) as n_jobs:
+            predictions = Parallel(n_jobs=n_jobs)(
+                delayed(_fit_fold)(self.params, X[train], y[train], X[test]) for train, test in splits
+            )
+        
+        rows = []
+        for fold, ((train, test), y_pred) in enumerate(zip(splits, predictions), start=1):
+            y_true = y[test]
+            metrics = self.get_prediction_metrics(y_true, y_pred) or {}
+            rows.append({
+                'fold': fold,
+                'train_start': df.index[train[0]],
+                'train_end': df.index[train[-1]],
+                'test_start': df.index[test[0]],
+                'test_end': df.index[test[-1]],
+                'training_samples': len(train),
+                'test_samples': len(test),
+                **metrics,
+                'R2': r2_score(y_true, y_pred)
+            })
+        return pd.DataFrame(rows).set_index('fold')
+        
+    def predict(self, data, prediction_days=7, symbol=None):
         """Make predictions for multiple days ahead."""
         if data is None:
             return None
             
         try:
-            # Prepare data for prediction
-            X, y, df, features = self.prepare_data(data)
+            # Prepare data and train the model (or reuse one fitted on the same data)
+            X, y, df, features = self.fit(data, symbol, self._horizon(prediction_days))
             
             if X is None or y is None or df is None:
                 return None
-                
-            # Train the model
-            score = self.train(X, y)
+            
+            if self.horizon_mode == 'direct':
+                # Every horizon comes out of one call on the latest features
+                latest = self.scaler.transform(self.latest_features.values)
+                predicted_prices = self.model.predict(latest)[0]
+                future_dates = pd.date_range(
+                    start=self.latest_features.index[-1] + pd.Timedelta(days=1),
+                    periods=prediction_days,
+                    freq='D'
+                )
+                return pd.DataFrame({'Predicted': predicted_prices}, index=future_dates)
             
             # Current date range
             last_date = df.index[-1]
@@ -203,9 +414,9 @@ class MLPredictor:
             st.error(f"Error calculating prediction metrics: {str(e)}")
             return None
             
-    def get_confidence_metrics(self, data):
+    def get_confidence_metrics(self, data, symbol=None, prediction_days=1):
         """Return confidence metrics for the prediction."""
-        X, y, df, features = self.prepare_data(data)
+        X, y, df, features = self.fit(data, symbol, self._horizon(prediction_days))
         
         if X is None or y is None:
             return {
@@ -214,7 +425,7 @@ class MLPredictor:
                 "reliability": "insufficient data" 
             }
             
-        score = self.train(X, y)
+        score = self.confidence.get('model_score', 0.0)
         
         reliability = "low"
         if score > 0.7:
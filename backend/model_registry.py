@@ -0,0 +1,125 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import pandas as pd
+
+from backend.shared_cache import estimate_size
+
+
+@dataclass
+class ModelEntry:
+    """A fitted model with the scaler and metrics it was trained with"""
+    model: Any
+    scaler: Any
+    confidence: Dict = field(default_factory=dict)
+    # Estimated once, when a registry first remembers the entry
+    bytes: Optional[int] = field(default=None, compare=False)
+
+
+def data_fingerprint(df: pd.DataFrame, features: List[str]) -> tuple:
+    """Cheap identity of a training frame: last timestamp, row count, last close and feature set"""
+    last_close = float(df['Close'].iloc[-1]) if len(df) else None
+    last_timestamp = str(df.index[-1]) if len(df) else None
+    return last_timestamp, len(df), last_close, tuple(features)
+
+
+class ModelRegistry:
+    """LRU cache of fitted models keyed by symbol, data fingerprint and hyperparameters.
+
+    Entries are also written to persist_dir with joblib when it is set, so a
+    restarted process can reuse models trained before.
+    """
+
+    def __init__(self, max_entries: int = 32, persist_dir: Optional[Path] = None):
+        self.max_entries = max_entries
+        self.persist_dir = Path(persist_dir) if persist_dir else None
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(symbol: Optional[str], df: pd.DataFrame, features: List[str], params: Dict) -> str:
+        """Build a stable key for a symbol, training frame and hyperparameters"""
+        raw = repr((symbol, data_fingerprint(df, features), sorted(params.items())))
+        return hashlib.sha1(raw.encode()).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.persist_dir / f"{key}.joblib"
+
+    def get(self, key: str) -> Optional[ModelEntry]:
+        """Get a registered model, falling back to disk, or None"""
+        import joblib
+
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key]
+
+        if self.persist_dir is None or not self._path(key).exists():
+            return None
+        try:
+            entry = joblib.load(self._path(key))
+        except Exception:
+            return None
+        self._remember(key, entry)
+        return entry
+
+    def put(self, key: str, entry: ModelEntry) -> None:
+        """Register a fitted model, evicting the least recently used ones"""
+        import joblib
+
+        self._remember(key, entry)
+        if self.persist_dir is not None:
+            self.persist_dir.mkdir(parents=True, exist_ok=True)
+            tmp_path = self._path(key).with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+            joblib.dump(entry, tmp_path)
+            os.replace(tmp_path, self._path(key))
+
+    def _remember(self, key: str, entry: ModelEntry) -> None:
+        if entry.bytes is None:
+            # Sizing pickles the forest, so it is done once here rather than on every describe()
+            entry.bytes = estimate_size(entry)
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def items(self) -> list:
+        """Get (key, entry) pairs of the models in memory"""
+        with self._lock:
+            return list(self._entries.items())
+
+    def describe(self) -> list:
+        """Get the key, model type, estimated size and score of every model in memory"""
+        with self._lock:
+            entries = list(self._entries.items())
+        return [
+            {
+                'key': key,
+                'type': type(entry.model).__name__,
+                'bytes': entry.bytes,
+                'model_score': entry.confidence.get('model_score'),
+                'training_samples': entry.confidence.get('training_samples')
+            }
+            for key, entry in entries
+        ]
+
+    def clear(self) -> None:
+        """Drop every registered model, including persisted ones"""
+        with self._lock:
+            self._entries.clear()
+        if self.persist_dir is not None and self.persist_dir.exists():
+            for path in self.persist_dir.glob("*.joblib"):
+                path.unlink(missing_ok=True)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# Shared by every MLPredictor in the process; set AITA_MODEL_DIR to persist models
+default_registry = ModelRegistry(persist_dir=os.environ.get("AITA_MODEL_DIR"))
@@ -0,0 +1,124 @@
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Iterator, Optional
+
+from backend.data_loader import DataLoader, normalize_symbol
+from backend.ml_predictor import MLPredictor
+
+
+@dataclass
+class PredictorSlot:
+    """A symbol's predictor and the lock sessions hold while using it"""
+    predictor: MLPredictor
+    lock: threading.Lock = field(default_factory=threading.Lock)
+    uses: int = 0
+
+
+class PredictorPool:
+    """Process-wide MLPredictor slots, one per symbol and horizon mode.
+
+    Sessions borrow a slot instead of keeping a predictor in their own
+    session state, so a model fitted for a symbol by one session serves every
+    other session. The predictor refits on its own when the data it is given
+    changes, and invalidate() drops slots outright. Beyond max_symbols the
+    least recently used slots are dropped.
+    """
+
+    def __init__(self, max_symbols: int = 32, n_jobs: Optional[int] = None):
+        self.max_symbols = max_symbols
+        self.n_jobs = n_jobs
+        self._slots = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _symbol(symbol: Optional[str]) -> Optional[str]:
+        return normalize_symbol(symbol.strip()).upper() if symbol else None
+
+    def _slot(self, key: tuple, n_jobs: Optional[int]) -> PredictorSlot:
+        with self._lock:
+            slot = self._slots.get(key)
+            if slot is None:
+                predictor = MLPredictor(
+                    n_jobs=n_jobs if n_jobs is not None else self.n_jobs, horizon_mode=key[1]
+                )
+                slot = self._slots[key] = PredictorSlot(predictor)
+            self._slots.move_to_end(key)
+            slot.uses += 1
+            while len(self._slots) > self.max_symbols:
+                self._slots.popitem(last=False)
+            return slot
+
+    @contextmanager
+    def borrow(self, symbol: Optional[str], horizon_mode: str = 'recursive',
+               n_jobs: Optional[int] = None) -> Iterator[MLPredictor]:
+        """Use a symbol's shared predictor, holding its slot so no other session refits it meanwhile
+
+        n_jobs only applies when the slot is created.
+        """
+        slot = self._slot((self._symbol(symbol), horizon_mode), n_jobs)
+        with slot.lock:
+            yield slot.predictor
+
+    def invalidate(self, symbol: Optional[str] = None) -> None:
+        """Drop a symbol's predictors, or every predictor when symbol is None"""
+        with self._lock:
+            if symbol is None:
+                self._slots.clear()
+                return
+            symbol = self._symbol(symbol)
+            for key in [key for key in self._slots if key[0] == symbol]:
+                del self._slots[key]
+
+    @staticmethod
+    def _model_bytes(predictor: MLPredictor) -> int:
+        # The registry sized the entry when it was registered
+        if predictor.model is None or predictor.entry is None:
+            return 0
+        return predictor.entry.bytes or 0
+
+    def describe(self) -> list:
+        """Get the symbol, horizon mode, use count, training state and model size of every slot
+
+        A trained predictor's model usually also sits in the model registry, so
+        its bytes are not extra memory on top of the registry's.
+        """
+        with self._lock:
+            slots = list(self._slots.items())
+        return [
+            {
+                'symbol': symbol,
+                'horizon_mode': horizon_mode,
+                'uses': slot.uses,
+                'trained': slot.predictor.model is not None,
+                'bytes': self._model_bytes(slot.predictor)
+            }
+            for (symbol, horizon_mode), slot in slots
+        ]
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+
+_PREDICTOR_POOL = None
+_DATA_LOADER = None
+_RESOURCES_LOCK = threading.Lock()
+
+
+def get_data_loader() -> DataLoader:
+    """Get the DataLoader every session shares"""
+    global _DATA_LOADER
+    with _RESOURCES_LOCK:
+        if _DATA_LOADER is None:
+            _DATA_LOADER = DataLoader()
+        return _DATA_LOADER
+
+
+def get_predictor_pool() -> PredictorPool:
+    """Get the process-wide predictor slots, creating them on first use"""
+    global _PREDICTOR_POOL
+    with _RESOURCES_LOCK:
+        if _PREDICTOR_POOL is None:
+            _PREDICTOR_POOL = PredictorPool()
+        return _PREDICTOR_POOL
@@ -0,0 +1,236 @@
+import random
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+# Shared by every engine so hedged attempts don't spawn threads per call
+FETCH_THREADS = 8
+_EXECUTOR = ThreadPoolExecutor(max_workers=FETCH_THREADS, thread_name_prefix="fetch")
+
+# Calls submitted and not yet finished, including abandoned ones still running
+_IN_FLIGHT = 0
+_IN_FLIGHT_LOCK = threading.Lock()
+
+
+def _finished(future) -> None:
+    global _IN_FLIGHT
+    with _IN_FLIGHT_LOCK:
+        _IN_FLIGHT -= 1
+
+
+def _submit(func: Callable[[], Any]):
+    """Run a call on the shared executor, counting it until it finishes"""
+    global _IN_FLIGHT
+    with _IN_FLIGHT_LOCK:
+        _IN_FLIGHT += 1
+    future = _EXECUTOR.submit(func)
+    future.add_done_callback(_finished)
+    return future
+
+
+def executor_busy() -> bool:
+    """Check whether every fetch thread is taken, e.g. by abandoned slow calls"""
+    with _IN_FLIGHT_LOCK:
+        return _IN_FLIGHT >= FETCH_THREADS
+
+
+class FetchMethod(NamedTuple):
+    """A named fetch; hedge=False keeps it from starting while another call is in flight"""
+    name: str
+    func: Callable[[], Any]
+    hedge: bool = True
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """Exponential backoff with jitter, bounded by an overall deadline"""
+    max_attempts: int = 3
+    base_delay: float = 0.25
+    max_delay: float = 2.0
+    jitter: float = 1.0
+    deadline: float = 10.0
+    hedge_delay: float = 1.5
+
+    def backoff(self, attempt: int) -> float:
+        """Delay before the given retry (0-based), with a random jitter fraction removed"""
+        delay = min(self.max_delay, self.base_delay * (2 ** attempt))
+        return delay * (1 - self.jitter * random.random())
+
+
+class CircuitBreaker:
+    """Stops calling a host after repeated failures until a cool-down passes"""
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at = None
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        """Get the breaker state: closed, open or half-open"""
+        with self._lock:
+            if self._opened_at is None:
+                return "closed"
+            if time.monotonic() - self._opened_at >= self.reset_timeout:
+                return "half-open"
+            return "open"
+
+    def allow(self) -> bool:
+        """Check whether a call may go through (half-open lets a probe through)"""
+        return self.state != "open"
+
+    def record_success(self) -> None:
+        """Close the breaker after a successful call"""
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+
+    @property
+    def failures(self) -> int:
+        """Get the number of failures since the last success"""
+        with self._lock:
+            return self._failures
+
+    def record_failure(self) -> None:
+        """Count a failed call, opening the breaker at the threshold"""
+        with self._lock:
+            self._failures += 1
+            if self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+
+
+_BREAKERS: Dict[str, CircuitBreaker] = {}
+_BREAKERS_LOCK = threading.Lock()
+
+
+def get_breaker(host: str) -> CircuitBreaker:
+    """Get the process-wide circuit breaker for a host"""
+    with _BREAKERS_LOCK:
+        if host not in _BREAKERS:
+            _BREAKERS[host] = CircuitBreaker()
+        return _BREAKERS[host]
+
+
+def is_present(result: Any) -> bool:
+    """Accept any answer, including an empty frame (e.g. no new bars yet)"""
+    return result is not None
+
+
+def is_usable(result: Any) -> bool:
+    """Treat None and empty frames as failed attempts"""
+    if result is None:
+        return False
+    empty = getattr(result, "empty", None)
+    return not empty if empty is not None else bool(result)
+
+
+class RetryEngine:
+    """Runs alternative fetch methods as hedged attempts under a retry policy"""
+
+    def __init__(self, policy: RetryPolicy = None, breaker: CircuitBreaker = None,
+                 is_valid: Callable[[Any], bool] = is_usable):
+        self.policy = policy or RetryPolicy()
+        self.breaker = breaker
+        self.is_valid = is_valid
+
+    def first_success(self, methods: Sequence[Tuple]) -> Tuple[Optional[str], Any]:
+        """Return (name, result) from the first method that succeeds, or (None, None).
+
+        methods are FetchMethod entries or (name, func) pairs. Within an attempt
+        they are launched in order, each one starting after hedge_delay or as
+        soon as every in-flight method has failed. Hedging (starting a method
+        while another is still running) only happens for methods marked hedge,
+        while the breaker has seen no failures and fetch threads are free, so
+        a throttled host is not sent extra requests. The first usable result
+        wins and the remaining futures are cancelled (a call already in
+        progress finishes in the background and is ignored).
+
+        Only exceptions and timeouts count against the breaker; an answer
+        that is_valid rejects (such as an empty frame) still came from a
+        healthy host.
+        """
+        methods = [FetchMethod(*method) for method in methods]
+        deadline = time.monotonic() + self.policy.deadline
+        errors: List[str] = []
+        self.errors = errors
+
+        for attempt in range(self.policy.max_attempts):
+            if self.breaker is not None and not self.breaker.allow():
+                break
+
+            name, result, host_failed = self._run_attempt(methods, deadline, errors)
+            if name is not None:
+                if self.breaker is not None:
+                    self.breaker.record_success()
+                return name, result
+
+            if self.breaker is not None and host_failed:
+                self.breaker.record_failure()
+
+            remaining = deadline - time.monotonic()
+            if attempt == self.policy.max_attempts - 1 or remaining <= 0:
+                break
+            time.sleep(min(self.policy.backoff(attempt), remaining))
+
+        return None, None
+
+    def call(self, func: Callable[[], Any], name: str = "call") -> Any:
+        """Retry a single callable under the policy"""
+        return self.first_success([FetchMethod(name, func)])[1]
+
+    def _may_hedge(self, method: FetchMethod) -> bool:
+        """Check whether a method may start alongside the ones in flight"""
+        if not method.hedge or executor_busy():
+            return False
+        return self.breaker is None or self.breaker.failures == 0
+
+    def _run_attempt(self, methods, deadline, errors):
+        """Run one hedged round over all methods.
+
+        Returns (name, result, host_failed), where host_failed is set when a
+        method raised or the deadline passed.
+        """
+        pending = {}
+        queue = list(methods)
+        next_launch = time.monotonic()
+        host_failed = False
+
+        try:
+            while queue or pending:
+                now = time.monotonic()
+                if now >= deadline:
+                    return None, None, True
+
+                # Launch the next method when nothing is in flight, or when its
+                # hedge timer fires and hedging is allowed
+                hedge = bool(queue) and self._may_hedge(queue[0])
+                if queue and (not pending or (hedge and now >= next_launch)):
+                    method = queue.pop(0)
+                    pending[_submit(method.func)] = method.name
+                    next_launch = now + self.policy.hedge_delay
+                    hedge = bool(queue) and self._may_hedge(queue[0])
+
+                timeout = deadline - now
+                if hedge:
+                    timeout = min(timeout, max(0.0, next_launch - now))
+                done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+
+                for future in done:
+                    name = pending.pop(future)
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        errors.append(f"{name}: {str(e)}")
+                        host_failed = True
+                        continue
+                    if self.is_valid(result):
+                        return name, result, host_failed
+                    errors.append(f"{name}: empty result")
+            return None, None, host_failed
+        finally:
+            for future in pending:
+                future.cancel()
@@ -0,0 +1,338 @@
+import copy
+import hashlib
+import os
+import pickle
+import sys
+import threading
+import time
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Callable, Iterator, Optional
+
+import numpy as np
+import pandas as pd
+
+# Number of evictions remembered for get_eviction_history
+EVICTION_HISTORY = 200
+
+# Memory the shared cache may hold before evicting; set AITA_CACHE_MAX_MB to change it
+DEFAULT_MAX_BYTES = int(os.environ.get("AITA_CACHE_MAX_MB", 512)) * 1024 ** 2
+
+
+def estimate_size(value) -> int:
+    """Estimate the bytes held by a cached value"""
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(deep=True).sum())
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(deep=True))
+    if isinstance(value, np.ndarray):
+        return int(value.nbytes)
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(estimate_size(item) for item in value)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(
+            estimate_size(name) + estimate_size(item) for name, item in value.items()
+        )
+    if isinstance(value, (str, bytes, int, float, bool, type(None))):
+        return sys.getsizeof(value)
+    try:
+        # Models and other objects: their pickled size tracks what they hold
+        return len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+    except Exception:
+        return sys.getsizeof(value)
+
+
+def private_copy(value):
+    """Copy a cached value, so changes a caller makes don't reach other sessions"""
+    if isinstance(value, (str, bytes, int, float, bool, type(None))):
+        return value
+    try:
+        return copy.deepcopy(value)
+    except Exception:
+        return value
+
+
+def _feed_array(digest, values) -> None:
+    """Feed an array's raw bytes into a hash, or pandas' per-value hashes for objects"""
+    values = np.asarray(values)
+    digest.update(repr((values.shape, values.dtype.str)).encode())
+    if values.dtype.kind in 'biufcmM':
+        digest.update(np.ascontiguousarray(values).view(np.uint8))
+    else:
+        digest.update(pd.util.hash_array(values.ravel()).view(np.uint8))
+
+
+def _feed(digest, value) -> None:
+    """Feed a stable representation of a value into a hash"""
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        # Content fingerprint: hashes every cell without building a string of the frame
+        if isinstance(value, pd.DataFrame):
+            digest.update(repr(('DataFrame', list(value.columns), list(value.dtypes))).encode())
+            for position in range(value.shape[1]):
+                _feed_array(digest, value.iloc[:, position].to_numpy())
+        else:
+            digest.update(repr(('Series', value.name, value.dtype)).encode())
+            _feed_array(digest, value.to_numpy())
+        index = value.index
+        if isinstance(index, pd.DatetimeIndex):
+            digest.update(str(index.tz).encode())
+            _feed_array(digest, index.asi8)
+        else:
+            _feed_array(digest, index.to_numpy())
+    elif isinstance(value, np.ndarray):
+        _feed_array(digest, value)
+    elif isinstance(value, (datetime, date, pd.Timestamp)):
+        # Equal instants hash alike whatever their type (date, datetime or Timestamp)
+        digest.update(pd.Timestamp(value).isoformat().encode())
+    elif isinstance(value, (list, tuple)):
+        digest.update(f"{type(value).__name__}{len(value)}".encode())
+        for item in value:
+            _feed(digest, item)
+    elif isinstance(value, dict):
+        digest.update(f"dict{len(value)}".encode())
+        for name in sorted(value, key=repr):
+            _feed(digest, name)
+            _feed(digest, value[name])
+    else:
+        digest.update(f"{type(value).__name__}:{value!r}".encode())
+    digest.update(b"|")
+
+
+def make_cache_key(func: Callable, args: tuple, kwargs: dict) -> str:
+    """Build a short, stable cache key for a function call"""
+    digest = hashlib.sha256()
+    _feed(digest, args)
+    _feed(digest, kwargs)
+    return f"cache_{func.__module__}.{func.__qualname__}_{digest.hexdigest()[:32]}"
+
+
+class SharedCache:
+    """Process-wide LRU cache shared by every session.
+
+    Entries expire after their TTL, measured on the monotonic clock, and the
+    least recently used ones are evicted beyond max_entries or once the
+    entries' estimated sizes add up to more than max_bytes. Concurrent
+    misses on the same key wait for a single computation instead of each
+    running it. Every caller gets its own copy of a value, so one session
+    changing a returned frame does not change it for the others. When
+    persist_dir is set, entries are also pickled to disk so they survive a
+    restart.
+    """
+
+    def __init__(self, max_entries: int = 256, max_bytes: int = DEFAULT_MAX_BYTES,
+                 persist_dir: Optional[Path] = None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.persist_dir = Path(persist_dir) if persist_dir else None
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._key_locks = {}  # key -> [lock, sessions holding or waiting for it]
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self._evicted = deque(maxlen=EVICTION_HISTORY)
+
+    def _path(self, key: str) -> Path:
+        return self.persist_dir / f"{hashlib.sha1(key.encode()).hexdigest()}.pkl"
+
+    @staticmethod
+    def age_seconds(entry: dict) -> float:
+        """Seconds since an entry was stored"""
+        return time.monotonic() - entry['created']
+
+    def _lookup(self, key: str, ttl_seconds: float) -> tuple:
+        """Find a live entry in memory, then on disk, without counting the lookup"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if self.age_seconds(entry) < ttl_seconds:
+                    self._entries.move_to_end(key)
+                    self._touch(entry)
+                    return True, entry['data']
+                del self._entries[key]
+                self._bytes -= entry['bytes']
+                self.expirations += 1
+                self._record_eviction(key, entry, 'expired')
+
+        entry = self._load(key)
+        if entry is not None and self.age_seconds(entry) < ttl_seconds:
+            self._touch(entry)
+            self._remember(key, entry)
+            return True, entry['data']
+        return False, None
+
+    @staticmethod
+    def _touch(entry: dict) -> None:
+        entry['hits'] += 1
+        entry['last_access'] = datetime.now()
+
+    def _record_eviction(self, key: str, entry: dict, reason: str) -> None:
+        """Remember why an entry left memory (called with the lock held)"""
+        self._evicted.append({
+            'key': key,
+            'reason': reason,
+            'evicted_at': datetime.now(),
+            'bytes': entry['bytes'],
+            'hits': entry['hits'],
+            'age_seconds': self.age_seconds(entry)
+        })
+
+    def _count(self, hit: bool) -> None:
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def get(self, key: str, ttl_seconds: float) -> tuple:
+        """Get (found, value) for a key that has not expired"""
+        found, value = self._lookup(key, ttl_seconds)
+        self._count(found)
+        return found, private_copy(value) if found else None
+
+    def set(self, key: str, value: Any) -> None:
+        """Store a value, evicting the least recently used entries"""
+        now = datetime.now()
+        entry = {
+            'data': value,
+            'timestamp': now,
+            'created': time.monotonic(),
+            'saved_at': time.time(),
+            'bytes': estimate_size(value),
+            'hits': 0,
+            'last_access': now
+        }
+        self._remember(key, entry)
+        if self.persist_dir is not None:
+            try:
+                self.persist_dir.mkdir(parents=True, exist_ok=True)
+                tmp_path = self._path(key).with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+                with open(tmp_path, 'wb') as f:
+                    pickle.dump((key, entry), f)
+                os.replace(tmp_path, self._path(key))
+            except Exception:
+                pass  # Unpicklable values are only cached in memory
+
+    def get_or_compute(self, key: str, compute: Callable[[], Any], ttl_seconds: int) -> Any:
+        """Get a cached value, computing it once per key however many sessions miss together"""
+        found, value = self._lookup(key, ttl_seconds)
+        if not found:
+            with self._key_lock(key):
+                # Another session may have filled the entry while we waited
+                found, value = self._lookup(key, ttl_seconds)
+                if not found:
+                    value = compute()
+                    self.set(key, value)
+        self._count(found)
+        return private_copy(value)
+
+    @contextmanager
+    def _key_lock(self, key: str) -> Iterator[None]:
+        """Hold a key's compute lock, which is dropped once no session holds or waits for it"""
+        with self._lock:
+            slot = self._key_locks.setdefault(key, [threading.Lock(), 0])
+            slot[1] += 1
+        try:
+            with slot[0]:
+                yield
+        finally:
+            with self._lock:
+                slot[1] -= 1
+                if slot[1] == 0:
+                    del self._key_locks[key]
+
+    def _remember(self, key: str, entry: dict) -> None:
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous['bytes']
+            self._entries[key] = entry
+            self._bytes += entry['bytes']
+            # A value larger than the whole budget is evicted straight away
+            while len(self._entries) > self.max_entries or (self._entries and self._bytes > self.max_bytes):
+                reason = 'lru' if len(self._entries) > self.max_entries else 'size'
+                evicted, evicted_entry = self._entries.popitem(last=False)
+                self._bytes -= evicted_entry['bytes']
+                self.evictions += 1
+                self._record_eviction(evicted, evicted_entry, reason)
+
+    def _load(self, key: str) -> Optional[dict]:
+        if self.persist_dir is None or not self._path(key).exists():
+            return None
+        try:
+            with open(self._path(key), 'rb') as f:
+                stored_key, entry = pickle.load(f)
+        except Exception:
+            return None
+        if stored_key != key:
+            return None
+        # Monotonic times don't survive a restart, so rebase the age on the wall clock
+        entry['created'] = time.monotonic() - max(0.0, time.time() - entry['saved_at'])
+        entry.setdefault('bytes', estimate_size(entry['data']))
+        entry.setdefault('hits', 0)
+        entry.setdefault('last_access', entry['timestamp'])
+        return entry
+
+    def delete(self, key: str) -> None:
+        """Remove a key from memory and disk"""
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self._bytes -= entry['bytes']
+                self._record_eviction(key, entry, 'deleted')
+        if self.persist_dir is not None:
+            self._path(key).unlink(missing_ok=True)
+
+    def keys(self) -> list:
+        """Get the keys held in memory"""
+        with self._lock:
+            return list(self._entries)
+
+    def items(self) -> list:
+        """Get (key, entry) pairs held in memory"""
+        with self._lock:
+            return list(self._entries.items())
+
+    def stats(self) -> dict:
+        """Get hit, miss, eviction and expiry counters"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes
+            }
+
+    def describe(self) -> list:
+        """Get size, hits, creation and last access time of every entry in memory"""
+        with self._lock:
+            return [
+                {
+                    'key': key,
+                    'type': type(entry['data']).__name__,
+                    'bytes': entry['bytes'],
+                    'hits': entry['hits'],
+                    'created': entry['timestamp'],
+                    'last_access': entry['last_access'],
+                    'age_seconds': self.age_seconds(entry)
+                }
+                for key, entry in self._entries.items()
+            ]
+
+    def eviction_history(self) -> list:
+        """Get the most recent evictions, oldest first"""
+        with self._lock:
+            return list(self._evicted)
+
+
+# Shared by every session in the process; set AITA_CACHE_DIR to also cache on disk
+shared_cache = SharedCache(persist_dir=os.environ.get("AITA_CACHE_DIR"))
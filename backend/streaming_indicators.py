@@ -0,0 +1,368 @@
+import copy
+import math
+from collections import deque
+from typing import Dict
+
+import numpy as np
+import pandas as pd
+
+from backend.indicator_engine import TECHNICAL_INDICATORS, IndicatorSpec, ewm_mean
+
+NAN = float('nan')
+
+# Saved states with another version are re-seeded instead of restored; bump it
+# when the meaning of a saved accumulator changes
+STATE_VERSION = 2
+
+
+def _is_valid(value) -> bool:
+    return value is not None and not math.isnan(value)
+
+
+class RollingWindow:
+    """Running sum and sum of squares over the last `window` values"""
+
+    def __init__(self, window: int, min_periods: int = None):
+        self.window = window
+        self.min_periods = window if min_periods is None else min_periods
+        self.values = deque(maxlen=window)
+        self.total = 0.0
+        self.total_sq = 0.0
+        self.count = 0
+        # Squares are accumulated around the first value to limit cancellation error
+        self.anchor = None
+
+    def seed(self, values: np.ndarray) -> None:
+        """Start from the tail of a history array"""
+        self.__init__(self.window, self.min_periods)
+        for value in np.asarray(values, dtype=np.float64)[-self.window:]:
+            self.update(float(value))
+
+    def update(self, value: float) -> None:
+        """Push a value, dropping the oldest one once the window is full"""
+        if len(self.values) == self.window:
+            old = self.values[0]
+            if _is_valid(old):
+                self.total -= old
+                self.total_sq -= (old - self.anchor) ** 2
+                self.count -= 1
+        self.values.append(value)
+        if _is_valid(value):
+            if self.anchor is None:
+                self.anchor = value
+            self.total += value
+            self.total_sq += (value - self.anchor) ** 2
+            self.count += 1
+
+    def mean(self) -> float:
+        if self.count < max(self.min_periods, 1):
+            return NAN
+        return self.total / self.count
+
+    def std(self, ddof: int = 1) -> float:
+        if self.count < max(self.min_periods, 1) or self.count - ddof <= 0:
+            return NAN
+        centered = self.total - self.count * self.anchor
+        var = (self.total_sq - centered * centered / self.count) / (self.count - ddof)
+        return math.sqrt(max(var, 0.0))
+
+    def to_dict(self) -> dict:
+        return {'window': self.window, 'min_periods': self.min_periods, 'values': list(self.values)}
+
+    @classmethod
+    def from_dict(cls, state: dict) -> 'RollingWindow':
+        window = cls(state['window'], state['min_periods'])
+        for value in state['values']:
+            window.update(value)
+        return window
+
+
+class EWMState:
+    """Exponentially weighted mean accumulator, matching pandas ewm().mean()
+
+    With adjust=False, den holds the weight of the running mean against the
+    next observation: 1 after an observation, decaying through missing ones.
+    """
+
+    def __init__(self, alpha: float, adjust: bool = True, min_periods: int = 0):
+        self.alpha = alpha
+        self.adjust = adjust
+        self.min_periods = min_periods
+        self.num = 0.0
+        self.den = 0.0
+        self.value = NAN
+        self.nobs = 0
+
+    def seed(self, values: np.ndarray) -> None:
+        """Start from a full history array, evaluated as one linear filter"""
+        from scipy.signal import lfilter
+
+        self.__init__(self.alpha, self.adjust, self.min_periods)
+        values = np.asarray(values, dtype=np.float64)
+        valid = ~np.isnan(values)
+        if not valid.any():
+            return
+        values = values[np.argmax(valid):]
+        valid = valid[np.argmax(valid):]
+        decay = 1.0 - self.alpha
+        self.nobs = int(valid.sum())
+        if self.adjust:
+            self.num = float(lfilter([1.0], [1.0, -decay], np.where(valid, values, 0.0))[-1])
+            self.den = float(lfilter([1.0], [1.0, -decay], valid.astype(np.float64))[-1])
+            self.value = self.num / self.den
+        elif valid.all():
+            out, _ = lfilter([self.alpha], [1.0, -decay], values, zi=[decay * values[0]])
+            self.value = float(out[-1])
+            self.den = 1.0
+        else:
+            # A gap re-weights the next value, which no fixed filter does; same
+            # recursion as indicator_engine.ewm_mean, one row at a time
+            self.nobs = 0
+            for value in values:
+                self.update(float(value))
+
+    def update(self, value: float) -> float:
+        """Fold in one observation and return the current mean"""
+        if _is_valid(value):
+            self.nobs += 1
+            if self.adjust:
+                self.num = self.num * (1.0 - self.alpha) + value
+                self.den = self.den * (1.0 - self.alpha) + 1.0
+                self.value = self.num / self.den
+            elif _is_valid(self.value):
+                weight = self.den * (1.0 - self.alpha)
+                self.value = (weight * self.value + self.alpha * value) / (weight + self.alpha)
+                self.den = 1.0
+            else:
+                self.value = value
+                self.den = 1.0
+        elif self.den:
+            self.num *= 1.0 - self.alpha
+            self.den *= 1.0 - self.alpha
+        return self.current()
+
+    def current(self) -> float:
+        return self.value if self.nobs >= max(self.min_periods, 1) else NAN
+
+    def to_dict(self) -> dict:
+        return {key: getattr(self, key) for key in ('alpha', 'adjust', 'min_periods', 'num', 'den', 'value', 'nobs')}
+
+    @classmethod
+    def from_dict(cls, state: dict) -> 'EWMState':
+        ewm = cls(state['alpha'], state['adjust'], state['min_periods'])
+        ewm.num, ewm.den, ewm.value, ewm.nobs = state['num'], state['den'], state['value'], state['nobs']
+        return ewm
+
+
+class RSIState:
+    """RSI from rolling-mean or Wilder-smoothed gains and losses"""
+
+    def __init__(self, window: int = 14, method: str = 'sma', min_periods: int = None):
+        self.window = window
+        self.method = method
+        self.min_periods = window if min_periods is None else min_periods
+        self.prev_close = None
+        self.rows = 0
+        if method == 'wilder':
+            self.gain = EWMState(1.0 / window, adjust=False, min_periods=self.min_periods)
+            self.loss = EWMState(1.0 / window, adjust=False, min_periods=self.min_periods)
+        else:
+            self.gain = RollingWindow(window, 0)
+            self.loss = RollingWindow(window, 0)
+
+    def _gains_losses(self, close: np.ndarray):
+        delta = np.diff(close, prepend=NAN if self.prev_close is None else self.prev_close)
+        # As in IndicatorEngine: bars without a close have no gain or loss at all
+        missing = np.isnan(close)
+        gain = np.where(missing, NAN, np.where(delta > 0, delta, 0.0))
+        loss = np.where(missing, NAN, np.where(delta < 0, -delta, 0.0))
+        return gain, loss
+
+    def seed(self, close: np.ndarray) -> None:
+        self.__init__(self.window, self.method, self.min_periods)
+        close = np.asarray(close, dtype=np.float64)
+        if len(close) == 0:
+            return
+        gain, loss = self._gains_losses(close)
+        self.gain.seed(gain)
+        self.loss.seed(loss)
+        self.prev_close = float(close[-1])
+        self.rows = len(close)
+
+    def update(self, close: float) -> float:
+        gain, loss = self._gains_losses(np.array([close]))
+        self.gain.update(float(gain[0]))
+        self.loss.update(float(loss[0]))
+        self.prev_close = close
+        self.rows += 1
+        return self.current()
+
+    def current(self) -> float:
+        if self.method == 'wilder':
+            avg_gain, avg_loss = self.gain.current(), self.loss.current()
+        else:
+            if min(self.rows, self.window) < max(self.min_periods, 1):
+                return NAN
+            avg_gain, avg_loss = self.gain.mean(), self.loss.mean()
+        if not (avg_gain + avg_loss):
+            return NAN
+        return 100.0 * avg_gain / (avg_gain + avg_loss)
+
+    def to_dict(self) -> dict:
+        return {
+            'window': self.window, 'method': self.method, 'min_periods': self.min_periods,
+            'prev_close': self.prev_close, 'rows': self.rows,
+            'gain': self.gain.to_dict(), 'loss': self.loss.to_dict()
+        }
+
+    @classmethod
+    def from_dict(cls, state: dict) -> 'RSIState':
+        rsi = cls(state['window'], state['method'], state['min_periods'])
+        inner = EWMState if state['method'] == 'wilder' else RollingWindow
+        rsi.gain, rsi.loss = inner.from_dict(state['gain']), inner.from_dict(state['loss'])
+        rsi.prev_close, rsi.rows = state['prev_close'], state['rows']
+        return rsi
+
+
+class IndicatorState:
+    """Streaming counterpart of IndicatorEngine: seed from history, then update(bar) in O(1).
+
+    Produces the same columns as compute_indicators for the same spec, for the
+    last bar only. Persist with to_dict/from_dict (JSON-serializable).
+    """
+
+    def __init__(self, spec: IndicatorSpec = TECHNICAL_INDICATORS):
+        self.spec = spec
+        self.last_timestamp = None
+        self._states = {names: self._build(indicator, params) for names, (indicator, params) in spec.items()}
+
+    @staticmethod
+    def _build(indicator: str, params: dict):
+        """Create the accumulators for one spec entry"""
+        if indicator == 'sma':
+            return {'window': RollingWindow(params['window'], params.get('min_periods'))}
+        if indicator == 'rolling_std':
+            return {'window': RollingWindow(params['window'], params.get('min_periods'))}
+        if indicator == 'bollinger':
+            return {'window': RollingWindow(params.get('window', 20), params.get('min_periods'))}
+        if indicator == 'ema':
+            return {'ewm': EWMState(2.0 / (params['span'] + 1.0), params.get('adjust', True),
+                                    params.get('min_periods', 0))}
+        if indicator == 'rsi':
+            return {'rsi': RSIState(params.get('window', 14), params.get('method', 'sma'), params.get('min_periods'))}
+        if indicator == 'macd':
+            adjust = params.get('adjust', False)
+            return {
+                'fast': EWMState(2.0 / (params.get('fast', 12) + 1.0), adjust, params.get('fast_min_periods', 0)),
+                'slow': EWMState(2.0 / (params.get('slow', 26) + 1.0), adjust, params.get('slow_min_periods', 0)),
+                'signal': EWMState(2.0 / (params.get('signal', 9) + 1.0), adjust, params.get('signal_min_periods', 0)),
+            }
+        if indicator == 'vwap':
+            return {'price_volume': 0.0, 'volume': 0.0, 'missing': False}
+        raise ValueError(f"Unsupported streaming indicator: {indicator}")
+
+    def seed(self, data: pd.DataFrame) -> Dict[str, float]:
+        """Initialise every accumulator from a frame of historical bars"""
+        close = data['Close'].to_numpy(dtype=np.float64)
+        for names, (indicator, params) in self.spec.items():
+            state = self._states[names]
+            if 'window' in state:
+                state['window'].seed(close)
+            elif indicator == 'ema':
+                state['ewm'].seed(close)
+            elif indicator == 'rsi':
+                state['rsi'].seed(close)
+            elif indicator == 'macd':
+                state['fast'].seed(close)
+                state['slow'].seed(close)
+                # The signal line's EWM is seeded from the full MACD line history
+                fast, slow = state['fast'], state['slow']
+                line = (ewm_mean(close, fast.alpha, fast.adjust, fast.min_periods)
+                        - ewm_mean(close, slow.alpha, slow.adjust, slow.min_periods))
+                state['signal'].seed(line)
+            elif indicator == 'vwap':
+                volume = data['Volume'].to_numpy(dtype=np.float64)
+                # As in IndicatorEngine.vwap: missing values add nothing, and a
+                # bar without a close has no VWAP
+                state['price_volume'] = float(np.nansum(close * volume))
+                state['volume'] = float(np.nansum(volume))
+                state['missing'] = bool(len(close)) and math.isnan(close[-1])
+        self.last_timestamp = data.index[-1] if len(data) else None
+        return self.current()
+
+    def update(self, bar, timestamp=None) -> Dict[str, float]:
+        """Fold in one new bar (a mapping with Close, and Volume for VWAP)"""
+        close = float(bar['Close'])
+        for names, (indicator, params) in self.spec.items():
+            state = self._states[names]
+            if 'window' in state:
+                state['window'].update(close)
+            elif indicator == 'ema':
+                state['ewm'].update(close)
+            elif indicator == 'rsi':
+                state['rsi'].update(close)
+            elif indicator == 'macd':
+                line = state['fast'].update(close) - state['slow'].update(close)
+                state['signal'].update(line)
+            elif indicator == 'vwap':
+                volume = float(bar['Volume'])
+                state['price_volume'] += float(np.nansum(close * volume))
+                state['volume'] += float(np.nansum(volume))
+                state['missing'] = math.isnan(close)
+        self.last_timestamp = timestamp if timestamp is not None else getattr(bar, 'name', None)
+        return self.current()
+
+    def peek(self, bar) -> Dict[str, float]:
+        """Values as if a bar were appended, without changing the state.
+
+        Use this for a bar that is still forming, so later revisions of it
+        are not folded in twice.
+        """
+        return copy.deepcopy(self).update(bar)
+
+    def current(self) -> Dict[str, float]:
+        """Latest value of every output column"""
+        values = {}
+        for names, (indicator, params) in self.spec.items():
+            state = self._states[names]
+            if indicator == 'sma':
+                values[names] = state['window'].mean()
+            elif indicator == 'rolling_std':
+                values[names] = state['window'].std(params.get('ddof', 1))
+            elif indicator == 'bollinger':
+                middle = state['window'].mean()
+                width = params.get('num_std', 2.0) * state['window'].std(params.get('ddof', 1))
+                values.update(zip(names, (middle + width, middle, middle - width)))
+            elif indicator == 'ema':
+                values[names] = state['ewm'].current()
+            elif indicator == 'rsi':
+                values[names] = state['rsi'].current()
+            elif indicator == 'macd':
+                line = state['fast'].current() - state['slow'].current()
+                values.update(zip(names, (line, state['signal'].current())))
+            elif indicator == 'vwap':
+                values[names] = state['price_volume'] / state['volume'] if state['volume'] and not state['missing'] else NAN
+        return {name: value for name, value in values.items() if name is not None}
+
+    def to_dict(self) -> dict:
+        """Serialize the accumulators (the spec itself is not stored)"""
+        states = []
+        for names in self.spec:
+            states.append({
+                key: value.to_dict() if hasattr(value, 'to_dict') else value
+                for key, value in self._states[names].items()
+            })
+        last = self.last_timestamp.isoformat() if self.last_timestamp is not None else None
+        return {'version': STATE_VERSION, 'last_timestamp': last, 'states': states}
+
+    @classmethod
+    def from_dict(cls, state: dict, spec: IndicatorSpec = TECHNICAL_INDICATORS) -> 'IndicatorState':
+        """Restore accumulators saved with to_dict for the same spec"""
+        restored = cls(spec)
+        for names, saved in zip(spec, state['states']):
+            for key, value in saved.items():
+                current = restored._states[names][key]
+                restored._states[names][key] = type(current).from_dict(value) if hasattr(current, 'to_dict') else value
+        if state['last_timestamp'] is not None:
+            restored.last_timestamp = pd.Timestamp(state['last_timestamp'])
+        return restored
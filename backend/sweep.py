@@ -0,0 +1,156 @@
+import itertools
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Dict, Iterable, List
+
+import numpy as np
+import pandas as pd
+
+from backend.backtest import TRADING_DAYS, SignalFunction, asset_returns, strategy_arrays
+from backend.forecast_pool import WORKER_CONTEXT
+from backend.indicator_engine import IndicatorEngine, _as_float_array
+
+# Default search space for each strategy on the Trading Strategies page
+SWEEP_GRIDS: Dict[str, Dict[str, Iterable]] = {
+    "Moving Average Crossover": {'fast': range(5, 201, 5), 'slow': range(5, 201, 5)},
+    "RSI Strategy": {'window': range(5, 31), 'lower': range(10, 45, 5), 'upper': range(55, 95, 5)},
+    "MACD Strategy": {'fast': range(4, 21, 2), 'slow': range(20, 51, 5), 'signal': range(5, 16, 2)},
+}
+
+# Sweep processes shared by every session in the server process
+SWEEP_WORKERS = int(os.environ.get('AITA_SWEEP_WORKERS', 2))
+
+# Price arrays of the sweep a worker process last attached to (see _worker_arrays)
+_WORKER = {}
+
+
+def param_grid(grid: Dict[str, Iterable]) -> List[Dict]:
+    """Every combination of a parameter grid, skipping fast >= slow and lower >= upper"""
+    names = list(grid)
+    combos = []
+    for values in itertools.product(*(list(grid[name]) for name in names)):
+        params = dict(zip(names, values))
+        if params.get('fast', 0) >= params.get('slow', np.inf):
+            continue
+        if params.get('lower', 0) >= params.get('upper', np.inf):
+            continue
+        combos.append(params)
+    return combos
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    """Attach to the parent's shared block without letting this process unlink it"""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:  # Python < 3.13 has no track argument
+        return shared_memory.SharedMemory(name=name)
+
+
+def _worker_arrays(name: str, shape: tuple) -> dict:
+    """Map a sweep's shared close matrix and precompute its bar returns once per worker"""
+    if _WORKER.get('name') != name:
+        if 'shm' in _WORKER:
+            _WORKER['shm'].close()
+        _WORKER.clear()
+        shm = _attach(name)
+        close = np.ndarray(shape, dtype=np.float64, buffer=shm.buf)
+        _WORKER.update(name=name, shm=shm, close=close, returns=asset_returns(close), missing=np.isnan(close))
+    return _WORKER
+
+
+def _metrics(arrays: Dict[str, np.ndarray]) -> Dict[str, float]:
+    """Per-symbol metrics averaged over the universe, without building frames"""
+    returns = arrays['returns']
+    with np.errstate(invalid='ignore', divide='ignore'):
+        sharpe = returns.mean(axis=0) / returns.std(axis=0, ddof=1) * np.sqrt(TRADING_DAYS)
+    entries = np.diff((arrays['positions'] != 0).astype(np.int8), axis=0, prepend=0) == 1
+    return {
+        'total_return': float(np.mean(arrays['equity'][-1] - 1)),
+        'sharpe_ratio': float(np.nanmean(sharpe)) if np.isfinite(sharpe).any() else np.nan,
+        'max_drawdown': float(np.mean(arrays['drawdown'].min(axis=0))),
+        'trades': int(entries.sum()),
+    }
+
+
+def _evaluate(close, bar_returns, missing, signal: SignalFunction, combos: List[Dict], fee: float) -> List[Dict]:
+    """Backtest a chunk of parameter combinations, sharing one indicator engine"""
+    engine = IndicatorEngine(close)
+    rows = []
+    for params in combos:
+        arrays = strategy_arrays(bar_returns, missing, signal(engine, **params), fee)
+        rows.append({**params, **_metrics(arrays)})
+    return rows
+
+
+def _run_chunk(name: str, shape: tuple, signal: SignalFunction, combos: List[Dict], fee: float) -> List[Dict]:
+    arrays = _worker_arrays(name, shape)
+    return _evaluate(arrays['close'], arrays['returns'], arrays['missing'], signal, combos, fee)
+
+
+def _chunks(combos: List[Dict], count: int) -> List[List[Dict]]:
+    """Split combinations into contiguous chunks, so neighbours share indicator windows"""
+    size = max(1, -(-len(combos) // count))
+    return [combos[i:i + size] for i in range(0, len(combos), size)]
+
+
+_SWEEP_POOL = None
+_SWEEP_POOL_LOCK = threading.Lock()
+
+
+def get_sweep_pool() -> ProcessPoolExecutor:
+    """Get the process-wide sweep pool, starting it on first use.
+
+    Workers are started with WORKER_CONTEXT and stay up between sweeps, so
+    their startup is paid once.
+    """
+    global _SWEEP_POOL
+    with _SWEEP_POOL_LOCK:
+        if _SWEEP_POOL is None:
+            _SWEEP_POOL = ProcessPoolExecutor(SWEEP_WORKERS, mp_context=WORKER_CONTEXT)
+        return _SWEEP_POOL
+
+
+def run_sweep(close: pd.DataFrame, signal: SignalFunction, grid: Dict[str, Iterable], fee: float = 0.0,
+              rank_by: str = 'sharpe_ratio', max_workers: int = None) -> pd.DataFrame:
+    """Backtest every parameter combination over a close panel, returning a ranked table.
+
+    The close matrix is copied once into shared memory; the shared sweep pool's
+    workers map it read-only instead of receiving a pickled copy with every
+    task. Metrics are averaged over the symbols in the panel (trades are
+    summed). With max_workers=1 (or a single worker configured) the sweep
+    runs in this process; otherwise at most SWEEP_WORKERS processes run it.
+    """
+    if isinstance(close, pd.Series):
+        close = close.to_frame()
+    combos = param_grid(grid)
+    values = _as_float_array(close)
+    max_workers = min(max_workers or SWEEP_WORKERS, SWEEP_WORKERS)
+
+    if max_workers <= 1 or len(combos) < 2:
+        rows = _evaluate(values, asset_returns(values), np.isnan(values), signal, combos, fee)
+    else:
+        shm = shared_memory.SharedMemory(create=True, size=max(values.nbytes, 1))
+        try:
+            np.ndarray(values.shape, dtype=np.float64, buffer=shm.buf)[:] = values
+            futures = [
+                get_sweep_pool().submit(_run_chunk, shm.name, values.shape, signal, chunk, fee)
+                for chunk in _chunks(combos, max_workers * 4)
+            ]
+            try:
+                rows = [row for future in futures for row in future.result()]
+            finally:
+                for future in futures:
+                    future.cancel()
+        finally:
+            shm.close()
+            shm.unlink()
+
+    results = pd.DataFrame(rows)
+    if results.empty:
+        return results
+    results = results.sort_values(rank_by, ascending=False, na_position='last').reset_index(drop=True)
+    results.index = results.index + 1
+    results.index.name = 'rank'
+    return results
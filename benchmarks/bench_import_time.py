@@ -0,0 +1,86 @@
+"""Import-time benchmark for the app's entry points: Home.py and every page.
+
+Each entry point's module-level imports are read from its source and run in
+a fresh interpreter with ``python -X importtime``. Reports the median total
+import time, the part spent beyond the streamlit/pandas/numpy/plotly baseline
+every page pays anyway, and which heavy libraries got loaded.
+
+Run from the repository root, optionally passing another checkout to measure:
+
+    python benchmarks/bench_import_time.py [repo root]
+"""
+import ast
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+RUNS = 7
+
+BASELINE = "import streamlit, pandas, numpy, plotly.graph_objects"
+
+HEAVY_LIBRARIES = ["yfinance", "sklearn", "scipy", "joblib", "prophet", "ta"]
+
+
+def entry_points(root):
+    """Home.py and the pages, in the order Streamlit lists them"""
+    pages = [path for path in sorted((root / "pages").glob("*.py")) if not path.name.startswith("_")]
+    return [root / "Home.py"] + pages
+
+
+def module_imports(path):
+    """The import statements a script runs when Streamlit executes it"""
+    tree = ast.parse(path.read_text(encoding="utf-8"))
+    imports = [node for node in tree.body if isinstance(node, (ast.Import, ast.ImportFrom))]
+    return "\n".join(ast.unparse(node) for node in imports)
+
+
+def import_profile(root, statements):
+    """Run import statements with -X importtime, returning (total us, loaded modules) or None"""
+    code = f"import sys\nsys.path.insert(0, {str(root)!r})\n{BASELINE}\n{statements}"
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=root, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        return None
+
+    total = 0
+    loaded = set()
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = (part.strip() for part in line[len("import time:"):].split("|"))
+        loaded.add(name.split(".")[0])
+        # Top-level imports are not indented; their cumulative times add up to the total
+        if not line.split("|")[2].startswith("  "):
+            total += int(cumulative)
+    return total, loaded
+
+
+def median_profile(root, statements):
+    profiles = [import_profile(root, statements) for _ in range(RUNS)]
+    if any(profile is None for profile in profiles):
+        return None
+    return statistics.median(total for total, _ in profiles) / 1000, profiles[0][1]
+
+
+def main():
+    root = Path(sys.argv[1] if len(sys.argv) > 1 else Path(__file__).parent.parent).resolve()
+    baseline_ms, _ = median_profile(root, "pass")
+    print(f"Baseline ({BASELINE}): {baseline_ms:.0f} ms\n")
+    print("| entry point | total ms | app ms | heavy libraries loaded |")
+    print("|---|---:|---:|---|")
+    for path in entry_points(root):
+        name = path.relative_to(root).as_posix()
+        profile = median_profile(root, module_imports(path))
+        if profile is None:
+            print(f"| {name} | import fails | | |")
+            continue
+        total_ms, loaded = profile
+        heavy = ", ".join(library for library in HEAVY_LIBRARIES if library in loaded) or "none"
+        print(f"| {name} | {total_ms:.0f} | {total_ms - baseline_ms:.0f} | {heavy} |")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""Allocation benchmark for DataLoader.get_technical_indicators.
+
+Compares the current columnar pipeline with the previous implementation
+(full copy, then three whole-frame fillna passes), reporting the peak memory
+traced by tracemalloc and the median wall time per call.
+
+Run from the repository root:
+
+    python benchmarks/bench_technical_indicators.py
+"""
+import sys
+import time
+import tracemalloc
+import warnings
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(str(Path(__file__).parent.parent))
+from backend.data_loader import DataLoader
+from backend.data_store import compact_ohlcv
+from backend.indicator_engine import TECHNICAL_INDICATORS, compute_indicators
+
+SIZES = [252, 2520, 25200]
+REPEATS = 20
+
+
+def legacy_technical_indicators(data):
+    """The implementation before the columnar rework, for comparison"""
+    df = data.copy()
+    indicators = compute_indicators(df, TECHNICAL_INDICATORS)
+    df[indicators.columns] = indicators
+    df = df.fillna(method='ffill')
+    df = df.fillna(method='bfill')
+    return df.fillna(0)
+
+
+def make_bars(rows):
+    """Synthetic daily bars shaped like get_market_data output"""
+    rng = np.random.default_rng(0)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, rows)))
+    return pd.DataFrame({
+        'Open': close,
+        'High': close * 1.01,
+        'Low': close * 0.99,
+        'Close': close,
+        'Volume': rng.integers(10 ** 6, 10 ** 8, rows),
+    }, index=pd.date_range('1990-01-01', periods=rows, freq='D', tz='America/New_York'))
+
+
+def peak_bytes(func, data):
+    """Peak memory allocated while running func(data)"""
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    func(data)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def median_seconds(func, data):
+    timings = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        func(data)
+        timings.append(time.perf_counter() - start)
+    return float(np.median(timings))
+
+
+def main():
+    warnings.simplefilter('ignore', FutureWarning)
+    implementations = [
+        ('legacy', legacy_technical_indicators),
+        ('columnar', DataLoader.get_technical_indicators),
+    ]
+
+    print("| rows | input | implementation | peak KiB | ms/call |")
+    print("|---:|---|---|---:|---:|")
+    for rows in SIZES:
+        for label, data in [('float64', make_bars(rows)), ('compact', compact_ohlcv(make_bars(rows)))]:
+            for name, func in implementations:
+                func(data)  # warm up caches and lazy imports
+                print(f"| {rows} | {label} | {name} | {peak_bytes(func, data) / 1024:,.0f} "
+                      f"| {median_seconds(func, data) * 1000:.2f} |")
+
+
+if __name__ == "__main__":
+    main()
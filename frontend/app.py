@@ -8,7 +8,8 @@ from backend.indicators import (
     calculate_sma, calculate_ema, calculate_bollinger_bands,
     calculate_vwap, calculate_rsi, calculate_macd
 )
-from backend.ai_model import prepare_data_for_prophet, train_prophet_model, make_predictions
+from backend.ai_model import prepare_data_for_prophet
+from backend.forecast_pool import get_forecast_pool
 from backend.utils import validate_dates, validate_ticker, SUGGESTED_TICKERS
 
 # Import frontend modules
@@ -147,8 +148,12 @@ def main():
             Progress.fail_step("indicators", str(e))
             show_error(f"Error calculating indicators: {str(e)}")
         
-        # Render chart
-        fig = render_candlestick_chart(data, indicator_data)
+        # Render chart, zoomed to the selected dates (full detail once few enough bars are visible)
+        first_day, last_day = data.index[0].date(), data.index[-1].date()
+        visible_start, visible_end = st.slider(
+            "Visible Range:", min_value=first_day, max_value=last_day, value=(first_day, last_day)
+        ) if first_day < last_day else (first_day, last_day)
+        fig = render_candlestick_chart(data, indicator_data, x_range=(str(visible_start), str(visible_end)))
         st.plotly_chart(fig)
         
         # AI Analysis section
@@ -159,33 +164,42 @@ def main():
                 "ai_analysis",
                 f"Running AI analysis for {ticker}"
             )
-            TaskManager.start_task(task_id)
-            
+            st.session_state["analysis_task"] = task_id
+            try:
+                # Prepare data and forecast in a worker process
+                prophet_data = prepare_data_for_prophet(data)
+                TaskManager.track_future(task_id, get_forecast_pool().submit_prophet(prophet_data, ticker))
+            except Exception as e:
+                TaskManager.fail_task(task_id, str(e))
+        
+        task_id = st.session_state.get("analysis_task")
+        if TaskManager.is_active(task_id):
+            # Check on the job briefly, then rerun instead of holding the script until it is done
             with show_loading("Analyzing the chart, please wait..."):
-                try:
-                    # Prepare and analyze data
-                    prophet_data = prepare_data_for_prophet(data)
-                    model = train_prophet_model(prophet_data)
-                    forecast, analysis = make_predictions(model)
-                    
-                    # Display results
-                    st.write("**Forecast:**")
-                    st.write(forecast[['ds', 'yhat', 'yhat_lower', 'yhat_upper']].tail(30))
-                    
-                    # Plot forecast
-                    fig_forecast = model.plot(forecast)
-                    st.plotly_chart(fig_forecast)
-                    
-                    # Display analysis
-                    display_forecast_analysis(analysis)
-                    
-                    TaskManager.complete_task(task_id, analysis)
-                    Progress.complete_step("ai_analysis")
-                    SessionState.set_state("analysis_complete", True)
-                except Exception as e:
-                    TaskManager.fail_task(task_id, str(e))
-                    Progress.fail_step("ai_analysis", str(e))
-                    show_error(f"Error in AI analysis: {str(e)}")
+                TaskManager.poll()
+            if TaskManager.is_active(task_id):
+                st.rerun()
+        
+        task = TaskManager.get_task(task_id) if task_id else None
+        if task is not None and task.status == TaskStatus.FAILED:
+            Progress.fail_step("ai_analysis", task.error)
+            show_error(f"Error in AI analysis: {task.error}")
+        elif task is not None and task.status == TaskStatus.COMPLETED:
+            model, forecast, analysis = task.result
+            
+            # Display results
+            st.write("**Forecast:**")
+            st.write(forecast[['ds', 'yhat', 'yhat_lower', 'yhat_upper']].tail(30))
+            
+            # Plot forecast
+            fig_forecast = model.plot(forecast)
+            st.plotly_chart(fig_forecast)
+            
+            # Display analysis
+            display_forecast_analysis(analysis)
+            
+            Progress.complete_step("ai_analysis")
+            SessionState.set_state("analysis_complete", True)
         
         # Display progress
         progress = Progress.get_progress()
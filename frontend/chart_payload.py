@@ -0,0 +1,51 @@
+import numpy as np
+import pandas as pd
+
+# Significant digits kept for values sent as JSON; far beyond what a chart can show
+JSON_SIGNIFICANT_DIGITS = 7
+
+def chart_x(index: pd.Index) -> np.ndarray:
+    """x values for a trace: dates become milliseconds since the epoch
+
+    Plotly serializes timestamps one by one as ISO strings, which dominates
+    encoding time; numbers on a date axis (xaxis_type="date") are read as
+    milliseconds. plotly.js ignores time zones, so the wall-clock time of a
+    zoned index is kept. Milliseconds go out as float64; they are exact in a
+    double.
+    """
+    if isinstance(index, pd.DatetimeIndex):
+        if index.tz is not None:
+            index = index.tz_localize(None)
+        return (index.asi8 // 10 ** 6).astype(np.float64)
+    return np.asarray(index)
+
+def chart_y(values) -> np.ndarray:
+    """y, open, high, low or close values for a trace, rounded to JSON_SIGNIFICANT_DIGITS
+
+    Short numbers instead of float32 noise such as 101.23999786376953, while
+    prices of a fraction of a cent keep their digits.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        magnitude = np.floor(np.log10(np.abs(values)))
+    # Zeros, NaNs and infinities are left as they are
+    scale = 10.0 ** np.where(np.isfinite(magnitude), JSON_SIGNIFICANT_DIGITS - 1 - magnitude, 0.0)
+    return np.round(values * scale) / scale
+
+class SharedX:
+    """chart_x for the traces of one figure, converting each distinct index once
+
+    Traces on the same bars (the candlestick and overlays that were not
+    downsampled) all get the same x array.
+    """
+
+    def __init__(self):
+        self._arrays = []
+
+    def __call__(self, index: pd.Index) -> np.ndarray:
+        for known, values in self._arrays:
+            if index is known or index.equals(known):
+                return values
+        values = chart_x(index)
+        self._arrays.append((index, values))
+        return values
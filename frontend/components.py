@@ -1,16 +1,29 @@
 import streamlit as st
 import plotly.graph_objects as go
-from typing import List, Dict
+from typing import List, Dict, Optional, Tuple
 import pandas as pd
 
-def render_candlestick_chart(data: pd.DataFrame, indicators: Dict[str, pd.Series] = None) -> go.Figure:
-    """Render candlestick chart with optional indicators"""
+from frontend.chart_payload import SharedX, chart_y
+from frontend.downsample import (
+    CANDLE_WIDTH_PX, CHART_WIDTH_PX, downsample_series, ohlc_buckets, visible_window
+)
+
+def render_candlestick_chart(data: pd.DataFrame, indicators: Dict[str, pd.Series] = None,
+                             x_range: Optional[Tuple] = None, width_px: int = CHART_WIDTH_PX) -> go.Figure:
+    """Render candlestick chart with optional indicators
+
+    Bars and indicator lines are downsampled to what a chart width_px wide
+    can show; pass x_range (start, end) to zoom, which shows every bar once
+    the window is narrow enough.
+    """
+    candles = ohlc_buckets(visible_window(data, x_range), width_px // CANDLE_WIDTH_PX)
+    x = SharedX()
     fig = go.Figure(data=[go.Candlestick(
-        x=data.index,
-        open=data['Open'],
-        high=data['High'],
-        low=data['Low'],
-        close=data['Close'],
+        x=x(candles.index),
+        open=chart_y(candles['Open']),
+        high=chart_y(candles['High']),
+        low=chart_y(candles['Low']),
+        close=chart_y(candles['Close']),
         name="Candlestick"
     )])
     
@@ -19,21 +32,24 @@ def render_candlestick_chart(data: pd.DataFrame, indicators: Dict[str, pd.Series
             if isinstance(series, tuple):
                 # For indicators that return multiple lines (e.g., Bollinger Bands)
                 for i, line in enumerate(series):
+                    line = downsample_series(visible_window(line, x_range), width_px)
                     fig.add_trace(go.Scatter(
-                        x=data.index,
-                        y=line,
+                        x=x(line.index),
+                        y=chart_y(line),
                         mode='lines',
                         name=f'{name} {i+1}'
                     ))
             else:
+                series = downsample_series(visible_window(series, x_range), width_px)
                 fig.add_trace(go.Scatter(
-                    x=data.index,
-                    y=series,
+                    x=x(series.index),
+                    y=chart_y(series),
                     mode='lines',
                     name=name
                 ))
     
-    fig.update_layout(xaxis_rangeslider_visible=False)
+    # x values are epoch milliseconds, so the axis has to be told they are dates
+    fig.update_layout(xaxis_rangeslider_visible=False, xaxis_type="date")
     return fig
 
 def display_forecast_analysis(analysis: Dict) -> None:
@@ -0,0 +1,97 @@
+import numpy as np
+import pandas as pd
+from typing import Optional, Tuple
+
+from frontend.chart_payload import chart_x, chart_y
+
+# Plot width the point budgets are sized for; a line needs about one point per pixel
+CHART_WIDTH_PX = 1200
+# Pixels a candle needs to stay readable
+CANDLE_WIDTH_PX = 3
+
+def _positions(index: pd.Index) -> np.ndarray:
+    """Numeric x positions of an index (nanoseconds for dates)"""
+    if isinstance(index, pd.DatetimeIndex):
+        values = index.asi8
+        return (values - values[0]).astype(np.float64) if len(values) else values.astype(np.float64)
+    return np.asarray(index, dtype=np.float64)
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """Positions of the points Largest-Triangle-Three-Buckets keeps out of x, y
+
+    The first and last points are always kept; every bucket in between keeps
+    the point forming the largest triangle with the previously kept point and
+    the average of the next bucket, which preserves peaks and troughs.
+    """
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    kept = np.empty(n_out, dtype=np.int64)
+    kept[0], kept[-1] = 0, n - 1
+    previous = 0
+    for bucket in range(n_out - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        next_end = edges[bucket + 2] if bucket + 2 < len(edges) else n
+        avg_x = x[end:next_end].mean()
+        avg_y = y[end:next_end].mean()
+        area = np.abs(
+            (x[previous] - avg_x) * (y[start:end] - y[previous])
+            - (x[previous] - x[start:end]) * (avg_y - y[previous])
+        )
+        previous = start + int(np.argmax(area))
+        kept[bucket + 1] = previous
+    return kept
+
+def downsample_series(series: pd.Series, max_points: int = CHART_WIDTH_PX) -> pd.Series:
+    """Reduce a line trace to at most max_points with LTTB, dropping missing values
+
+    Short series come back unchanged, gaps included, so they stay on the same
+    bars as the other traces.
+    """
+    if len(series) <= max_points:
+        return series
+    series = series[np.isfinite(series.to_numpy(dtype=np.float64, na_value=np.nan))]
+    if len(series) <= max_points:
+        return series
+    kept = lttb_indices(_positions(series.index), series.to_numpy(dtype=np.float64), max_points)
+    return series.iloc[kept]
+
+def line_xy(series: pd.Series, max_points: int = CHART_WIDTH_PX) -> dict:
+    """x and y arguments for a Scatter trace of a downsampled series (for a figure with xaxis_type="date")"""
+    series = downsample_series(series, max_points)
+    return {'x': chart_x(series.index), 'y': chart_y(series)}
+
+def ohlc_buckets(data: pd.DataFrame, max_bars: int = CHART_WIDTH_PX // CANDLE_WIDTH_PX) -> pd.DataFrame:
+    """Merge consecutive bars into at most max_bars candles
+
+    Each candle opens at its first bar, closes at its last, spans the highest
+    high and lowest low, and sums the volume, so no price extreme is lost.
+    """
+    if len(data) <= max_bars:
+        return data
+    starts = np.unique(np.linspace(0, len(data), max_bars, endpoint=False).astype(np.int64))
+    ends = np.append(starts[1:], len(data)) - 1
+    buckets = {
+        'Open': data['Open'].to_numpy()[starts],
+        'High': np.maximum.reduceat(data['High'].to_numpy(), starts),
+        'Low': np.minimum.reduceat(data['Low'].to_numpy(), starts),
+        'Close': data['Close'].to_numpy()[ends]
+    }
+    if 'Volume' in data.columns:
+        volume = data['Volume'].to_numpy()
+        # Summed in 64 bits, so a narrow integer volume cannot overflow
+        volume = volume.astype(np.int64 if volume.dtype.kind in 'biu' else np.float64, copy=False)
+        buckets['Volume'] = np.add.reduceat(volume, starts)
+    return pd.DataFrame(buckets, index=data.index[starts])
+
+def visible_window(data, x_range: Optional[Tuple] = None):
+    """Slice a frame or series to the zoomed x range, so it is downsampled at full detail
+
+    Dates may be strings such as '2024-01-31', which also work on a zoned index.
+    """
+    if x_range is None:
+        return data
+    start, end = x_range
+    return data.loc[start:end]
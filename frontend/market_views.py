@@ -0,0 +1,93 @@
+import plotly.graph_objects as go
+import pandas as pd
+from typing import Callable, Optional, Tuple
+
+from backend.data_store import compact_ohlcv, expand_ohlcv
+from backend.resources import get_data_loader
+from backend.shared_cache import make_cache_key, shared_cache
+from frontend.chart_payload import chart_x, chart_y
+from frontend.downsample import ohlc_buckets, visible_window
+
+# Seconds a symbol's bars, indicators and charts are reused before fetching again
+MARKET_VIEW_TTL = 300
+
+class MarketDataUnavailable(Exception):
+    """Raised inside cached loaders so a failed fetch is not cached"""
+
+def _cache_key(symbol: str) -> str:
+    return symbol.strip().upper()
+
+def _shared(compute: Callable, symbol: str, timeframe: str):
+    """Get compute(symbol, timeframe) from the shared cache, computing it once across sessions"""
+    key = make_cache_key(compute, (symbol, timeframe), {})
+    return shared_cache.get_or_compute(key, lambda: compute(symbol, timeframe), MARKET_VIEW_TTL)
+
+# Cached frames are compact (see compact_ohlcv); sessions get them back at full precision
+
+def _market_data(symbol: str, timeframe: str) -> pd.DataFrame:
+    # No demo bars: a failed fetch must not be cached as the symbol's prices
+    data = get_data_loader().get_market_data(symbol, timeframe, demo_fallback=False)
+    if data is None:
+        raise MarketDataUnavailable(symbol)
+    return compact_ohlcv(data)
+
+def _indicator_data(symbol: str, timeframe: str) -> pd.DataFrame:
+    bars = expand_ohlcv(_shared(_market_data, symbol, timeframe))
+    data = get_data_loader().get_technical_indicators(bars)
+    if data is None:
+        raise MarketDataUnavailable(symbol)
+    return compact_ohlcv(data)
+
+def _candlestick_figure(symbol: str, bars: pd.DataFrame) -> go.Figure:
+    # Merged into as many candles as the chart can show
+    data = ohlc_buckets(bars)
+    fig = go.Figure(data=[go.Candlestick(
+        x=chart_x(data.index),
+        open=chart_y(data['Open']),
+        high=chart_y(data['High']),
+        low=chart_y(data['Low']),
+        close=chart_y(data['Close'])
+    )])
+    fig.update_layout(
+        template="plotly_dark",
+        plot_bgcolor="#222831",
+        paper_bgcolor="#222831",
+        title=f"{symbol} Price Action",
+        xaxis_title="Date",
+        xaxis_type="date",
+        yaxis_title="Price ($)",
+        showlegend=True
+    )
+    return fig
+
+def _price_action_figure(symbol: str, timeframe: str) -> go.Figure:
+    return _candlestick_figure(symbol, _shared(_market_data, symbol, timeframe))
+
+def load_market_data(symbol: str, timeframe: str) -> Optional[pd.DataFrame]:
+    """Get a symbol's bars for a timeframe, shared by every page and session, or None"""
+    try:
+        return expand_ohlcv(_shared(_market_data, _cache_key(symbol), timeframe))
+    except MarketDataUnavailable:
+        return None
+
+def load_indicator_data(symbol: str, timeframe: str) -> Optional[pd.DataFrame]:
+    """Get a symbol's bars with technical indicators, or None"""
+    try:
+        return expand_ohlcv(_shared(_indicator_data, _cache_key(symbol), timeframe))
+    except MarketDataUnavailable:
+        return None
+
+def price_action_figure(symbol: str, timeframe: str, x_range: Optional[Tuple] = None) -> Optional[go.Figure]:
+    """Get the candlestick chart of a symbol's bars, or None
+
+    Pass x_range (start, end) to zoom: the chart then covers only those dates,
+    showing every bar once the window is narrow enough. Zoomed charts are
+    built from the cached bars but not cached themselves.
+    """
+    symbol = _cache_key(symbol)
+    try:
+        if x_range is None:
+            return _shared(_price_action_figure, symbol, timeframe)
+        return _candlestick_figure(symbol, visible_window(_shared(_market_data, symbol, timeframe), x_range))
+    except MarketDataUnavailable:
+        return None
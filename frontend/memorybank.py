@@ -0,0 +1,17 @@
+import importlib.util
+import sys
+from pathlib import Path
+from types import ModuleType
+
+MEMORYBANK_DIR = Path(__file__).parent.parent / "memorybank.mdc"
+
+
+def load_memorybank(module: str) -> ModuleType:
+    """Load memorybank.mdc/<module>.py once per process (the folder name is not importable)"""
+    name = f"memorybank.mdc.{module}"
+    if name not in sys.modules:
+        spec = importlib.util.spec_from_file_location(name, MEMORYBANK_DIR / f"{module}.py")
+        loaded = importlib.util.module_from_spec(spec)
+        sys.modules[name] = loaded
+        spec.loader.exec_module(loaded)
+    return sys.modules[name]
@@ -2,7 +2,15 @@ import streamlit as st
 import yfinance as yf
 import pandas as pd
 import plotly.graph_objects as go
-from prophet import Prophet
+
+from backend.ai_model import prepare_data_for_prophet
+from backend.data_loader import flatten_columns
+from backend.forecast_pool import get_forecast_pool
+from frontend.components import display_forecast_analysis
+from frontend.memorybank import load_memorybank
+
+tasks = load_memorybank("tasks")
+TaskManager, TaskStatus = tasks.TaskManager, tasks.TaskStatus
 
 # Set up Streamlit app
 st.set_page_config(layout="wide")
@@ -46,7 +54,9 @@ end_date = st.sidebar.date_input("End Date", value=pd.to_datetime("2024-12-14"))
 
 # Fetch stock data
 if st.sidebar.button("Fetch Data"):
-    st.session_state["stock_data"] = yf.download(ticker, start=start_date, end=end_date)
+    # yf.download adds a ticker level to the columns even for one symbol
+    st.session_state["stock_data"] = flatten_columns(yf.download(ticker, start=start_date, end=end_date))
+    st.session_state.pop("analysis_task", None)
     st.success("Stock data loaded successfully!")
 
 # Check if data is available
@@ -120,47 +130,33 @@ if "stock_data" in st.session_state:
     # Analyze chart with Prophet
     st.subheader("AI-Powered Analysis")
     if st.button("Run AI Analysis"):
+        # Fit Prophet in a forecast worker, or forecast from the cached fit of the same bars
+        task_id = TaskManager.create_task("ai_analysis", f"Running AI analysis for {ticker}")
+        future = get_forecast_pool().submit_prophet(prepare_data_for_prophet(data), ticker, periods=30)
+        TaskManager.track_future(task_id, future)
+        st.session_state["analysis_task"] = task_id
+
+    task_id = st.session_state.get("analysis_task")
+    if TaskManager.is_active(task_id):
+        # Check on the job briefly, then rerun instead of holding the script until it is done
         with st.spinner("Analyzing the chart, please wait..."):
-            # Prepare data for Prophet
-            df = pd.DataFrame({'ds': data.index, 'y': data['Close']})
-
-            # Create and fit Prophet model
-            model = Prophet()
-            model.fit(df)
-
-            # Make future predictions (e.g., for the next 30 days)
-            future = model.make_future_dataframe(periods=30)
-            forecast = model.predict(future)
-
-            # Display the forecast
-            st.write("**Forecast:**")
-            st.write(forecast[['ds', 'yhat', 'yhat_lower', 'yhat_upper']].tail(30))
-
-            # Plot the forecast
-            fig_forecast = model.plot(forecast)
-            st.plotly_chart(fig_forecast)
-
-            # --- Automated Descriptive Analysis ---
-            st.write("**Analysis:**")
-
-            # 1. Trend Analysis
-            trend_slope = (forecast['yhat'].iloc[-1] - forecast['yhat'].iloc[0]) / len(forecast)
-            if trend_slope > 0.1:
-                st.write("The AI predicts a strong upward trend in the stock price.")
-            elif trend_slope < -0.1:
-                st.write("The AI predicts a strong downward trend in the stock price.")
-            else:
-                st.write("The AI predicts a relatively stable trend in the stock price.")
-
-            # 2. Seasonality Analysis (Example with Weekly Seasonality)
-            if 'weekly' in forecast.columns and forecast['weekly'].mean() > 0.2:
-                st.write("There is a significant positive weekly seasonality.")
-
-            # 3. Volatility Analysis (using yhat_lower and yhat_upper)
-            uncertainty = forecast['yhat_upper'].mean() - forecast['yhat_lower'].mean()
-            if uncertainty > 0.5:
-                st.write("The forecast has a high degree of uncertainty.")
-            elif uncertainty < 0.2:
-                st.write("The forecast has a low degree of uncertainty.")
-            else:
-                st.write("The forecast has a moderate degree of uncertainty.")
+            TaskManager.poll()
+        if TaskManager.is_active(task_id):
+            st.rerun()
+
+    task = TaskManager.get_task(task_id) if task_id else None
+    if task is not None and task.status == TaskStatus.FAILED:
+        st.error(f"Error in AI analysis: {task.error}")
+    elif task is not None and task.status == TaskStatus.COMPLETED:
+        model, forecast, analysis = task.result
+
+        # Display the forecast
+        st.write("**Forecast:**")
+        st.write(forecast[['ds', 'yhat', 'yhat_lower', 'yhat_upper']].tail(30))
+
+        # Plot the forecast
+        fig_forecast = model.plot(forecast)
+        st.plotly_chart(fig_forecast)
+
+        # --- Automated Descriptive Analysis ---
+        display_forecast_analysis(analysis)
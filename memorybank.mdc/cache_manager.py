@@ -1,8 +1,11 @@
 import streamlit as st
-from typing import Any, Callable
+from typing import Callable
 from functools import wraps
-import pandas as pd
-from datetime import datetime, timedelta
+
+# The cache itself lives in the backend, so backend and frontend modules can import it
+from backend.shared_cache import (
+    DEFAULT_MAX_BYTES, EVICTION_HISTORY, SharedCache, estimate_size, make_cache_key, private_copy, shared_cache
+)
 
 class CacheManager:
     """Manages caching for data and computations"""
@@ -13,23 +16,13 @@ class CacheManager:
         def decorator(func: Callable) -> Callable:
             @wraps(func)
             def wrapper(*args, **kwargs):
-                # Create a cache key based on function name and arguments
-                cache_key = f"cache_{func.__name__}_{str(args)}_{str(kwargs)}"
-                
-                # Check if data exists in cache and is still valid
-                if cache_key in st.session_state:
-                    cached_data = st.session_state[cache_key]
-                    cached_time = cached_data.get('timestamp')
-                    if cached_time and (datetime.now() - cached_time).seconds < ttl_seconds:
-                        return cached_data.get('data')
+                # Create a cache key based on function name and hashed arguments
+                cache_key = make_cache_key(func, args, kwargs)
                 
-                # If not in cache or expired, compute and cache the result
-                result = func(*args, **kwargs)
-                st.session_state[cache_key] = {
-                    'data': result,
-                    'timestamp': datetime.now()
-                }
-                return result
+                # Compute once and share the result with every session
+                return shared_cache.get_or_compute(
+                    cache_key, lambda: func(*args, **kwargs), ttl_seconds
+                )
             return wrapper
         return decorator
     
@@ -37,24 +30,36 @@ class CacheManager:
     def clear_cache(pattern: str = None) -> None:
         """Clear cached data, optionally filtered by pattern"""
         keys_to_delete = []
-        for key in st.session_state.keys():
+        for key in shared_cache.keys():
             if key.startswith('cache_'):
                 if pattern is None or pattern in key:
                     keys_to_delete.append(key)
         
         for key in keys_to_delete:
-            del st.session_state[key]
+            shared_cache.delete(key)
     
     @staticmethod
     def get_cache_info() -> dict:
         """Get information about cached items"""
         cache_info = {}
-        for key in st.session_state.keys():
+        for key, cache_data in shared_cache.items():
             if key.startswith('cache_'):
-                cache_data = st.session_state[key]
                 if isinstance(cache_data, dict) and 'timestamp' in cache_data:
                     cache_info[key] = {
                         'timestamp': cache_data['timestamp'],
-                        'age_seconds': (datetime.now() - cache_data['timestamp']).seconds
+                        'age_seconds': shared_cache.age_seconds(cache_data),
+                        'bytes': cache_data['bytes'],
+                        'hits': cache_data['hits'],
+                        'last_access': cache_data['last_access']
                     }
-        return cache_info 
\ No newline at end of file
+        return cache_info
+    
+    @staticmethod
+    def get_eviction_history() -> list:
+        """Get recently evicted, expired and cleared entries"""
+        return shared_cache.eviction_history()
+    
+    @staticmethod
+    def get_cache_stats() -> dict:
+        """Get cache hit, miss and eviction counters"""
+        return shared_cache.stats()
@@ -1,5 +1,6 @@
 import streamlit as st
 from typing import List, Dict, Optional, Callable
+from concurrent.futures import FIRST_COMPLETED, Future, wait
 from datetime import datetime
 from enum import Enum, auto
 from dataclasses import dataclass
@@ -31,6 +32,7 @@ class TaskManager:
     """Manages analysis tasks"""
     
     TASKS_KEY = "analysis_tasks"
+    FUTURES_KEY = "analysis_task_futures"
     
     @classmethod
     def init_tasks(cls) -> None:
@@ -83,10 +85,72 @@ class TaskManager:
             task.completed_at = datetime.now()
             task.error = error
     
+    @classmethod
+    def track_future(cls, task_id: str, future: Future) -> None:
+        """Follow a background job's future; call refresh() to sync the task status"""
+        cls.init_tasks()
+        if cls.FUTURES_KEY not in st.session_state:
+            st.session_state[cls.FUTURES_KEY] = {}
+        st.session_state[cls.FUTURES_KEY][task_id] = future
+        cls.refresh()
+    
+    @classmethod
+    def refresh(cls) -> List[str]:
+        """Update tracked tasks from their futures, returning the ids that finished.
+
+        Futures complete on worker threads, so statuses are only written here,
+        on the script thread.
+        """
+        cls.init_tasks()
+        futures = st.session_state.get(cls.FUTURES_KEY, {})
+        finished = []
+        for task_id, future in list(futures.items()):
+            task = st.session_state[cls.TASKS_KEY].get(task_id)
+            if task is None:
+                futures.pop(task_id, None)
+                continue
+            if not future.done():
+                if future.running() and task.status == TaskStatus.PENDING:
+                    cls.start_task(task_id)
+                continue
+            
+            if task.status == TaskStatus.PENDING:
+                cls.start_task(task_id)
+            if future.cancelled():
+                cls.cancel_task(task_id)
+            elif future.exception() is not None:
+                cls.fail_task(task_id, str(future.exception()))
+            else:
+                cls.complete_task(task_id, future.result())
+            futures.pop(task_id, None)
+            finished.append(task_id)
+        return finished
+    
+    @classmethod
+    def poll(cls, timeout: float = 0.5) -> List[str]:
+        """Wait up to timeout for a tracked future to finish, then refresh().
+        
+        Scripts call this on each run while a task is active and st.rerun()
+        if it is still active, so no run blocks on a job for long.
+        """
+        futures = list(st.session_state.get(cls.FUTURES_KEY, {}).values())
+        if futures:
+            wait(futures, timeout, return_when=FIRST_COMPLETED)
+        return cls.refresh()
+    
+    @classmethod
+    def is_active(cls, task_id: Optional[str]) -> bool:
+        """Check whether a task is still pending or running"""
+        task = cls.get_task(task_id) if task_id else None
+        return task is not None and task.status in (TaskStatus.PENDING, TaskStatus.RUNNING)
+    
     @classmethod
     def cancel_task(cls, task_id: str) -> None:
         """Cancel a task"""
         cls.init_tasks()
+        future = st.session_state.get(cls.FUTURES_KEY, {}).pop(task_id, None)
+        if future is not None:
+            future.cancel()
         if task_id in st.session_state[cls.TASKS_KEY]:
             task = st.session_state[cls.TASKS_KEY][task_id]
             task.status = TaskStatus.CANCELLED
@@ -6,8 +6,13 @@ import sys
 
 # Add backend to path
 sys.path.append(str(Path(__file__).parent.parent))
-from backend.ml_predictor import MLPredictor
-from backend.data_loader import DataLoader
+from frontend.downsample import line_xy
+from backend.forecast_pool import get_forecast_pool
+from frontend.market_views import load_market_data
+from frontend.memorybank import load_memorybank
+
+tasks = load_memorybank("tasks")
+TaskManager, TaskStatus = tasks.TaskManager, tasks.TaskStatus
 
 # Page configuration
 st.set_page_config(
@@ -30,12 +35,6 @@ st.markdown("""
     </style>
     """, unsafe_allow_html=True)
 
-# Initialize session state
-if 'ml_predictor' not in st.session_state:
-    st.session_state.ml_predictor = MLPredictor()
-if 'data_loader' not in st.session_state:
-    st.session_state.data_loader = DataLoader()
-
 st.title("ML Predictions")
 st.subheader("AI-Powered Market Analysis")
 
@@ -47,68 +46,89 @@ with col2:
     prediction_days = st.slider("Prediction Days", 1, 30, 7, key="prediction_days_slider")
 
 if st.button("Generate Prediction", key="generate_pred_btn"):
+    data = load_market_data(symbol, "1y")
+    if data is not None:
+        # Predict in a forecast worker, or with the symbol's shared predictor
+        # when another session already fitted a model on the same data
+        task_id = TaskManager.create_task("ml_prediction", f"Predicting {symbol} for {prediction_days} days")
+        future = get_forecast_pool().submit_ml(data, prediction_days, symbol, 'direct')
+        TaskManager.track_future(task_id, future)
+        st.session_state["ml_prediction"] = {"task_id": task_id, "symbol": symbol}
+
+requested = st.session_state.get("ml_prediction", {})
+task_id = requested.get("task_id")
+if TaskManager.is_active(task_id):
+    # Check on the job briefly, then rerun instead of holding the script until it is done
     with st.spinner("Analyzing market data..."):
-        # Get historical data
-        data = st.session_state.data_loader.get_market_data(symbol, "1y")
-        if data is not None:
-            # Generate prediction
-            prediction = st.session_state.ml_predictor.predict(data, prediction_days)
-            
-            # Display prediction chart
-            fig = go.Figure()
-            
-            # Historical data
-            fig.add_trace(go.Scatter(
-                x=data.index,
-                y=data['Close'],
-                name="Historical",
-                line=dict(color="#00ADB5")
-            ))
-            
-            # Prediction
-            fig.add_trace(go.Scatter(
-                x=prediction.index,
-                y=prediction['Predicted'],
-                name="Prediction",
-                line=dict(color="#FF5722", dash='dash')
-            ))
-            
-            fig.update_layout(
-                template="plotly_dark",
-                plot_bgcolor="#222831",
-                paper_bgcolor="#222831",
-                title=f"{symbol} Price Prediction",
-                xaxis_title="Date",
-                yaxis_title="Price ($)"
+        TaskManager.poll()
+    if TaskManager.is_active(task_id):
+        st.rerun()
+
+task = TaskManager.get_task(task_id) if task_id else None
+if task is not None and task.status == TaskStatus.FAILED:
+    st.error(f"Could not generate a prediction for {requested['symbol']}: {task.error}")
+elif task is not None and task.status == TaskStatus.COMPLETED:
+    predicted_symbol = requested["symbol"]
+    prediction, confidence = task.result
+    data = load_market_data(predicted_symbol, "1y")
+    
+    if prediction is None or data is None:
+        st.error(f"Could not generate a prediction for {predicted_symbol}.")
+    else:
+        # Display prediction chart
+        fig = go.Figure()
+    
+        # Historical data
+        fig.add_trace(go.Scatter(
+            **line_xy(data['Close']),
+            name="Historical",
+            line=dict(color="#00ADB5")
+        ))
+    
+        # Prediction
+        fig.add_trace(go.Scatter(
+            x=prediction.index,
+            y=prediction['Predicted'],
+            name="Prediction",
+            line=dict(color="#FF5722", dash='dash')
+        ))
+    
+        fig.update_layout(
+            template="plotly_dark",
+            plot_bgcolor="#222831",
+            paper_bgcolor="#222831",
+            title=f"{predicted_symbol} Price Prediction",
+            xaxis_title="Date",
+            xaxis_type="date",
+            yaxis_title="Price ($)"
+        )
+    
+        st.plotly_chart(fig, use_container_width=True)
+    
+        # Display metrics
+        col1, col2 = st.columns(2)
+        with col1:
+            st.metric(
+                "Current Price",
+                f"${data['Close'].iloc[-1]:.2f}"
+            )
+        with col2:
+            st.metric(
+                "Predicted Price (End of Period)",
+                f"${prediction['Predicted'].iloc[-1]:.2f}",
+                f"{((prediction['Predicted'].iloc[-1] / data['Close'].iloc[-1]) - 1):.2%}"
             )
-            
-            st.plotly_chart(fig, use_container_width=True)
-            
-            # Display metrics
-            col1, col2 = st.columns(2)
-            with col1:
-                st.metric(
-                    "Current Price",
-                    f"${data['Close'].iloc[-1]:.2f}"
-                )
-            with col2:
-                st.metric(
-                    "Predicted Price (End of Period)",
-                    f"${prediction['Predicted'].iloc[-1]:.2f}",
-                    f"{((prediction['Predicted'].iloc[-1] / data['Close'].iloc[-1]) - 1):.2%}"
-                )
-            
-            # Model insights
-            st.subheader("Model Insights")
-            st.write("""
-            The prediction is based on various factors including:
-            - Historical price patterns
-            - Volume analysis
-            - Technical indicators
-            - Market sentiment
-            """)
-            
-            # Confidence metrics
-            st.subheader("Prediction Confidence")
-            confidence = st.session_state.ml_predictor.get_confidence_metrics(data)
-            st.json(confidence) 
\ No newline at end of file
+    
+        # Model insights
+        st.subheader("Model Insights")
+        st.write("""
+        The prediction is based on various factors including:
+        - Historical price patterns
+        - Volume analysis
+        - Technical indicators
+        - Market sentiment
+        """)
+    
+        # Confidence metrics
+        st.subheader("Prediction Confidence")
+        st.json(confidence) 
@@ -6,7 +6,10 @@ import sys
 
 # Add backend to path
 sys.path.append(str(Path(__file__).parent.parent))
-from backend.data_loader import DataLoader
+from frontend.downsample import line_xy
+from frontend.market_views import load_market_data
+from backend.backtest import STRATEGIES, run_backtest
+from backend.sweep import SWEEP_GRIDS, run_sweep
 
 # Page configuration
 st.set_page_config(
@@ -29,10 +32,6 @@ st.markdown("""
     </style>
     """, unsafe_allow_html=True)
 
-# Initialize session state
-if 'data_loader' not in st.session_state:
-    st.session_state.data_loader = DataLoader()
-
 st.title("Trading Strategies")
 st.subheader("Automated Strategy Analysis")
 
@@ -42,7 +41,7 @@ with col1:
     symbol = st.text_input("Enter Symbol", "AAPL", key="strategy_symbol_input", autocomplete="off")
     strategy = st.selectbox(
         "Select Strategy",
-        ["Moving Average Crossover", "RSI Strategy", "MACD Strategy"],
+        list(STRATEGIES),
         key="strategy_select"
     )
 with col2:
@@ -55,29 +54,18 @@ with col2:
 if st.button("Run Backtest", key="run_backtest_btn"):
     with st.spinner("Running strategy backtest..."):
         # Get historical data
-        data = st.session_state.data_loader.get_market_data(symbol, timeframe)
+        data = load_market_data(symbol, timeframe)
         if data is not None:
-            # Add technical indicators
-            data = st.session_state.data_loader.get_technical_indicators(data)
-            
-            # Create strategy signals
-            if strategy == "Moving Average Crossover":
-                data['Signal'] = (data['SMA20'] > data['SMA50']).astype(int)
-            elif strategy == "RSI Strategy":
-                data['Signal'] = ((data['RSI'] < 30) | (data['RSI'] > 70)).astype(int)
-            else:  # MACD Strategy
-                data['Signal'] = (data['MACD'] > data['Signal_Line']).astype(int)
-            
-            # Calculate returns
-            data['Strategy_Returns'] = data['Signal'].shift(1) * data['Close'].pct_change()
+            # Backtest the strategy signals on the close prices
+            result = run_backtest(data['Close'].rename(symbol), STRATEGIES[strategy])
+            data['Signal'] = result.positions[symbol]
             
             # Plot strategy performance
             fig = go.Figure()
             
             # Price chart
             fig.add_trace(go.Scatter(
-                x=data.index,
-                y=data['Close'],
+                **line_xy(data['Close']),
                 name="Price",
                 line=dict(color="#00ADB5")
             ))
@@ -108,15 +96,17 @@ if st.button("Run Backtest", key="run_backtest_btn"):
                 paper_bgcolor="#222831",
                 title=f"{symbol} Strategy Performance",
                 xaxis_title="Date",
+                xaxis_type="date",
                 yaxis_title="Price ($)"
             )
             
             st.plotly_chart(fig, use_container_width=True)
             
             # Strategy metrics
-            total_return = data['Strategy_Returns'].sum()
-            sharpe_ratio = data['Strategy_Returns'].mean() / data['Strategy_Returns'].std() * (252 ** 0.5)
-            max_drawdown = (data['Close'] / data['Close'].cummax() - 1).min()
+            metrics = result.summary().loc[symbol]
+            total_return = metrics['total_return']
+            sharpe_ratio = metrics['sharpe_ratio']
+            max_drawdown = metrics['max_drawdown']
             
             col1, col2, col3 = st.columns(3)
             with col1:
@@ -126,6 +116,10 @@ if st.button("Run Backtest", key="run_backtest_btn"):
             with col3:
                 st.metric("Max Drawdown", f"{max_drawdown:.2%}")
             
+            # Trade list
+            st.subheader("Trades")
+            st.dataframe(result.trades.drop(columns='symbol'), use_container_width=True)
+            
             # Strategy description
             st.subheader("Strategy Details")
             if strategy == "Moving Average Crossover":
@@ -145,4 +139,15 @@ if st.button("Run Backtest", key="run_backtest_btn"):
                 This strategy uses the MACD indicator to identify trend changes:
                 - Buy when MACD crosses above the signal line
                 - Sell when MACD crosses below the signal line
-                """) 
\ No newline at end of file
+                """)
+
+# Parameter sweep
+st.subheader("Parameter Sweep")
+st.write("Backtest every parameter combination of the selected strategy and rank them by Sharpe ratio.")
+
+if st.button("Run Parameter Sweep", key="run_sweep_btn"):
+    with st.spinner("Sweeping strategy parameters..."):
+        data = load_market_data(symbol, timeframe)
+        if data is not None:
+            results = run_sweep(data['Close'].rename(symbol), STRATEGIES[strategy], SWEEP_GRIDS[strategy])
+            st.dataframe(results.head(20), use_container_width=True)
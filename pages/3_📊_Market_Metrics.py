@@ -6,7 +6,8 @@ import sys
 
 # Add backend to path
 sys.path.append(str(Path(__file__).parent.parent))
-from backend.data_loader import DataLoader
+from frontend.downsample import line_xy
+from frontend.market_views import load_indicator_data
 
 # Page configuration
 st.set_page_config(
@@ -29,10 +30,6 @@ st.markdown("""
     </style>
     """, unsafe_allow_html=True)
 
-# Initialize session state
-if 'data_loader' not in st.session_state:
-    st.session_state.data_loader = DataLoader()
-
 st.title("Market Metrics")
 st.subheader("Technical Analysis Dashboard")
 
@@ -49,12 +46,9 @@ with col2:
 
 if st.button("Analyze", key="analyze_metrics_btn"):
     with st.spinner("Calculating metrics..."):
-        # Get market data
-        data = st.session_state.data_loader.get_market_data(symbol, timeframe)
+        # Get market data with technical indicators, shared with the Home page
+        data = load_indicator_data(symbol, timeframe)
         if data is not None:
-            # Calculate technical indicators
-            data = st.session_state.data_loader.get_technical_indicators(data)
-            
             # Display main metrics
             col1, col2, col3, col4 = st.columns(4)
             with col1:
@@ -85,20 +79,17 @@ if st.button("Analyze", key="analyze_metrics_btn"):
             # Price and Moving Averages
             fig1 = go.Figure()
             fig1.add_trace(go.Scatter(
-                x=data.index,
-                y=data['Close'],
+                **line_xy(data['Close']),
                 name="Price",
                 line=dict(color="#00ADB5")
             ))
             fig1.add_trace(go.Scatter(
-                x=data.index,
-                y=data['SMA20'],
+                **line_xy(data['SMA20']),
                 name="SMA20",
                 line=dict(color="#FF5722", dash='dash')
             ))
             fig1.add_trace(go.Scatter(
-                x=data.index,
-                y=data['SMA50'],
+                **line_xy(data['SMA50']),
                 name="SMA50",
                 line=dict(color="#4CAF50", dash='dash')
             ))
@@ -106,6 +97,7 @@ if st.button("Analyze", key="analyze_metrics_btn"):
                 template="plotly_dark",
                 plot_bgcolor="#222831",
                 paper_bgcolor="#222831",
+                xaxis_type="date",
                 title="Price and Moving Averages"
             )
             st.plotly_chart(fig1, use_container_width=True)
@@ -113,8 +105,7 @@ if st.button("Analyze", key="analyze_metrics_btn"):
             # RSI Chart
             fig2 = go.Figure()
             fig2.add_trace(go.Scatter(
-                x=data.index,
-                y=data['RSI'],
+                **line_xy(data['RSI']),
                 name="RSI",
                 line=dict(color="#00ADB5")
             ))
@@ -124,6 +115,7 @@ if st.button("Analyze", key="analyze_metrics_btn"):
                 template="plotly_dark",
                 plot_bgcolor="#222831",
                 paper_bgcolor="#222831",
+                xaxis_type="date",
                 title="Relative Strength Index (RSI)"
             )
             st.plotly_chart(fig2, use_container_width=True)
@@ -131,14 +123,12 @@ if st.button("Analyze", key="analyze_metrics_btn"):
             # MACD Chart
             fig3 = go.Figure()
             fig3.add_trace(go.Scatter(
-                x=data.index,
-                y=data['MACD'],
+                **line_xy(data['MACD']),
                 name="MACD",
                 line=dict(color="#00ADB5")
             ))
             fig3.add_trace(go.Scatter(
-                x=data.index,
-                y=data['Signal_Line'],
+                **line_xy(data['Signal_Line']),
                 name="Signal Line",
                 line=dict(color="#FF5722")
             ))
@@ -146,6 +136,7 @@ if st.button("Analyze", key="analyze_metrics_btn"):
                 template="plotly_dark",
                 plot_bgcolor="#222831",
                 paper_bgcolor="#222831",
+                xaxis_type="date",
                 title="MACD"
             )
             st.plotly_chart(fig3, use_container_width=True)
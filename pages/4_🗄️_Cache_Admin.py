@@ -0,0 +1,109 @@
+import streamlit as st
+import pandas as pd
+from pathlib import Path
+import sys
+
+# Add backend to path
+sys.path.append(str(Path(__file__).parent.parent))
+from backend.ai_model import default_prophet_cache
+from backend.model_registry import default_registry
+from backend.resources import get_predictor_pool
+from frontend.memorybank import load_memorybank
+
+CacheManager = load_memorybank("cache_manager").CacheManager
+
+# Page configuration
+st.set_page_config(
+    page_title="Cache Admin - AI Technical Analysis",
+    page_icon="🗄️",
+    layout="wide"
+)
+
+# Custom CSS for dark theme
+st.markdown("""
+    <style>
+    .stApp {
+        background-color: #222831;
+        color: #FFFFFF;
+    }
+    .stButton>button {
+        background-color: #00ADB5;
+        color: #FFFFFF;
+    }
+    </style>
+    """, unsafe_allow_html=True)
+
+st.title("Cache Admin")
+st.subheader("Shared Cache Memory and Activity")
+
+stats = CacheManager.get_cache_stats()
+
+# Headline metrics
+col1, col2, col3, col4 = st.columns(4)
+with col1:
+    st.metric("Entries", stats['entries'])
+with col2:
+    st.metric("Memory", f"{stats['bytes'] / 1024 ** 2:.1f} MB")
+with col3:
+    st.metric("Hit Rate", f"{stats['hit_rate']:.1%}", f"{stats['hits']} hits / {stats['misses']} misses",
+              delta_color="off")
+with col4:
+    st.metric("Evictions", stats['evictions'], f"{stats['expirations']} expired", delta_color="off")
+
+# Cached entries, largest first
+st.subheader("Entries")
+entries = pd.DataFrame.from_dict(CacheManager.get_cache_info(), orient='index')
+if entries.empty:
+    st.info("The cache is empty.")
+else:
+    entries['MB'] = entries['bytes'] / 1024 ** 2
+    entries = entries.sort_values('bytes', ascending=False)
+    st.dataframe(
+        entries[['MB', 'hits', 'timestamp', 'last_access', 'age_seconds']],
+        use_container_width=True
+    )
+
+# Eviction history, newest first
+st.subheader("Eviction History")
+history = pd.DataFrame(CacheManager.get_eviction_history())
+if history.empty:
+    st.info("Nothing has been evicted yet.")
+else:
+    history['MB'] = history['bytes'] / 1024 ** 2
+    st.dataframe(
+        history.iloc[::-1][['evicted_at', 'reason', 'key', 'MB', 'hits', 'age_seconds']],
+        use_container_width=True,
+        hide_index=True
+    )
+
+# Fitted models live in their own registries, next to the shared cache
+st.subheader("Models")
+registry_models = pd.DataFrame(default_registry.describe())
+prophet_models = pd.DataFrame(default_prophet_cache.describe())
+predictors = pd.DataFrame(get_predictor_pool().describe())
+
+def megabytes(table: pd.DataFrame) -> float:
+    return table['bytes'].sum() / 1024 ** 2 if not table.empty else 0.0
+
+col1, col2, col3 = st.columns(3)
+with col1:
+    st.metric("RandomForest Models", len(registry_models), f"{megabytes(registry_models):.1f} MB",
+              delta_color="off")
+with col2:
+    st.metric("Prophet Models", len(prophet_models), f"{megabytes(prophet_models):.1f} MB", delta_color="off")
+with col3:
+    st.metric("Predictor Slots", len(predictors), f"{megabytes(predictors):.1f} MB (registry models)",
+              delta_color="off")
+
+for title, table in [("Model Registry", registry_models), ("Prophet Models", prophet_models),
+                     ("Predictor Pool", predictors)]:
+    if table.empty:
+        continue
+    table['MB'] = table['bytes'] / 1024 ** 2
+    st.write(f"**{title}**")
+    st.dataframe(table.drop(columns='bytes').sort_values('MB', ascending=False),
+                 use_container_width=True, hide_index=True)
+
+if st.button("Clear Cache", key="clear_cache_btn"):
+    CacheManager.clear_cache()
+    st.rerun()
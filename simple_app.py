@@ -5,7 +5,8 @@ import plotly.graph_objects as go
 from datetime import datetime, timedelta
 import numpy as np
 import logging
-import ta
+
+from backend.indicator_engine import compute_indicators
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -55,28 +56,23 @@ end_date = st.sidebar.date_input("End Date", value=today)
 
 logger.info("Sidebar inputs created...")
 
+# Same definitions as the ta library: full windows, Wilder RSI, population std
+SIMPLE_APP_INDICATORS = {
+    'SMA20': ('sma', {'window': 20}),
+    'SMA50': ('sma', {'window': 50}),
+    'EMA20': ('ema', {'span': 20, 'adjust': False, 'min_periods': 20}),
+    'EMA50': ('ema', {'span': 50, 'adjust': False, 'min_periods': 50}),
+    ('BB_upper', 'BB_middle', 'BB_lower'): ('bollinger', {'window': 20, 'num_std': 2, 'ddof': 0}),
+    'RSI': ('rsi', {'window': 14, 'method': 'wilder'}),
+    ('MACD', 'MACD_signal'): ('macd', {
+        'fast_min_periods': 12, 'slow_min_periods': 26, 'signal_min_periods': 9
+    }),
+}
+
 def calculate_technical_indicators(data):
-    # Calculate SMAs
-    data['SMA20'] = ta.trend.sma_indicator(data['Close'], window=20)
-    data['SMA50'] = ta.trend.sma_indicator(data['Close'], window=50)
-    
-    # Calculate EMAs
-    data['EMA20'] = ta.trend.ema_indicator(data['Close'], window=20)
-    data['EMA50'] = ta.trend.ema_indicator(data['Close'], window=50)
-    
-    # Calculate Bollinger Bands
-    indicator_bb = ta.volatility.BollingerBands(close=data["Close"], window=20, window_dev=2)
-    data['BB_upper'] = indicator_bb.bollinger_hband()
-    data['BB_lower'] = indicator_bb.bollinger_lband()
-    data['BB_middle'] = indicator_bb.bollinger_mavg()
-    
-    # Calculate RSI
-    data['RSI'] = ta.momentum.rsi(data['Close'], window=14)
-    
-    # Calculate MACD
-    indicator_macd = ta.trend.MACD(close=data["Close"])
-    data['MACD'] = indicator_macd.macd()
-    data['MACD_signal'] = indicator_macd.macd_signal()
+    # Calculate SMAs, EMAs, Bollinger Bands, RSI and MACD in one pass
+    indicators = compute_indicators(data, SIMPLE_APP_INDICATORS)
+    data[indicators.columns] = indicators
     
     return data
 
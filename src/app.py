@@ -9,8 +9,7 @@ from pathlib import Path
 
 # Add backend to path
 sys.path.append(str(Path(__file__).parent.parent))
-from backend.data_loader import DataLoader
-from backend.ml_predictor import MLPredictor
+from backend.resources import get_data_loader, get_predictor_pool
 
 # Page configuration
 st.set_page_config(
@@ -43,11 +42,8 @@ st.markdown("""
     </style>
     """, unsafe_allow_html=True)
 
-# Initialize session state
-if 'data_loader' not in st.session_state:
-    st.session_state.data_loader = DataLoader()
-if 'ml_predictor' not in st.session_state:
-    st.session_state.ml_predictor = MLPredictor()
+# Shared by every session in the server process
+data_loader = get_data_loader()
 
 # Sidebar
 with st.sidebar:
@@ -85,44 +81,46 @@ if selected_feature == "ML Predictive Analytics":
     st.header("Market Prediction Models")
     
     with st.spinner("Fetching and analyzing market data..."):
-        data = st.session_state.data_loader.get_market_data(symbol, timeframe)
+        data = data_loader.get_market_data(symbol, timeframe)
         if data is not None:
-            data = st.session_state.data_loader.get_technical_indicators(data)
+            data = data_loader.get_technical_indicators(data)
             if data is not None:
-                # Prepare data for ML
-                X, y = st.session_state.ml_predictor.prepare_data(data)
-                if X is not None and y is not None:
-                    # Train model and make predictions
-                    score = st.session_state.ml_predictor.train(X, y)
-                    predictions = st.session_state.ml_predictor.predict(X)
+                # Borrow the predictor every session shares for this symbol
+                with get_predictor_pool().borrow(symbol) as ml_predictor:
+                    # Prepare data for ML
+                    X, y = ml_predictor.prepare_data(data)
+                    if X is not None and y is not None:
+                        # Train model and make predictions
+                        score = ml_predictor.train(X, y)
+                        predictions = ml_predictor.predict(X)
                     
-                    if predictions is not None:
-                        # Display metrics
-                        col1, col2, col3 = st.columns(3)
-                        col1.metric("Model Accuracy", f"{score:.2%}")
-                        col2.metric("Prediction Confidence", "High" if score > 0.7 else "Medium")
-                        col3.metric("Data Points", len(data))
+                        if predictions is not None:
+                            # Display metrics
+                            col1, col2, col3 = st.columns(3)
+                            col1.metric("Model Accuracy", f"{score:.2%}")
+                            col2.metric("Prediction Confidence", "High" if score > 0.7 else "Medium")
+                            col3.metric("Data Points", len(data))
                         
-                        # Plot actual vs predicted
-                        fig = go.Figure()
-                        fig.add_trace(go.Scatter(x=data.index, y=data['Close'], name="Actual"))
-                        fig.add_trace(go.Scatter(x=data.index[:-1], y=predictions, name="Predicted"))
-                        fig.update_layout(
-                            template="plotly_dark",
-                            plot_bgcolor="#222831",
-                            paper_bgcolor="#222831",
-                            title=f"Price Prediction Analysis - {symbol}"
-                        )
-                        st.plotly_chart(fig, use_container_width=True)
+                            # Plot actual vs predicted
+                            fig = go.Figure()
+                            fig.add_trace(go.Scatter(x=data.index, y=data['Close'], name="Actual"))
+                            fig.add_trace(go.Scatter(x=data.index[:-1], y=predictions, name="Predicted"))
+                            fig.update_layout(
+                                template="plotly_dark",
+                                plot_bgcolor="#222831",
+                                paper_bgcolor="#222831",
+                                title=f"Price Prediction Analysis - {symbol}"
+                            )
+                            st.plotly_chart(fig, use_container_width=True)
                         
-                        # Model insights
-                        st.subheader("Model Insights")
-                        feature_importance = pd.DataFrame({
-                            'Feature': ['Open', 'High', 'Low', 'Close', 'Volume', 'SMA_20', 'SMA_50', 'RSI', 'MACD'],
-                            'Importance': st.session_state.ml_predictor.model.feature_importances_
-                        }).sort_values('Importance', ascending=False)
+                            # Model insights
+                            st.subheader("Model Insights")
+                            feature_importance = pd.DataFrame({
+                                'Feature': ['Open', 'High', 'Low', 'Close', 'Volume', 'SMA_20', 'SMA_50', 'RSI', 'MACD'],
+                                'Importance': ml_predictor.model.feature_importances_
+                            }).sort_values('Importance', ascending=False)
                         
-                        st.bar_chart(feature_importance.set_index('Feature'))
+                            st.bar_chart(feature_importance.set_index('Feature'))
             
 elif selected_feature == "Algorithmic Strategies":
     st.header("Trading Strategies")
@@ -133,9 +131,9 @@ elif selected_feature == "Algorithmic Strategies":
     )
     
     with st.spinner("Analyzing trading strategies..."):
-        data = st.session_state.data_loader.get_market_data(symbol, timeframe)
+        data = data_loader.get_market_data(symbol, timeframe)
         if data is not None:
-            data = st.session_state.data_loader.get_technical_indicators(data)
+            data = data_loader.get_technical_indicators(data)
             if data is not None:
                 # Strategy performance
                 st.subheader("Strategy Performance")
@@ -179,9 +177,9 @@ elif selected_feature == "Automated Reporting":
     )
     
     with st.spinner("Generating report..."):
-        data = st.session_state.data_loader.get_market_data(symbol, timeframe)
+        data = data_loader.get_market_data(symbol, timeframe)
         if data is not None:
-            data = st.session_state.data_loader.get_technical_indicators(data)
+            data = data_loader.get_technical_indicators(data)
             if data is not None:
                 st.subheader("Key Insights")
                 
@@ -207,9 +205,9 @@ elif selected_feature == "Metrics Dashboard":
     st.header("Market Metrics")
     
     with st.spinner("Loading market metrics..."):
-        data = st.session_state.data_loader.get_market_data(symbol, timeframe)
+        data = data_loader.get_market_data(symbol, timeframe)
         if data is not None:
-            data = st.session_state.data_loader.get_technical_indicators(data)
+            data = data_loader.get_technical_indicators(data)
             if data is not None:
                 # Key metrics
                 col1, col2, col3 = st.columns(3)
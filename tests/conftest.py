@@ -0,0 +1,86 @@
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# The app modules import each other from the repository root, like the pages do
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from backend.data_store import OHLCVStore
+from backend.forecast_pool import ForecastPool
+from frontend.memorybank import load_memorybank
+
+
+def make_bars(periods: int = 60, freq: str = 'B', tz: str = 'America/New_York',
+              seed: int = 0, price: float = 100.0, end=None) -> pd.DataFrame:
+    """Synthetic daily bars shaped like a Yahoo Finance history, ending today by default"""
+    rng = np.random.default_rng(seed)
+    if end is None:
+        end = pd.Timestamp.now(tz=tz).normalize()
+    index = pd.date_range(end=end, periods=periods, freq=freq, tz=tz)
+    close = price * np.exp(np.cumsum(rng.normal(0, 0.01, periods)))
+    open_ = close * (1 + rng.normal(0, 0.003, periods))
+    return pd.DataFrame({
+        'Open': open_,
+        'High': np.maximum(open_, close) * 1.01,
+        'Low': np.minimum(open_, close) * 0.99,
+        'Close': close,
+        'Volume': rng.integers(1_000_000, 5_000_000, periods),
+        'Dividends': 0.0,
+        'Stock Splits': 0.0,
+    }, index=index)
+
+
+@pytest.fixture
+def bars() -> pd.DataFrame:
+    return make_bars()
+
+
+@pytest.fixture
+def store(tmp_path) -> OHLCVStore:
+    return OHLCVStore(tmp_path / 'ohlcv')
+
+
+@pytest.fixture(autouse=True)
+def fresh_breakers(monkeypatch):
+    # Failures recorded by one test must not open the breaker for the next
+    from backend import retry
+    monkeypatch.setattr(retry, '_BREAKERS', {})
+
+
+@pytest.fixture
+def loader(monkeypatch, store):
+    """DataLoader backed by a temporary store, retrying without delays"""
+    from backend.data_loader import DataLoader
+    from backend.retry import RetryPolicy
+    monkeypatch.setattr(DataLoader, 'store', store)
+    monkeypatch.setattr(DataLoader, 'retry_policy', RetryPolicy(base_delay=0.0, max_delay=0.0, deadline=5.0))
+    return DataLoader
+
+
+@pytest.fixture(scope='session')
+def cache_manager():
+    """memorybank.mdc/cache_manager.py, loaded by path as the Cache Admin page does"""
+    return load_memorybank('cache_manager')
+
+
+class ThreadForecastPool(ForecastPool):
+    """ForecastPool running its jobs on a thread, where test doubles are installed"""
+
+    def __init__(self):
+        self.max_workers = 1
+        self._executor = ThreadPoolExecutor(1)
+
+
+@pytest.fixture
+def thread_forecast_pool(monkeypatch):
+    """Serve get_forecast_pool() from a ThreadForecastPool"""
+    from backend import forecast_pool
+    pool = ThreadForecastPool()
+    monkeypatch.setattr(forecast_pool, 'get_forecast_pool', lambda: pool)
+    yield pool
+    pool.shutdown()
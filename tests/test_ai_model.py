@@ -0,0 +1,147 @@
+import sys
+import types
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+import pytest
+
+from backend import ai_model
+
+from backend.ai_model import (
+    WARM_START_MAX_ROWS, ProphetModelCache, _can_warm_start, prepare_data_for_prophet,
+    prophet_fingerprint, train_prophet_model
+)
+from tests.conftest import ROOT, make_bars
+
+
+class FakeProphet:
+    """Records fits the way train_prophet_model drives Prophet"""
+    fits = []
+
+    def __init__(self, **config):
+        self.config = config
+        self.history = None
+        self.params = {}
+
+    def fit(self, data, init=None):
+        FakeProphet.fits.append(init)
+        self.history = data.copy()
+        self.params = {name: np.array([[float(len(data))]]) for name in ['k', 'm', 'sigma_obs']}
+        self.params.update({name: np.array([[0.0, 1.0]]) for name in ['delta', 'beta']})
+        return self
+
+    def make_future_dataframe(self, periods):
+        future = pd.date_range(self.history['ds'].iloc[-1], periods=periods + 1)[1:]
+        return pd.DataFrame({'ds': pd.concat([self.history['ds'], pd.Series(future)], ignore_index=True)})
+
+    def predict(self, future):
+        yhat = pd.Series(np.linspace(100.0, 110.0, len(future)))
+        return future.assign(yhat=yhat, yhat_lower=yhat - 1.0, yhat_upper=yhat + 1.0)
+
+    def plot(self, forecast):
+        return go.Figure(go.Scatter(x=forecast['ds'], y=forecast['yhat']))
+
+
+@pytest.fixture
+def fake_prophet(monkeypatch):
+    FakeProphet.fits = []
+    monkeypatch.setitem(sys.modules, 'prophet', types.SimpleNamespace(Prophet=FakeProphet))
+    # Jobs on a ThreadForecastPool hand fitted models back as they are
+    monkeypatch.setitem(sys.modules, 'prophet.serialize', types.SimpleNamespace(
+        model_to_json=lambda model: model, model_from_json=lambda model: model
+    ))
+    return FakeProphet
+
+
+@pytest.fixture
+def series():
+    return prepare_data_for_prophet(make_bars(200).tz_localize(None))
+
+
+def test_fingerprint_tracks_appended_rows(series):
+    assert prophet_fingerprint(series) == prophet_fingerprint(series.copy())
+    assert prophet_fingerprint(series) != prophet_fingerprint(series.iloc[:-1])
+    assert prophet_fingerprint(series.iloc[:0]) == (None, None, 0, None)
+
+
+def test_cache_evicts_least_recently_used(series):
+    cache = ProphetModelCache(max_entries=2)
+    keys = [cache.make_key('AAPL', series.iloc[:rows], {}) for rows in (100, 150, 200)]
+    cache.put(keys[0], 'first')
+    cache.put(keys[1], 'second')
+    cache.get(keys[0])
+    cache.put(keys[2], 'third')
+
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[0]) == 'first' and len(cache) == 2
+
+
+def test_latest_model_is_remembered_per_series(series):
+    cache = ProphetModelCache()
+    series_key = cache.series_key('AAPL', {'daily_seasonality': True})
+    cache.put(cache.make_key('AAPL', series, {'daily_seasonality': True}), 'model', series_key)
+
+    assert cache.latest(series_key) == 'model'
+    assert cache.latest(cache.series_key('AAPL', {})) is None
+    cache.clear()
+    assert cache.latest(series_key) is None
+
+
+def test_warm_start_only_for_a_few_appended_rows(series):
+    previous = FakeProphet().fit(series.iloc[:-5])
+
+    assert _can_warm_start(previous, series)
+    assert not _can_warm_start(previous, series.iloc[1:])
+    assert not _can_warm_start(FakeProphet().fit(series.iloc[:-(WARM_START_MAX_ROWS + 1)]), series)
+    assert not _can_warm_start(FakeProphet(), series)
+
+
+def test_train_reuses_cached_fits_and_warm_starts(fake_prophet, series):
+    cache = ProphetModelCache()
+    first = train_prophet_model(series.iloc[:-3], 'AAPL', cache=cache)
+
+    assert train_prophet_model(series.iloc[:-3], 'AAPL', cache=cache) is first
+    assert fake_prophet.fits == [None]
+
+    refit = train_prophet_model(series, 'AAPL', cache=cache)
+    assert refit is not first
+    init = fake_prophet.fits[-1]
+    assert init is not None and init['k'] == len(first.history)
+
+    train_prophet_model(series, 'AAPL', cache=cache, config={'yearly_seasonality': False})
+    assert fake_prophet.fits[-1] is None
+
+
+def test_persisted_models_reload_with_prophet(tmp_path, series):
+    pytest.importorskip('prophet')
+    cache = ProphetModelCache(persist_dir=tmp_path)
+    model = train_prophet_model(series, 'AAPL', cache=cache)
+
+    reloaded = ProphetModelCache(persist_dir=tmp_path).latest(cache.series_key('AAPL', {}))
+    assert reloaded is not None and len(reloaded.history) == len(model.history)
+
+
+def test_main_app_analysis_runs_on_the_pool_and_reuses_the_cached_fit(monkeypatch, fake_prophet,
+                                                                     thread_forecast_pool):
+    import yfinance
+    from streamlit.testing.v1 import AppTest
+    monkeypatch.setattr(ai_model, 'default_prophet_cache', ProphetModelCache())
+    bars = make_bars(200).tz_localize(None)
+    downloaded = bars.set_axis(pd.MultiIndex.from_product([bars.columns, ['AAPL']]), axis=1)
+    monkeypatch.setattr(yfinance, 'download', lambda *args, **kwargs: downloaded)
+    jobs = []
+    submit = thread_forecast_pool.submit
+    monkeypatch.setattr(thread_forecast_pool, 'submit', lambda *args: jobs.append(args[0]) or submit(*args))
+
+    app = AppTest.from_file(str(ROOT / 'main_app.py'), default_timeout=30).run()
+    app.sidebar.button[0].click().run()
+    for _ in range(2):
+        next(button for button in app.button if button.label == 'Run AI Analysis').click().run()
+        assert not app.exception
+        assert any('trend in the stock price' in text.value for text in app.markdown)
+
+    # Results stay on the page across reruns without another job
+    app.run()
+    assert any('trend in the stock price' in text.value for text in app.markdown)
+    assert fake_prophet.fits == [None] and len(jobs) == 1
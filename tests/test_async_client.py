@@ -0,0 +1,86 @@
+import asyncio
+import threading
+import time
+
+import pandas as pd
+
+from backend import async_client
+from backend.async_client import AsyncMarketDataClient
+from tests.conftest import make_bars
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def test_get_many_bounds_concurrency(monkeypatch):
+    lock = threading.Lock()
+    active = []
+    peak = []
+
+    def history(symbol, interval, period=None, start=None):
+        with lock:
+            active.append(symbol)
+            peak.append(len(active))
+        time.sleep(0.05)
+        with lock:
+            active.remove(symbol)
+        return make_bars(30)
+
+    monkeypatch.setattr(async_client, 'fetch_history', history)
+
+    async def fetch():
+        async with AsyncMarketDataClient(max_concurrency=2, use_store=False) as client:
+            return await client.get_many(['AAPL', 'MSFT', 'GOOG', 'BTC'], '1mo', ('1d', '1h'))
+
+    frames = run(fetch())
+
+    assert max(peak) == 2
+    assert len(frames) == 8
+    assert ('BTC-USD', '1h') in frames
+    assert all(frame is not None for frame in frames.values())
+
+
+def test_failed_and_timed_out_fetches_return_none(monkeypatch):
+    def history(symbol, interval, period=None, start=None):
+        if symbol == 'SLOW':
+            time.sleep(0.5)
+        if symbol == 'BAD':
+            raise RuntimeError('no such symbol')
+        return pd.DataFrame() if symbol == 'EMPTY' else make_bars(30)
+
+    monkeypatch.setattr(async_client, 'fetch_history', history)
+    monkeypatch.setattr(async_client, 'fetch_download', lambda *args, **kwargs: pd.DataFrame())
+
+    async def fetch():
+        async with AsyncMarketDataClient(timeout=0.2, use_store=False) as client:
+            return await client.get_many(['AAPL', 'SLOW', 'BAD', 'EMPTY'], '1mo')
+
+    frames = run(fetch())
+
+    assert frames[('AAPL', '1d')] is not None
+    assert frames[('SLOW', '1d')] is None
+    assert frames[('BAD', '1d')] is None
+    assert frames[('EMPTY', '1d')] is None
+
+
+def test_fetches_go_through_the_store(monkeypatch, loader):
+    bars = make_bars(60)
+    monkeypatch.setattr(async_client, 'fetch_history', lambda *args, **kwargs: bars)
+
+    async def fetch():
+        async with AsyncMarketDataClient() as client:
+            return await client.get_market_data('AAPL', '1mo')
+
+    data = run(fetch())
+
+    assert data.index[-1] == bars.index[-1]
+    assert loader.store.load('AAPL', '1d') is not None
+
+
+def test_refresh_symbols_runs_on_the_background_loop(monkeypatch, loader):
+    monkeypatch.setattr(async_client, 'fetch_history', lambda *args, **kwargs: make_bars(30))
+
+    frames = async_client.refresh_symbols(['AAPL', 'MSFT'], '1mo')
+
+    assert set(frames) == {('AAPL', '1d'), ('MSFT', '1d')}
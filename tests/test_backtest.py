@@ -0,0 +1,69 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from backend.backtest import STRATEGIES, backtest_arrays, run_backtest
+from backend.indicator_engine import IndicatorEngine
+from tests.conftest import make_bars
+
+
+@pytest.fixture
+def close():
+    return pd.DataFrame({
+        symbol: make_bars(300, seed=seed)['Close'] for seed, symbol in enumerate(['AAPL', 'MSFT', 'GOOG'])
+    })
+
+
+def loop_backtest(close, positions, fee):
+    """Bar-by-bar reference implementation"""
+    equity, previous, curve = 1.0, 0.0, []
+    for bar in range(len(close)):
+        ret = previous * (close[bar] / close[bar - 1] - 1) if bar else 0.0
+        ret -= fee * abs(positions[bar] - previous)
+        equity *= 1 + ret
+        curve.append(equity)
+        previous = positions[bar]
+    return np.array(curve)
+
+
+@pytest.mark.parametrize('name', list(STRATEGIES))
+def test_vectorized_equity_matches_a_bar_loop(close, name):
+    result = run_backtest(close, STRATEGIES[name], fee=0.001)
+
+    for symbol in close.columns:
+        expected = loop_backtest(close[symbol].to_numpy(), result.positions[symbol].to_numpy(), 0.001)
+        np.testing.assert_allclose(result.equity[symbol], expected, rtol=1e-10)
+
+
+def test_missing_bars_are_flat():
+    close = np.array([[np.nan], [10.0], [11.0], [12.1]])
+    arrays = backtest_arrays(close, np.ones_like(close))
+
+    np.testing.assert_array_equal(arrays['positions'][:, 0], [0, 1, 1, 1])
+    np.testing.assert_allclose(arrays['equity'][:, 0], [1.0, 1.0, 1.1, 1.21])
+
+
+def test_trades_pair_entries_and_exits():
+    index = pd.date_range('2024-01-01', periods=6)
+    close = pd.DataFrame({'A': [10.0, 11, 12, 11, 10, 12]}, index=index)
+    signal = lambda engine: np.array([[0.0], [1], [1], [0], [1], [1]])
+
+    result = run_backtest(close, signal)
+    trades = result.trades
+
+    assert len(trades) == 2
+    first, last = trades.iloc[0], trades.iloc[1]
+    assert (first['entry_price'], first['exit_price'], first['bars'], first['open']) == (11, 11, 2, False)
+    assert first['return'] == pytest.approx(0.0)
+    assert last['open'] and last['entry_date'] == index[4]
+    summary = result.summary()
+    assert summary.loc['A', 'trades'] == 2 and summary.loc['A', 'win_rate'] == 0.0
+
+
+def test_series_input_and_shared_engine(close):
+    engine = IndicatorEngine(close)
+    shared = run_backtest(close, STRATEGIES['Moving Average Crossover'], engine=engine)
+    single = run_backtest(close['MSFT'], STRATEGIES['Moving Average Crossover'])
+
+    np.testing.assert_allclose(single.equity.iloc[:, 0], shared.equity['MSFT'])
+    assert ('sma', 20, 20) in engine._cache
@@ -0,0 +1,79 @@
+from pathlib import Path
+
+import pytest
+
+from backend import model_registry
+from backend.ai_model import ProphetModelCache
+from backend.model_registry import ModelEntry, ModelRegistry
+from backend.resources import PredictorPool
+from tests.conftest import make_bars
+
+PAGE = next((Path(__file__).parent.parent / 'pages').glob('4_*.py'))
+
+
+def test_registries_report_model_sizes():
+    registry = ModelRegistry()
+    registry.put('key', ModelEntry(list(range(1000)), None, {'model_score': 0.5, 'training_samples': 10}))
+    prophet = ProphetModelCache()
+    prophet.put('key', {'weights': list(range(100))})
+
+    (model,) = registry.describe()
+    assert model['bytes'] > 1000 and model['model_score'] == 0.5
+    (fit,) = prophet.describe()
+    assert fit['bytes'] > 100 and fit['history_rows'] == 0
+
+
+def test_predictor_pool_reports_trained_model_sizes():
+    pool = PredictorPool(n_jobs=1)
+    with pool.borrow('AAPL') as predictor:
+        predictor.params['n_estimators'] = 5
+        predictor.registry = ModelRegistry()
+        predictor.predict(make_bars(120), 3, 'AAPL')
+    with pool.borrow('MSFT'):
+        pass
+
+    slots = {slot['symbol']: slot for slot in pool.describe()}
+    assert slots['AAPL']['trained'] and slots['AAPL']['bytes'] > 0
+    assert slots['MSFT']['bytes'] == 0
+
+
+def test_models_are_sized_once_not_on_every_describe(monkeypatch):
+    from backend import ai_model
+    sized = []
+    for module in (model_registry, ai_model):
+        estimate = module.estimate_size
+        monkeypatch.setattr(module, 'estimate_size', lambda value, estimate=estimate: sized.append(1) or estimate(value))
+    registry = ModelRegistry()
+    registry.put('key', ModelEntry(list(range(1000)), None))
+    prophet = ProphetModelCache()
+    prophet.put('key', {'weights': list(range(100))})
+
+    for _ in range(3):
+        registry.describe()
+        prophet.describe()
+    assert len(sized) == 2
+
+
+def test_predictor_pool_reuses_the_registry_size():
+    pool = PredictorPool(n_jobs=1)
+    registry = ModelRegistry()
+    with pool.borrow('AAPL') as predictor:
+        predictor.params['n_estimators'] = 5
+        predictor.registry = registry
+        predictor.predict(make_bars(120), 3, 'AAPL')
+
+    [(_, entry)] = registry.items()
+    assert pool.describe()[0]['bytes'] == entry.bytes == registry.describe()[0]['bytes']
+
+
+def test_admin_page_lists_models(monkeypatch):
+    from streamlit.testing.v1 import AppTest
+    registry = ModelRegistry()
+    registry.put('forest-key', ModelEntry(list(range(1000)), None, {'model_score': 0.5}))
+    monkeypatch.setattr(model_registry, 'default_registry', registry)
+
+    page = AppTest.from_file(str(PAGE), default_timeout=30).run()
+
+    assert not page.exception
+    assert 'Models' in [header.value for header in page.subheader]
+    assert any(metric.label == 'RandomForest Models' and metric.value == '1' for metric in page.metric)
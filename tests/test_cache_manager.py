@@ -0,0 +1,165 @@
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from tests.conftest import make_bars
+
+
+@pytest.fixture
+def cache(cache_manager):
+    return cache_manager.SharedCache(max_entries=3)
+
+
+def test_least_recently_used_entries_are_evicted(cache):
+    for key in 'abc':
+        cache.set(key, key)
+    cache.get('a', 60)
+    cache.set('d', 'd')
+
+    assert cache.keys() == ['c', 'a', 'd']
+    assert cache.stats()['evictions'] == 1
+    assert cache.eviction_history()[-1]['key'] == 'b'
+
+
+def test_entries_are_evicted_beyond_the_byte_budget(cache_manager):
+    frame = make_bars(1000)
+    size = cache_manager.estimate_size(frame)
+    cache = cache_manager.SharedCache(max_entries=100, max_bytes=int(size * 2.5))
+    for key in 'abc':
+        cache.set(key, frame)
+
+    assert cache.keys() == ['b', 'c']
+    assert cache.stats()['bytes'] == 2 * size
+    assert cache.eviction_history()[-1]['reason'] == 'size'
+
+    cache.delete('b')
+    assert cache.stats()['bytes'] == size
+
+
+def test_values_larger_than_the_budget_are_not_kept(cache_manager):
+    cache = cache_manager.SharedCache(max_bytes=100)
+    cache.set('big', np.zeros(1000))
+
+    assert cache.get('big', 60) == (False, None)
+    assert cache.stats()['bytes'] == 0
+
+
+def test_callers_get_private_copies(cache):
+    frame = make_bars(10)
+    cache.set('frame', frame)
+    found, first = cache.get('frame', 60)
+    first['Close'] = 0.0
+    first['Extra'] = 1
+
+    _, second = cache.get('frame', 60)
+    pd.testing.assert_frame_equal(second, frame)
+    computed = cache.get_or_compute('frame', lambda: pytest.fail('recomputed'), 60)
+    assert computed is not second
+
+
+def test_computed_value_is_not_shared_with_the_computing_caller(cache):
+    value = cache.get_or_compute('key', lambda: {'rows': [1, 2]}, 60)
+    value['rows'].append(3)
+
+    assert cache.get('key', 60)[1] == {'rows': [1, 2]}
+
+
+def test_concurrent_misses_compute_once(cache):
+    calls = []
+    start = threading.Barrier(4)
+
+    def compute():
+        calls.append(1)
+        time.sleep(0.05)
+        return 'value'
+
+    def worker():
+        start.wait()
+        assert cache.get_or_compute('key', compute, 60) == 'value'
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert cache._key_locks == {}
+
+
+def test_key_locks_are_dropped_after_failed_computes(cache):
+    def compute():
+        raise RuntimeError('fetch failed')
+
+    for key in range(10):
+        with pytest.raises(RuntimeError):
+            cache.get_or_compute(f'key-{key}', compute, 60)
+
+    assert cache._key_locks == {} and cache.keys() == []
+
+
+def test_persisted_entries_survive_a_restart(cache_manager, tmp_path):
+    cache_manager.SharedCache(persist_dir=tmp_path).set('key', make_bars(5))
+
+    found, value = cache_manager.SharedCache(persist_dir=tmp_path).get('key', 60)
+
+    assert found and len(value) == 5
+
+
+def sample(*args, **kwargs):
+    return args, kwargs
+
+
+def test_cache_keys_hash_frame_contents(cache_manager):
+    key = cache_manager.make_cache_key
+    frame = make_bars(50)
+    changed = frame.copy()
+    changed.iloc[10, 0] += 0.01
+
+    assert key(sample, (frame,), {}) == key(sample, (frame.copy(),), {})
+    assert key(sample, (frame,), {}) != key(sample, (changed,), {})
+    assert key(sample, (frame,), {}) != key(sample, (frame.tz_convert('UTC'),), {})
+    assert key(sample, (), {'a': 1, 'b': 2}) == key(sample, (), {'b': 2, 'a': 1})
+    assert key(sample, (1,), {}) != key(sample, ('1',), {})
+    assert key(sample, (pd.Timestamp('2024-01-02'),), {}) == key(sample, (pd.Timestamp('2024-01-02').to_pydatetime(),), {})
+    assert len(key(sample, (frame,), {})) < 100
+
+
+def test_entries_expire_after_their_ttl(cache):
+    cache.set('key', 'value')
+
+    assert cache.get('key', 60) == (True, 'value')
+    time.sleep(0.02)
+    assert cache.get('key', 0.01) == (False, None)
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses'], stats['expirations']) == (1, 1, 1)
+    assert cache.eviction_history()[-1]['reason'] == 'expired'
+
+
+def test_ttl_uses_the_monotonic_clock(cache, monkeypatch):
+    cache.set('key', 'value')
+    # A wall-clock jump must not expire or revive entries
+    monkeypatch.setattr(time, 'time', lambda: 0.0)
+    assert cache.get('key', 60) == (True, 'value')
+
+
+def test_cache_data_decorator_shares_results(cache_manager, monkeypatch):
+    monkeypatch.setattr(cache_manager, 'shared_cache', cache_manager.SharedCache())
+    calls = []
+
+    @cache_manager.CacheManager.cache_data(ttl_seconds=60)
+    def load(symbol, period='1y'):
+        calls.append(symbol)
+        return make_bars(5)
+
+    pd.testing.assert_frame_equal(load('AAPL'), load('AAPL'))
+    load('MSFT')
+    assert calls == ['AAPL', 'MSFT']
+    assert cache_manager.CacheManager.get_cache_stats()['hit_rate'] == pytest.approx(1 / 3)
+
+    cache_manager.CacheManager.clear_cache('load')
+    load('AAPL')
+    assert calls == ['AAPL', 'MSFT', 'AAPL']
@@ -0,0 +1,52 @@
+import json
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+import pytest
+
+from frontend.chart_payload import SharedX, chart_x, chart_y
+
+
+def test_chart_x_gives_wall_clock_epoch_milliseconds():
+    index = pd.date_range('2024-03-01 09:30', periods=3, freq='h', tz='America/New_York')
+
+    x = chart_x(index)
+
+    assert x.dtype == np.float64
+    assert x[0] == pd.Timestamp('2024-03-01 09:30').value // 10 ** 6
+    np.testing.assert_array_equal(np.diff(x), 3_600_000)
+
+
+def test_chart_x_passes_other_indexes_through():
+    np.testing.assert_array_equal(chart_x(pd.RangeIndex(4)), np.arange(4))
+
+
+@pytest.mark.parametrize('price', [0.000012345678, 0.0345678912, 101.23999786376953, 65432.123456])
+def test_chart_y_keeps_seven_significant_digits(price):
+    [value] = chart_y([price])
+
+    assert value == pytest.approx(float(f'{price:.7g}'), rel=1e-15)
+
+
+def test_chart_y_sends_short_json():
+    prices = np.array([101.24, 0.00012, 5.5], dtype=np.float32)
+
+    payload = go.Figure(go.Scatter(y=chart_y(prices))).to_json()
+
+    assert json.loads(payload)['data'][0]['y'] == [101.24, 0.00012, 5.5]
+    assert '101.2399' not in payload
+
+
+def test_chart_y_leaves_zero_and_missing_values():
+    values = chart_y(pd.Series([0.0, np.nan, -2.5, np.inf]))
+
+    assert values[0] == 0 and np.isnan(values[1]) and values[2] == -2.5 and values[3] == np.inf
+
+
+def test_shared_x_converts_each_index_once():
+    index = pd.date_range('2024-01-01', periods=5)
+    x = SharedX()
+
+    assert x(index) is x(index.copy())
+    assert x(index[:3]) is not x(index)
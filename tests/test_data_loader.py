@@ -0,0 +1,202 @@
+import numpy as np
+import pytest
+
+from backend import data_loader
+from tests.conftest import make_bars
+
+
+@pytest.fixture
+def stale(monkeypatch, loader):
+    # Every stored window is due for a top-up
+    monkeypatch.setattr(loader.store, 'is_fresh', lambda symbol, interval='1d': False)
+    return loader
+
+
+def test_top_up_appends_bars_after_the_last_stored_one(monkeypatch, stale):
+    bars = make_bars(60)
+    stale.store.save('AAPL', '1d', bars.iloc[:-5])
+    starts = []
+
+    def history(symbol, interval, period=None, start=None):
+        starts.append(start)
+        return bars.loc[bars.index >= start]
+
+    monkeypatch.setattr(data_loader, 'fetch_history', history)
+    data = stale.get_market_data('AAPL', '1mo')
+
+    assert starts == [bars.index[-6]]
+    assert data.index[-1] == bars.index[-1]
+    assert len(stale.store.load('AAPL', '1d')) == len(bars)
+
+
+def test_new_dividend_replaces_stored_history(monkeypatch, stale):
+    bars = make_bars(60)
+    stale.store.save('AAPL', '1d', bars.iloc[:-5])
+    # The dividend on a new bar re-adjusts every earlier price
+    adjusted = bars.copy()
+    adjusted.loc[adjusted.index[:-3], ['Open', 'High', 'Low', 'Close']] *= 0.98
+    adjusted.loc[adjusted.index[-3], 'Dividends'] = 0.5
+
+    def history(symbol, interval, period=None, start=None):
+        return adjusted.loc[adjusted.index >= start] if start is not None else adjusted
+
+    monkeypatch.setattr(data_loader, 'fetch_history', history)
+    stale.get_market_data('AAPL', '1mo')
+
+    stored = stale.store.load('AAPL', '1d')
+    assert stored.index.equals(adjusted.index)
+    np.testing.assert_allclose(stored['Close'], adjusted['Close'], rtol=1e-6)
+
+
+def test_fallback_window_discards_stored_bars_after_an_action(monkeypatch, loader):
+    bars = make_bars(300)
+    loader.store.save('AAPL', '1d', bars.iloc[100:-5])
+    adjusted = bars.copy()
+    adjusted.loc[adjusted.index[:-3], 'Close'] *= 0.98
+    adjusted.loc[adjusted.index[-3], 'Dividends'] = 0.5
+
+    def download(symbol, interval, period=None, start=None, end=None):
+        start = start.tz_localize(adjusted.index.tz)
+        return adjusted.loc[adjusted.index >= start]
+
+    monkeypatch.setattr(data_loader, 'fetch_download', download)
+    data = data_loader.fetch_window('AAPL', '1d', '1y', loader.store.load('AAPL', '1d'))
+
+    np.testing.assert_allclose(data['Close'], adjusted.loc[data.index, 'Close'])
+
+
+def fake_yf_download(frames, calls):
+    """Stand-in for yf.download that groups frames by ticker like yfinance does"""
+    import pandas as pd
+
+    def download(symbols, start=None, **kwargs):
+        calls.append((list(symbols), start))
+        parts = {}
+        for symbol in symbols:
+            if symbol in frames:
+                frame = frames[symbol]
+                parts[symbol] = frame if start is None else frame.loc[frame.index >= start.tz_localize(frame.index.tz)]
+        return pd.concat(parts, axis=1) if parts else pd.DataFrame()
+    return download
+
+
+def test_many_downloads_missing_symbols_in_one_request(monkeypatch, loader):
+    import yfinance
+    frames = {'AAPL': make_bars(60, seed=1), 'MSFT': make_bars(60, seed=2)}
+    calls = []
+    monkeypatch.setattr(yfinance, 'download', fake_yf_download(frames, calls))
+
+    results = loader.get_market_data_many(['AAPL', 'MSFT'], '1mo')
+
+    assert len(calls) == 1 and sorted(calls[0][0]) == ['AAPL', 'MSFT']
+    for symbol, frame in frames.items():
+        np.testing.assert_allclose(results[symbol]['Close'], frame.loc[results[symbol].index, 'Close'], rtol=1e-6)
+        assert loader.store.load(symbol, '1d') is not None
+
+
+def test_many_tops_up_stale_symbols_keeping_stored_actions(monkeypatch, stale):
+    import yfinance
+    frames = {'AAPL': make_bars(60, seed=1), 'MSFT': make_bars(60, seed=2)}
+    # A dividend already in the store falls inside the top-up overlap
+    frames['AAPL'].loc[frames['AAPL'].index[-6], 'Dividends'] = 0.25
+    for symbol, frame in frames.items():
+        stale.store.save(symbol, '1d', frame.iloc[:-5])
+    calls = []
+    monkeypatch.setattr(yfinance, 'download', fake_yf_download(frames, calls))
+
+    results = stale.get_market_data_many(['AAPL', 'MSFT'], '1mo')
+
+    # One grouped top-up from the last stored bar, no full re-download
+    assert len(calls) == 1 and calls[0][1] == frames['AAPL'].index[-6].tz_localize(None)
+    for symbol, frame in frames.items():
+        assert results[symbol].index[-1] == frame.index[-1]
+
+
+def test_short_history_is_served_from_the_store(monkeypatch, loader):
+    # A listing younger than the requested window
+    bars = make_bars(60)
+    calls = []
+
+    def history(symbol, interval, period=None, start=None):
+        calls.append(period)
+        return bars
+
+    monkeypatch.setattr(data_loader, 'fetch_history', history)
+    first = loader.get_market_data('NEWCO', '1y')
+    again = loader.get_market_data('NEWCO', '5y')
+
+    assert calls == ['1y']
+    assert again.index.equals(first.index)
+
+    # Without the record of the first bar, stored bars that start late do not cover the window
+    loader.store.clear('NEWCO', '1d')
+    loader.store.save('NEWCO', '1d', bars)
+    loader.get_market_data('NEWCO', '1y')
+    assert calls == ['1y', '1y']
+
+
+def test_many_serves_short_histories_from_the_store(monkeypatch, loader):
+    import yfinance
+    frames = {'AAPL': make_bars(300, seed=1), 'NEWCO': make_bars(60, seed=2)}
+    calls = []
+    monkeypatch.setattr(yfinance, 'download', fake_yf_download(frames, calls))
+
+    loader.get_market_data_many(['AAPL', 'NEWCO'], '1y')
+    results = loader.get_market_data_many(['AAPL', 'NEWCO'], '1y')
+
+    assert len(calls) == 1
+    assert results['NEWCO'].index.equals(frames['NEWCO'].index)
+
+
+def test_period_window_starts_on_a_trading_day():
+    import pandas as pd
+    start, end = data_loader.period_window('1y')
+    today = pd.Timestamp.now().normalize()
+
+    assert end == today + pd.Timedelta(days=1)
+    assert start.dayofweek < 5
+    assert today - pd.DateOffset(years=1) - pd.Timedelta(days=5) <= start <= today - pd.DateOffset(years=1)
+
+
+def test_fetch_window_only_downloads_bars_missing_from_the_store(monkeypatch):
+    bars = make_bars(300)
+    stored = bars.iloc[100:-5]
+    requests = []
+
+    def download(symbol, interval, period=None, start=None, end=None):
+        requests.append((start, end))
+        window = bars.loc[bars.index >= start.tz_localize(bars.index.tz)]
+        return window.loc[window.index < end.tz_localize(bars.index.tz)] if end is not None else window
+
+    monkeypatch.setattr(data_loader, 'fetch_download', download)
+    data = data_loader.fetch_window('AAPL', '1d', '1y', stored)
+
+    assert len(requests) == 2
+    newer, older = requests
+    assert newer[0] == stored.index[-1].tz_localize(None)
+    assert older[1] == stored.index[0].tz_localize(None)
+    assert data.index.is_unique and data.index[-1] == bars.index[-1]
+    np.testing.assert_allclose(data['Close'], bars.loc[data.index, 'Close'])
+
+
+def test_fetch_window_without_stored_bars_requests_explicit_dates(monkeypatch):
+    bars = make_bars(300)
+    requests = []
+
+    def download(symbol, interval, period=None, start=None, end=None):
+        requests.append((period, start, end))
+        return bars
+
+    monkeypatch.setattr(data_loader, 'fetch_download', download)
+    data = data_loader.fetch_window('AAPL', '1d', '6mo')
+
+    assert requests == [(None, *data_loader.period_window('6mo'))]
+    assert data.index[0] >= data_loader.period_start('6mo', data.index)
+
+
+def test_failed_fetch_gives_demo_bars_or_none(monkeypatch, loader):
+    monkeypatch.setattr(loader, '_download', classmethod(lambda cls, *args: None))
+
+    demo = loader.get_market_data('AAPL', '1mo')
+    assert demo is not None and len(demo) > 20
+    assert loader.get_market_data('AAPL', '1mo', demo_fallback=False) is None
@@ -0,0 +1,109 @@
+import numpy as np
+import pandas as pd
+
+from backend.data_store import adjustments_changed, merge_bars
+from tests.conftest import make_bars
+
+
+def test_append_merges_new_bars(store, bars):
+    store.save('AAPL', '1d', bars.iloc[:40])
+    merged = store.append('AAPL', '1d', bars.iloc[39:])
+
+    assert len(merged) == len(bars)
+    np.testing.assert_allclose(merged['Close'], bars['Close'], rtol=1e-6)
+    assert len(store.load('AAPL', '1d')) == len(bars)
+
+
+def test_append_replaces_history_when_prices_are_readjusted(store, bars):
+    store.save('AAPL', '1d', bars)
+    store.save_state('AAPL', '1d', 'technical', {'last': 1})
+    # A dividend scales every earlier close down
+    adjusted = bars.iloc[30:].copy()
+    adjusted[['Open', 'High', 'Low', 'Close']] *= 0.98
+
+    merged = store.append('AAPL', '1d', adjusted)
+
+    assert merged.index.equals(adjusted.index)
+    np.testing.assert_allclose(merged['Close'], adjusted['Close'], rtol=1e-6)
+    assert store.load_state('AAPL', '1d', 'technical') is None
+
+
+def test_adjustments_changed_ignores_the_partial_last_bar(bars):
+    refetched = bars.copy()
+    refetched.iloc[-1, refetched.columns.get_loc('Close')] += 1.0
+    assert not adjustments_changed(bars, refetched)
+
+    refetched.iloc[-2, refetched.columns.get_loc('Close')] += 1.0
+    assert adjustments_changed(bars, refetched)
+
+
+def test_adjustments_changed_compares_across_timezones(bars):
+    refetched = bars.tz_convert('UTC')
+    assert not adjustments_changed(bars, refetched)
+
+
+def test_merge_bars_prefers_new_values_for_overlap(bars):
+    stored = bars.iloc[:40]
+    new = bars.iloc[39:].copy()
+    new.iloc[0, new.columns.get_loc('Close')] = 1.0
+
+    merged = merge_bars(stored, new)
+
+    assert merged.index.is_unique
+    assert merged.loc[bars.index[39], 'Close'] == 1.0
+
+
+def test_has_new_actions_ignores_actions_already_stored(bars):
+    from backend.data_store import has_new_actions
+    stored = bars.copy()
+    stored.loc[stored.index[-3], 'Dividends'] = 0.25
+    refetched = stored.iloc[-5:]
+
+    assert not has_new_actions(refetched, stored)
+
+
+def test_has_new_actions_sees_an_action_on_the_refetched_last_bar(bars):
+    from backend.data_store import has_new_actions
+    refetched = bars.iloc[-1:].copy()
+    refetched['Stock Splits'] = 2.0
+
+    assert has_new_actions(refetched, bars)
+    assert has_new_actions(refetched.tz_convert('UTC'), bars)
+
+
+def test_stored_bars_are_compact_on_disk_only(store, bars):
+    store.save('AAPL', '1d', bars)
+
+    on_disk = pd.read_parquet(store._path('AAPL', '1d'))
+    assert on_disk['Close'].dtype == np.float32 and on_disk['Volume'].dtype == np.uint32
+    assert 'Dividends' not in on_disk.columns
+
+    loaded = store.load('AAPL', '1d')
+    assert list(loaded.columns) == list(bars.columns)
+    assert loaded.dtypes.to_dict() == bars.dtypes.to_dict()
+    np.testing.assert_allclose(loaded['Close'], bars['Close'], atol=1e-4)
+    assert (loaded['Dividends'] == 0).all()
+
+
+def test_compact_round_trip_keeps_actions_and_large_volume(bars):
+    from backend.data_store import compact_ohlcv, expand_ohlcv
+    bars = bars.copy()
+    bars.loc[bars.index[5], 'Stock Splits'] = 4.0
+    bars['Volume'] = bars['Volume'].astype(np.int64) * 10_000
+
+    compact = compact_ohlcv(bars)
+    assert compact['Volume'].dtype == np.int64 and 'Stock Splits' in compact.columns
+
+    expanded = expand_ohlcv(compact_ohlcv(compact))
+    assert list(expanded.columns) == list(bars.columns)
+    np.testing.assert_array_equal(expanded['Volume'], bars['Volume'])
+    assert expanded['Stock Splits'].iloc[5] == 4.0
+
+
+def test_append_returns_full_precision_frames(store, bars):
+    store.save('AAPL', '1d', bars.iloc[:40])
+    merged = store.append('AAPL', '1d', bars.iloc[39:])
+
+    assert merged['Close'].dtype == np.float64 and merged['Volume'].dtype == np.int64
+    assert 'Dividends' in merged.columns
+    np.testing.assert_array_equal(merged['Close'].iloc[40:], bars['Close'].iloc[40:])
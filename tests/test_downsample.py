@@ -0,0 +1,94 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from frontend.components import render_candlestick_chart
+from frontend.downsample import (
+    downsample_series, line_xy, lttb_indices, ohlc_buckets, visible_window
+)
+from tests.conftest import make_bars
+
+
+@pytest.fixture
+def long_bars() -> pd.DataFrame:
+    return make_bars(2000, freq='h', tz='UTC')
+
+
+def test_lttb_keeps_the_ends_and_the_extremes():
+    x = np.arange(1000, dtype=np.float64)
+    y = np.sin(x / 50)
+    y[417], y[731] = 5.0, -5.0
+
+    kept = lttb_indices(x, y, 100)
+
+    assert len(kept) == 100 and kept[0] == 0 and kept[-1] == 999
+    assert np.all(np.diff(kept) > 0)
+    assert {417, 731} <= set(kept)
+
+
+@pytest.mark.parametrize('n_out', [2, 1000, 5000])
+def test_lttb_keeps_everything_when_it_cannot_reduce(n_out):
+    np.testing.assert_array_equal(lttb_indices(np.arange(1000.0), np.ones(1000), n_out), np.arange(1000))
+
+
+def test_downsample_series_drops_gaps_only_when_reducing(long_bars):
+    close = long_bars['Close'].copy()
+    close.iloc[:20] = np.nan
+
+    assert downsample_series(close.iloc[:50], 100).equals(close.iloc[:50])
+    reduced = downsample_series(close, 300)
+    assert len(reduced) == 300 and reduced.notna().all()
+    assert reduced.index[0] == close.index[20] and reduced.index[-1] == close.index[-1]
+
+
+def test_line_xy_sends_epoch_milliseconds(long_bars):
+    xy = line_xy(long_bars['Close'], 100)
+
+    assert len(xy['x']) == len(xy['y']) == 100
+    assert xy['x'][0] == long_bars.index[0].value // 10 ** 6
+
+
+def test_ohlc_buckets_keep_every_extreme_and_the_total_volume(long_bars):
+    candles = ohlc_buckets(long_bars, 400)
+
+    assert len(candles) == 400
+    assert candles['Open'].iloc[0] == long_bars['Open'].iloc[0]
+    assert candles['Close'].iloc[-1] == long_bars['Close'].iloc[-1]
+    assert candles['High'].max() == long_bars['High'].max()
+    assert candles['Low'].min() == long_bars['Low'].min()
+    assert candles['Volume'].sum() == long_bars['Volume'].sum()
+    # Each candle starts on its first bar and spans the bars up to the next one
+    first = long_bars.loc[candles.index[0]:candles.index[1]].iloc[:-1]
+    assert candles['High'].iloc[0] == first['High'].max()
+
+
+def test_ohlc_buckets_sum_narrow_volume_without_overflow(long_bars):
+    bars = long_bars.assign(Volume=np.full(len(long_bars), 4_000_000_000, dtype=np.uint32))
+
+    candles = ohlc_buckets(bars, 10)
+
+    assert candles['Volume'].dtype == np.int64
+    assert candles['Volume'].sum() == 4_000_000_000 * len(bars)
+
+
+def test_short_bars_are_not_bucketed(bars):
+    assert ohlc_buckets(bars, 400) is bars
+
+
+def test_visible_window_takes_date_strings_on_a_zoned_index(bars):
+    window = visible_window(bars, (bars.index[10].date().isoformat(), bars.index[20].date().isoformat()))
+
+    assert window.index[0] == bars.index[10] and window.index[-1] == bars.index[20]
+    assert visible_window(bars) is bars
+
+
+def test_zoomed_chart_shows_every_bar_in_the_window(long_bars):
+    full = render_candlestick_chart(long_bars, width_px=300)
+    zoomed = render_candlestick_chart(
+        long_bars, {'Close': long_bars['Close']},
+        x_range=(long_bars.index[100], long_bars.index[149]), width_px=300
+    )
+
+    assert len(full.data[0].x) == 100
+    assert len(zoomed.data[0].x) == 50 and len(zoomed.data[1].x) == 50
+    assert zoomed.data[0].x[0] == long_bars.index[100].value // 10 ** 6
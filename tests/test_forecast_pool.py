@@ -0,0 +1,169 @@
+import os
+import sys
+import types
+from concurrent.futures import Future
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from backend import ai_model
+from backend.ai_model import ProphetModelCache, prepare_data_for_prophet
+from backend.forecast_pool import ForecastPool, _chain
+from tests.conftest import make_bars
+
+PAGE = next((Path(__file__).parent.parent / 'pages').glob('1_*.py'))
+
+
+class FittedModel:
+    """Stands in for a fitted Prophet model when forecasting"""
+
+    def make_future_dataframe(self, periods):
+        return pd.DataFrame({'ds': pd.date_range('2024-01-01', periods=periods)})
+
+    def predict(self, future):
+        yhat = pd.Series(range(len(future)), dtype=float)
+        return future.assign(yhat=yhat, yhat_lower=yhat - 0.1, yhat_upper=yhat + 0.1)
+
+
+def test_chain_transforms_results_and_errors():
+    source, failing = Future(), Future()
+    chained = _chain(source, lambda value: value * 2)
+    broken = _chain(failing, lambda value: value)
+    source.set_result(21)
+    failing.set_exception(RuntimeError('fit failed'))
+
+    assert chained.result(1) == 42
+    with pytest.raises(RuntimeError):
+        broken.result(1)
+
+
+def test_cancelling_a_chained_future_cancels_the_job():
+    source = Future()
+    _chain(source, lambda value: value).cancel()
+    assert source.cancelled()
+
+
+def test_cached_prophet_fit_is_forecast_without_a_job(monkeypatch):
+    cache = ProphetModelCache()
+    monkeypatch.setattr(ai_model, 'default_prophet_cache', cache)
+    data = prepare_data_for_prophet(make_bars(100).tz_localize(None))
+    model = FittedModel()
+    cache.put(cache.make_key('AAPL', data, {}), model)
+
+    pool = ForecastPool(max_workers=1)
+    monkeypatch.setattr(pool, 'submit', lambda *args: pytest.fail('queued a job'))
+    cached, forecast, analysis = pool.submit_prophet(data, 'AAPL', periods=10).result(1)
+
+    assert cached is model
+    assert len(forecast) == 10 and analysis['trend']['description'] == 'strong upward'
+    pool.shutdown()
+
+
+def test_worker_fits_land_in_the_server_cache(monkeypatch):
+    pytest.importorskip('prophet')
+    cache = ProphetModelCache()
+    monkeypatch.setattr(ai_model, 'default_prophet_cache', cache)
+    data = prepare_data_for_prophet(make_bars(100).tz_localize(None))
+
+    pool = ForecastPool(max_workers=1)
+    model, forecast, _ = pool.submit_prophet(data, 'AAPL', periods=5).result(120)
+    pool.shutdown()
+
+    assert cache.get(cache.make_key('AAPL', data, {})) is model
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    """Fresh model registry and predictor pool for the server process"""
+    from backend import ml_predictor, resources
+    from backend.model_registry import ModelRegistry
+    registry = ModelRegistry()
+    monkeypatch.setattr(ml_predictor, 'default_registry', registry)
+    monkeypatch.setattr(resources, '_PREDICTOR_POOL', resources.PredictorPool())
+    return registry
+
+
+def test_ml_jobs_register_their_models_in_the_server(registry, thread_forecast_pool, monkeypatch):
+    data = make_bars(120)
+    prediction, confidence = thread_forecast_pool.submit_ml(data, 5, 'AAPL').result(60)
+    assert len(prediction) == 5 and confidence['data_points'] > 0
+    assert len(registry) == 1
+
+    # The next request for the same data predicts in this process from the registered model
+    monkeypatch.setattr(thread_forecast_pool, 'submit', lambda *args: pytest.fail('queued a job'))
+    cached, _ = thread_forecast_pool.submit_ml(data, 5, 'AAPL').result(1)
+    pd.testing.assert_frame_equal(cached, prediction)
+
+
+def test_ml_job_runs_in_a_worker_process(registry):
+    pool = ForecastPool(max_workers=1)
+    try:
+        prediction, _ = pool.submit_ml(make_bars(120), 3, 'AAPL').result(120)
+    finally:
+        pool.shutdown()
+
+    assert len(prediction) == 3 and len(registry) == 1
+
+
+def test_task_manager_polls_without_waiting_for_the_job(monkeypatch):
+    from frontend.memorybank import load_memorybank
+    import streamlit as st
+    tasks = load_memorybank('tasks')
+    monkeypatch.setattr(st, 'session_state', {})
+    task_id = tasks.TaskManager.create_task('forecast', 'Forecast AAPL')
+    future = Future()
+    tasks.TaskManager.track_future(task_id, future)
+
+    assert tasks.TaskManager.poll(timeout=0.01) == []
+    assert tasks.TaskManager.is_active(task_id)
+
+    future.set_result('done')
+    assert tasks.TaskManager.poll(timeout=0.01) == [task_id]
+    assert not tasks.TaskManager.is_active(task_id)
+    assert tasks.TaskManager.get_task(task_id).result == 'done'
+
+
+def test_ml_page_reports_a_failed_prediction(monkeypatch, registry, thread_forecast_pool):
+    from streamlit.testing.v1 import AppTest
+    from backend.ml_predictor import MLPredictor
+    from frontend import market_views
+
+    monkeypatch.setattr(market_views, 'load_market_data', lambda symbol, timeframe: make_bars(30))
+    monkeypatch.setattr(MLPredictor, 'predict', lambda self, *args, **kwargs: None)
+    page = AppTest.from_file(str(PAGE), default_timeout=30).run()
+    page.button(key='generate_pred_btn').click().run()
+
+    assert not page.exception
+    assert any('Could not generate a prediction' in error.value for error in page.error)
+
+
+def test_ml_page_charts_the_pool_prediction(monkeypatch, registry, thread_forecast_pool):
+    from streamlit.testing.v1 import AppTest
+    from frontend import market_views
+
+    monkeypatch.setattr(market_views, 'load_market_data', lambda symbol, timeframe: make_bars(120))
+    page = AppTest.from_file(str(PAGE), default_timeout=30).run()
+    page.button(key='generate_pred_btn').click().run()
+
+    assert not page.exception and not page.error
+    assert [metric.label for metric in page.metric] == ['Current Price', 'Predicted Price (End of Period)']
+
+
+def test_workers_do_not_run_the_page_script(monkeypatch, tmp_path):
+    # Streamlit installs the running page as __main__, __file__ included
+    marker = tmp_path / 'ran'
+    script = tmp_path / 'page.py'
+    script.write_text(f"open({str(marker)!r}, 'a').close()\n")
+    page = types.ModuleType('__main__')
+    page.__file__ = str(script)
+    monkeypatch.setitem(sys.modules, '__main__', page)
+
+    pool = ForecastPool(max_workers=1)
+    try:
+        assert pool.submit(os.getpid).result(60) != os.getpid()
+    finally:
+        pool.shutdown()
+
+    assert sys.modules['__main__'] is page
+    assert not marker.exists()
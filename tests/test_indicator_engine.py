@@ -0,0 +1,124 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from backend.indicator_engine import (
+    TECHNICAL_INDICATORS, IndicatorEngine, compute_indicators, ewm_mean, fill_gaps
+)
+from tests.conftest import make_bars
+
+
+@pytest.fixture
+def close(bars) -> pd.Series:
+    return bars['Close']
+
+
+def pandas_rsi(close, window=14, min_periods=None):
+    delta = close.diff()
+    gain = delta.where(delta > 0, 0).rolling(window, min_periods=min_periods).mean()
+    loss = (-delta.where(delta < 0, 0)).rolling(window, min_periods=min_periods).mean()
+    return 100 - 100 / (1 + gain / loss)
+
+
+@pytest.mark.parametrize('window, min_periods', [(20, None), (20, 5), (50, 10)])
+def test_sma_and_std_match_pandas(close, window, min_periods):
+    engine = IndicatorEngine(close)
+    rolling = close.rolling(window, min_periods=min_periods)
+
+    np.testing.assert_allclose(engine.sma(window, min_periods), rolling.mean(), rtol=1e-10)
+    np.testing.assert_allclose(engine.rolling_std(window, min_periods), rolling.std(), rtol=1e-8)
+
+
+def test_bollinger_matches_pandas(close):
+    upper, middle, lower = IndicatorEngine(close).bollinger(20)
+    mean, std = close.rolling(20).mean(), close.rolling(20).std()
+
+    np.testing.assert_allclose(upper, mean + 2 * std, rtol=1e-10)
+    np.testing.assert_allclose(lower, mean - 2 * std, rtol=1e-10)
+
+
+@pytest.mark.parametrize('adjust', [True, False])
+def test_ema_matches_pandas(close, adjust):
+    expected = close.ewm(span=12, adjust=adjust, min_periods=5).mean()
+    np.testing.assert_allclose(IndicatorEngine(close).ema(12, adjust, 5), expected, rtol=1e-10)
+
+
+@pytest.mark.parametrize('adjust', [True, False])
+def test_ewm_mean_skips_gaps_like_pandas(close, adjust):
+    gappy = close.copy()
+    gappy.iloc[[0, 1, 10, 11]] = np.nan
+    expected = gappy.ewm(alpha=0.2, adjust=adjust, min_periods=3).mean()
+    np.testing.assert_allclose(ewm_mean(gappy.to_numpy(), 0.2, adjust, 3), expected, rtol=1e-10)
+
+
+def test_ewm_mean_handles_gaps_per_column():
+    panel = pd.DataFrame({
+        'gappy': make_bars(40, seed=1)['Close'].to_numpy(),
+        'late': make_bars(40, seed=2)['Close'].to_numpy(),
+    })
+    panel.iloc[[12, 13, 20], 0] = np.nan
+    panel.iloc[:5, 1] = np.nan
+    expected = panel.ewm(span=9, adjust=False).mean()
+    np.testing.assert_allclose(ewm_mean(panel.to_numpy(), 0.2, adjust=False), expected, rtol=1e-10)
+
+
+def test_rsi_matches_pandas(close):
+    engine = IndicatorEngine(close)
+
+    np.testing.assert_allclose(engine.rsi(14, min_periods=1), pandas_rsi(close, 14, 1), rtol=1e-8)
+    wilder_gain = close.diff().clip(lower=0).fillna(0).ewm(alpha=1 / 14, adjust=False, min_periods=14).mean()
+    wilder_loss = (-close.diff()).clip(lower=0).fillna(0).ewm(alpha=1 / 14, adjust=False, min_periods=14).mean()
+    expected = 100 - 100 / (1 + wilder_gain / wilder_loss)
+    np.testing.assert_allclose(engine.rsi(14, method='wilder'), expected, rtol=1e-8)
+
+
+def test_macd_matches_pandas(close):
+    macd, signal = IndicatorEngine(close).macd(adjust=True)
+    line = close.ewm(span=12).mean() - close.ewm(span=26).mean()
+
+    np.testing.assert_allclose(macd, line, rtol=1e-10)
+    np.testing.assert_allclose(signal, line.ewm(span=9).mean(), rtol=1e-10)
+
+
+def test_vwap_matches_pandas(bars):
+    expected = (bars['Close'] * bars['Volume']).cumsum() / bars['Volume'].cumsum()
+    np.testing.assert_allclose(IndicatorEngine(bars['Close'], bars['Volume']).vwap(), expected, rtol=1e-10)
+
+
+def test_vwap_needs_volume(close):
+    with pytest.raises(ValueError):
+        IndicatorEngine(close).vwap()
+
+
+def test_intermediates_are_shared(close):
+    engine = IndicatorEngine(close)
+    engine.sma(20)
+    cumsum = engine._cache['cumsum']
+    engine.sma(50)
+    engine.bollinger(20)
+
+    assert engine._cache['cumsum'] is cumsum
+    assert engine.sma(20) is engine.sma(20)
+
+
+def test_compute_follows_the_spec(bars):
+    spec = dict(TECHNICAL_INDICATORS)
+    spec[('BB_Upper', None, 'BB_Lower')] = ('bollinger', {'window': 20})
+    result = compute_indicators(bars, spec)
+
+    assert list(result.columns) == ['SMA20', 'SMA50', 'RSI', 'MACD', 'Signal_Line', 'BB_Upper', 'BB_Lower']
+    np.testing.assert_allclose(result['SMA50'], bars['Close'].rolling(50, min_periods=10).mean(), rtol=1e-10)
+
+
+def test_fill_gaps_matches_ffill_bfill_fillna():
+    values = np.array([
+        [np.nan, np.nan, 1.0],
+        [2.0, np.nan, np.nan],
+        [np.nan, np.nan, 3.0],
+        [4.0, np.nan, np.nan],
+    ])
+    expected = pd.DataFrame(values).ffill().bfill().fillna(0).to_numpy()
+    np.testing.assert_array_equal(fill_gaps(values.copy()), expected)
+
+    leading = np.array([np.nan, np.nan, 1.0, 2.0])
+    np.testing.assert_array_equal(fill_gaps(leading), [1.0, 1.0, 1.0, 2.0])
@@ -0,0 +1,74 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from backend.indicator_engine import TECHNICAL_INDICATORS
+from backend.indicators import (
+    build_panel, calculate_bollinger_bands, calculate_bollinger_bands_panel, calculate_ema,
+    calculate_ema_panel, calculate_indicators, calculate_indicators_panel, calculate_macd,
+    calculate_macd_panel, calculate_rsi, calculate_rsi_panel, calculate_sma, calculate_sma_panel,
+    calculate_vwap, calculate_vwap_panel
+)
+from tests.conftest import make_bars
+
+
+@pytest.fixture
+def frames():
+    # A 7-day crypto calendar next to a 5-day stock calendar, plus a late listing
+    return {
+        'BTC-USD': make_bars(200, freq='D', tz='UTC', seed=1, price=60000.0),
+        'AAPL': make_bars(140, seed=2, price=180.0),
+        'MSFT': make_bars(140, seed=3, price=400.0),
+        'NEW': make_bars(40, seed=4, price=20.0),
+    }
+
+
+def single(frame):
+    frame = frame.copy()
+    frame.index = frame.index.tz_localize(None)
+    return frame
+
+
+def assert_column_matches(panel, frames, single_result):
+    for symbol, frame in frames.items():
+        expected = single_result(single(frame))
+        actual = panel[symbol].dropna()
+        expected = expected.dropna()
+        assert actual.index.equals(expected.index), symbol
+        np.testing.assert_allclose(actual, expected, rtol=1e-9, err_msg=symbol)
+
+
+def test_build_panel_outer_joins_on_wall_clock_time(frames):
+    close = build_panel(frames)
+
+    assert list(close.columns) == list(frames)
+    assert close.index.tz is None and close.index.is_monotonic_increasing
+    assert close['AAPL'].count() == 140 and close['BTC-USD'].count() == 200
+
+
+def test_mixed_calendar_panels_match_single_symbol_results(frames):
+    close = build_panel(frames)
+
+    assert_column_matches(calculate_sma_panel(close, 20), frames, lambda data: calculate_sma(data, 20))
+    assert_column_matches(calculate_ema_panel(close, 12), frames, lambda data: calculate_ema(data, 12))
+    assert_column_matches(calculate_rsi_panel(close), frames, calculate_rsi)
+    for panel, line in zip(calculate_macd_panel(close), range(2)):
+        assert_column_matches(panel, frames, lambda data: calculate_macd(data)[line])
+    for panel, band in zip(calculate_bollinger_bands_panel(close), range(2)):
+        assert_column_matches(panel, frames, lambda data: calculate_bollinger_bands(data)[band])
+
+
+def test_mixed_calendar_vwap_and_spec_match_single_symbol_results(frames):
+    close, volume = build_panel(frames), build_panel(frames, 'Volume')
+
+    assert_column_matches(calculate_vwap_panel(close, volume), frames, calculate_vwap)
+    panels = calculate_indicators_panel(close, TECHNICAL_INDICATORS, volume)
+    for name, panel in panels.items():
+        assert_column_matches(panel, frames, lambda data: calculate_indicators(data, TECHNICAL_INDICATORS)[name])
+
+
+def test_panel_keeps_missing_rows_missing(frames):
+    close = build_panel(frames)
+    sma = calculate_sma_panel(close, 5)
+
+    assert sma['AAPL'][close['AAPL'].isna()].isna().all()
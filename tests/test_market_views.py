@@ -0,0 +1,107 @@
+import json
+
+import pandas as pd
+import pytest
+
+from backend.data_loader import DataLoader
+from backend.shared_cache import SharedCache
+from frontend import market_views
+from tests.conftest import ROOT, make_bars
+
+
+class FakeLoader:
+    """Serves bars for the symbols in `bars`, failing for the rest like demo_fallback=False"""
+
+    def __init__(self):
+        self.bars = {}
+        self.fetches = []
+
+    def get_market_data(self, symbol, period, demo_fallback=True):
+        assert not demo_fallback
+        self.fetches.append(symbol)
+        data = self.bars.get(symbol)
+        return None if data is None else data.copy()
+
+    get_technical_indicators = staticmethod(DataLoader.get_technical_indicators)
+
+
+def candles(app) -> list:
+    """x values of the candlestick trace an AppTest run rendered"""
+    [chart] = app.get('plotly_chart')
+    return json.loads(chart.proto.figure.spec)['data'][0]['x']
+
+
+@pytest.fixture
+def loader(monkeypatch) -> FakeLoader:
+    loader = FakeLoader()
+    monkeypatch.setattr(market_views, 'get_data_loader', lambda: loader)
+    monkeypatch.setattr(market_views, 'shared_cache', SharedCache())
+    return loader
+
+
+def test_bars_are_fetched_once_for_every_view_and_spelling(loader):
+    loader.bars['AAPL'] = make_bars(120)
+
+    data = market_views.load_market_data('AAPL', '1y')
+    assert market_views.load_market_data(' aapl', '1y').equals(data)
+    assert 'RSI' in market_views.load_indicator_data('AAPL', '1y').columns
+    assert market_views.price_action_figure('AAPL', '1y') is not None
+
+    assert loader.fetches == ['AAPL']
+    assert market_views.shared_cache.stats()['entries'] == 3
+
+
+def test_failed_fetches_are_not_cached(loader):
+    assert market_views.load_market_data('AAPL', '1y') is None
+    assert market_views.load_indicator_data('AAPL', '1y') is None
+    assert market_views.price_action_figure('AAPL', '1y') is None
+    assert market_views.shared_cache.stats()['entries'] == 0
+
+    # The next rerun fetches again and gets the real bars once they are back
+    loader.bars['AAPL'] = make_bars(120)
+    pd.testing.assert_frame_equal(market_views.load_market_data('AAPL', '1y'), loader.bars['AAPL'])
+    assert loader.fetches == ['AAPL'] * 4
+
+
+def test_sessions_get_their_own_copy(loader):
+    loader.bars['AAPL'] = make_bars(60)
+
+    data = market_views.load_indicator_data('AAPL', '1y')
+    data['Signal'] = 1
+    data.loc[data.index[-1], 'Close'] = 0.0
+
+    again = market_views.load_indicator_data('AAPL', '1y')
+    assert 'Signal' not in again.columns and again['Close'].iloc[-1] > 0
+
+
+def test_home_chart_zooms_to_the_slider_range(loader):
+    from streamlit.testing.v1 import AppTest
+    bars = loader.bars['AAPL'] = make_bars(1000)
+
+    home = AppTest.from_file(str(ROOT / 'Home.py'), default_timeout=30).run()
+    assert not home.exception
+    [zoom] = home.slider
+    assert zoom.value == (bars.index[0].date(), bars.index[-1].date())
+    assert len(candles(home)) == 400
+
+    zoom.set_value((bars.index[100].date(), bars.index[149].date())).run()
+    assert not home.exception
+    assert len(candles(home)) == 50
+    assert loader.fetches == ['AAPL']
+
+
+def test_cache_holds_compact_bars_and_sessions_get_full_ones(loader):
+    bars = loader.bars['AAPL'] = make_bars(2520)
+
+    data = market_views.load_market_data('AAPL', '5y')
+    indicators = market_views.load_indicator_data('AAPL', '5y')
+
+    assert data.dtypes.to_dict() == bars.dtypes.to_dict() and list(data.columns) == list(bars.columns)
+    expected = DataLoader.get_technical_indicators(bars)
+    assert list(indicators.columns) == list(expected.columns)
+    pd.testing.assert_frame_equal(indicators, expected, check_exact=False, atol=1e-4)
+
+    [cached_bars] = [value for _, value in market_views.shared_cache.items()
+                     if 'RSI' not in value['data'].columns]
+    assert cached_bars['data']['Close'].dtype == 'float32'
+    assert cached_bars['bytes'] < bars.memory_usage(deep=True).sum() / 2
@@ -0,0 +1,119 @@
+import threading
+
+import numpy as np
+import pytest
+
+from backend import ml_predictor
+from backend.ml_predictor import MLPredictor, ThreadBudget
+from backend.model_registry import ModelRegistry
+from tests.conftest import make_bars
+
+
+@pytest.fixture
+def history():
+    return make_bars(250)
+
+
+def predictor(**kwargs):
+    model = MLPredictor(registry=ModelRegistry(), **kwargs)
+    model.params['n_estimators'] = 10
+    return model
+
+
+def test_n_jobs_does_not_change_predictions(history):
+    serial = predictor(n_jobs=1).predict(history.copy(), 5)
+    parallel = predictor(n_jobs=2).predict(history.copy(), 5)
+
+    np.testing.assert_allclose(serial['Predicted'], parallel['Predicted'])
+
+
+@pytest.mark.parametrize('horizon_mode', ['recursive', 'direct'])
+def test_predictions_cover_every_day_ahead(history, horizon_mode):
+    model = predictor(n_jobs=1, horizon_mode=horizon_mode)
+    prediction = model.predict(history.copy(), 7)
+
+    assert len(prediction) == 7
+    assert prediction.index.is_monotonic_increasing
+    assert np.isfinite(prediction['Predicted']).all()
+
+
+def test_direct_mode_trains_one_output_per_day(history):
+    model = predictor(n_jobs=1, horizon_mode='direct')
+    model.predict(history.copy(), 7)
+
+    assert model.model.n_outputs_ == 7
+
+
+def test_short_history_is_rejected():
+    assert predictor(n_jobs=1).predict(make_bars(40), 5) is None
+
+
+def test_holdout_is_the_most_recent_rows(history):
+    model = predictor(n_jobs=1)
+    X, y, df, features = model.fit(history.copy())
+
+    # The score comes from the last 20% of rows, which the forest never saw
+    test_rows = int(np.ceil(len(X) * 0.2))
+    assert model.confidence['training_samples'] == len(X) - test_rows
+    assert model.confidence['model_score'] == pytest.approx(model.model.score(X[-test_rows:], y[-test_rows:]))
+
+
+@pytest.mark.parametrize('horizon', [1, 5])
+def test_walk_forward_folds_only_train_on_the_past(history, horizon):
+    folds = predictor(n_jobs=1).walk_forward(history.copy(), n_splits=4, horizon=horizon)
+
+    assert list(folds.index) == [1, 2, 3, 4]
+    assert (folds['train_end'] < folds['test_start']).all()
+    assert folds['training_samples'].is_monotonic_increasing
+    assert (folds['test_start'].iloc[1:].to_numpy() > folds['test_end'].iloc[:-1].to_numpy()).all()
+    assert {'MSE', 'RMSE', 'MAE', 'R2'} <= set(folds.columns)
+
+
+def test_walk_forward_rejects_too_few_rows():
+    assert predictor(n_jobs=1).walk_forward(make_bars(60), n_splits=60) is None
+
+
+def test_thread_budget_splits_between_holders():
+    budget = ThreadBudget(4)
+    granted = []
+    waiter = threading.Thread(target=lambda: granted.append(budget.threads(2).__enter__()))
+    with budget.threads(3) as first:
+        with budget.threads(3) as second:
+            # Nothing is free, so a third fit waits
+            waiter.start()
+            waiter.join(0.1)
+            assert waiter.is_alive() and not granted
+        waiter.join(1)
+
+    assert (first, second) == (3, 1)
+    assert granted == [1]
+
+
+def test_concurrent_fits_share_the_thread_budget(history, monkeypatch):
+    budget = ThreadBudget(3)
+    monkeypatch.setattr(ml_predictor, 'thread_budget', budget)
+    used = []
+    new_model = MLPredictor._new_model
+    monkeypatch.setattr(MLPredictor, '_new_model', lambda self, n_jobs: used.append(n_jobs) or new_model(self, n_jobs))
+
+    with budget.threads(2):
+        model = predictor(n_jobs=8)
+        model.fit(history.copy())
+    predictor(n_jobs=8).fit(history.copy())
+
+    assert used == [1, 3]
+    assert model.model.n_jobs == 1
+
+
+def test_walk_forward_processes_come_out_of_the_thread_budget(history, monkeypatch):
+    import joblib
+    budget = ThreadBudget(4)
+    monkeypatch.setattr(ml_predictor, 'thread_budget', budget)
+    used = []
+    parallel = joblib.Parallel
+    monkeypatch.setattr(joblib, 'Parallel', lambda n_jobs: used.append(n_jobs) or parallel(n_jobs=1))
+
+    with budget.threads(3):
+        predictor(n_jobs=4).walk_forward(history.copy(), n_splits=3)
+
+    assert used == [1]
@@ -0,0 +1,76 @@
+import numpy as np
+import pytest
+
+from backend.ml_predictor import MLPredictor
+from backend.model_registry import ModelEntry, ModelRegistry, data_fingerprint
+from tests.conftest import make_bars
+
+
+def small_predictor(registry, **kwargs):
+    predictor = MLPredictor(registry=registry, n_jobs=1, **kwargs)
+    predictor.params['n_estimators'] = 10
+    return predictor
+
+
+def test_registry_evicts_least_recently_used():
+    registry = ModelRegistry(max_entries=2)
+    for key in 'abc':
+        registry.put(key, ModelEntry(key, None))
+        if key == 'b':
+            registry.get('a')
+
+    assert registry.get('b') is None
+    assert registry.get('a').model == 'a' and registry.get('c').model == 'c'
+    assert len(registry) == 2
+
+
+def test_registry_reloads_persisted_models(tmp_path):
+    ModelRegistry(persist_dir=tmp_path).put('key', ModelEntry({'weights': [1, 2]}, None, {'model_score': 0.5}))
+
+    entry = ModelRegistry(persist_dir=tmp_path).get('key')
+
+    assert entry.model == {'weights': [1, 2]} and entry.confidence == {'model_score': 0.5}
+    registry = ModelRegistry(persist_dir=tmp_path)
+    registry.clear()
+    assert registry.get('key') is None
+
+
+def test_keys_change_with_data_and_params(bars):
+    features = ['Close']
+    key = ModelRegistry.make_key('AAPL', bars, features, {'n_estimators': 10})
+
+    assert key == ModelRegistry.make_key('AAPL', bars.copy(), features, {'n_estimators': 10})
+    assert key != ModelRegistry.make_key('AAPL', bars.iloc[:-1], features, {'n_estimators': 10})
+    assert key != ModelRegistry.make_key('MSFT', bars, features, {'n_estimators': 10})
+    assert key != ModelRegistry.make_key('AAPL', bars, features, {'n_estimators': 20})
+    assert data_fingerprint(bars, features)[1] == len(bars)
+
+
+def test_predictor_reuses_models_fitted_on_the_same_data(monkeypatch):
+    bars = make_bars(200)
+    registry = ModelRegistry()
+    first = small_predictor(registry)
+    prediction = first.predict(bars.copy(), 5, symbol='AAPL')
+
+    fits = []
+    second = small_predictor(registry)
+    monkeypatch.setattr(second, 'train', lambda X, y: fits.append(1))
+    again = second.predict(bars.copy(), 5, symbol='AAPL')
+
+    assert not fits
+    assert second.model is first.model
+    np.testing.assert_allclose(again['Predicted'], prediction['Predicted'])
+    assert len(registry) == 1
+
+
+def test_predictor_refits_when_the_data_changes():
+    bars = make_bars(200)
+    registry = ModelRegistry()
+    predictor = small_predictor(registry)
+    predictor.predict(bars.iloc[:-1].copy(), 5, symbol='AAPL')
+    model = predictor.model
+
+    predictor.predict(bars.copy(), 5, symbol='AAPL')
+
+    assert predictor.model is not model
+    assert len(registry) == 2
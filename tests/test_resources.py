@@ -0,0 +1,99 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from backend import ml_predictor, resources
+from backend.model_registry import ModelRegistry
+from backend.resources import PredictorPool, get_data_loader, get_predictor_pool
+from tests.conftest import make_bars
+
+
+@pytest.fixture
+def pool(monkeypatch) -> PredictorPool:
+    # Slots create predictors on the default registry; keep it per test
+    monkeypatch.setattr(ml_predictor, 'default_registry', ModelRegistry())
+    return PredictorPool(max_symbols=2, n_jobs=1)
+
+
+def borrowed(pool, symbol, horizon_mode='recursive'):
+    with pool.borrow(symbol, horizon_mode) as predictor:
+        return predictor
+
+
+def test_sessions_share_one_predictor_per_symbol_and_mode(pool):
+    predictor = borrowed(pool, 'AAPL')
+
+    assert borrowed(pool, ' aapl ') is predictor
+    assert borrowed(pool, 'AAPL', 'direct') is not predictor
+    assert borrowed(pool, 'AAPL', 'direct').horizon_mode == 'direct'
+    assert predictor.n_jobs == 1
+
+
+def test_a_model_trained_in_one_session_serves_the_next(pool):
+    with pool.borrow('AAPL') as predictor:
+        predictor.params['n_estimators'] = 5
+        assert predictor.predict(make_bars(250), 3, symbol='AAPL') is not None
+        model = predictor.model
+
+    with pool.borrow('AAPL') as predictor:
+        assert predictor.model is model
+
+    [slot] = pool.describe()
+    assert slot['trained'] and slot['uses'] == 2 and slot['bytes'] > 0
+
+
+def test_least_recently_used_symbols_are_dropped(pool):
+    aapl = borrowed(pool, 'AAPL')
+    borrowed(pool, 'MSFT')
+    borrowed(pool, 'AAPL')
+    borrowed(pool, 'TSLA')
+
+    assert len(pool) == 2
+    assert {slot['symbol'] for slot in pool.describe()} == {'AAPL', 'TSLA'}
+    assert borrowed(pool, 'AAPL') is aapl
+
+
+def test_invalidate_drops_a_symbol_or_everything(pool):
+    aapl = borrowed(pool, 'AAPL')
+    borrowed(pool, 'AAPL', 'direct')
+    msft = borrowed(pool, 'MSFT')
+
+    pool.invalidate('aapl')
+    assert borrowed(pool, 'MSFT') is msft
+    assert borrowed(pool, 'AAPL') is not aapl
+
+    pool.invalidate()
+    assert len(pool) == 0
+
+
+def test_borrowing_a_symbol_waits_for_the_session_using_it(pool):
+    inside, release = threading.Event(), threading.Event()
+
+    def hold():
+        with pool.borrow('AAPL'):
+            inside.set()
+            release.wait(5)
+
+    with ThreadPoolExecutor(2) as executor:
+        holder = executor.submit(hold)
+        assert inside.wait(5)
+        # Other symbols are not blocked
+        assert borrowed(pool, 'MSFT') is not None
+        waiting = executor.submit(borrowed, pool, 'AAPL')
+        with pytest.raises(TimeoutError):
+            waiting.result(timeout=0.2)
+        release.set()
+        holder.result(5)
+        assert waiting.result(5) is borrowed(pool, 'AAPL')
+
+
+def test_process_wide_resources_are_created_once(monkeypatch):
+    monkeypatch.setattr(resources, '_PREDICTOR_POOL', None)
+    monkeypatch.setattr(resources, '_DATA_LOADER', None)
+
+    with ThreadPoolExecutor(4) as executor:
+        pools = set(map(id, executor.map(lambda _: get_predictor_pool(), range(8))))
+        loaders = set(map(id, executor.map(lambda _: get_data_loader(), range(8))))
+
+    assert len(pools) == 1 and len(loaders) == 1
@@ -0,0 +1,147 @@
+import threading
+import time
+
+import pandas as pd
+import pytest
+
+from backend.retry import CircuitBreaker, FetchMethod, RetryEngine, RetryPolicy, is_present
+
+FAST = RetryPolicy(max_attempts=3, base_delay=0.0, max_delay=0.0, deadline=5.0, hedge_delay=0.05)
+
+
+def failing(message='boom'):
+    def func():
+        raise RuntimeError(message)
+    return func
+
+
+def test_first_success_falls_through_failed_methods():
+    engine = RetryEngine(FAST)
+    name, result = engine.first_success([('a', failing()), ('b', lambda: 42)])
+
+    assert (name, result) == ('b', 42)
+    assert engine.errors == ['a: boom']
+
+
+def test_retries_until_a_method_succeeds():
+    calls = []
+
+    def flaky():
+        calls.append(1)
+        if len(calls) < 3:
+            raise RuntimeError('throttled')
+        return 'ok'
+
+    assert RetryEngine(FAST).call(flaky) == 'ok'
+    assert len(calls) == 3
+
+
+def test_gives_up_after_max_attempts():
+    engine = RetryEngine(FAST)
+    assert engine.first_success([('a', failing())]) == (None, None)
+    assert len(engine.errors) == FAST.max_attempts
+
+
+def test_slow_method_is_hedged_by_the_next_one():
+    release = threading.Event()
+
+    def slow():
+        release.wait(2)
+        return 'slow'
+
+    try:
+        name, _ = RetryEngine(FAST).first_success([('slow', slow), ('fast', lambda: 'fast')])
+    finally:
+        release.set()
+    assert name == 'fast'
+
+
+def test_unhedged_method_waits_for_the_in_flight_ones():
+    release = threading.Event()
+    started = []
+
+    def slow():
+        release.wait(0.3)
+        raise RuntimeError('timeout')
+
+    def fallback():
+        started.append(time.monotonic())
+        return 'fallback'
+
+    begin = time.monotonic()
+    name, _ = RetryEngine(FAST).first_success([('slow', slow), FetchMethod('fallback', fallback, hedge=False)])
+
+    assert name == 'fallback'
+    assert started[0] - begin >= 0.25
+
+
+def test_no_hedging_after_breaker_failures():
+    breaker = CircuitBreaker(failure_threshold=10)
+    breaker.record_failure()
+    release = threading.Event()
+    launched = []
+
+    def slow():
+        release.wait(0.3)
+        return 'slow'
+
+    def other():
+        launched.append(1)
+        return 'other'
+
+    name, _ = RetryEngine(FAST, breaker).first_success([('slow', slow), ('other', other)])
+    assert name == 'slow' and not launched
+
+
+def test_empty_results_do_not_trip_the_breaker():
+    breaker = CircuitBreaker(failure_threshold=1)
+    RetryEngine(FAST, breaker).call(lambda: pd.DataFrame())
+
+    assert breaker.state == 'closed'
+
+
+def test_exceptions_open_the_breaker_and_stop_calls():
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+    calls = []
+
+    def func():
+        calls.append(1)
+        raise RuntimeError('down')
+
+    RetryEngine(FAST, breaker).call(func)
+    assert breaker.state == 'open' and len(calls) == 2
+
+    assert RetryEngine(FAST, breaker).call(func) is None
+    assert len(calls) == 2
+
+
+def test_breaker_half_opens_after_the_reset_timeout():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.05)
+    breaker.record_failure()
+    assert not breaker.allow()
+    time.sleep(0.06)
+    assert breaker.state == 'half-open' and breaker.allow()
+    breaker.record_success()
+    assert breaker.state == 'closed' and breaker.failures == 0
+
+
+def test_is_present_accepts_empty_frames():
+    engine = RetryEngine(FAST, is_valid=is_present)
+    assert engine.call(lambda: pd.DataFrame()).empty
+
+
+def test_empty_top_up_serves_stored_bars_and_refreshes_them(monkeypatch, loader):
+    from backend import data_loader
+    from tests.conftest import make_bars
+    monkeypatch.setattr(loader.store, 'is_fresh', lambda symbol, interval='1d': False)
+    bars = make_bars(60)
+    loader.store.save('AAPL', '1d', bars)
+    touched = []
+    monkeypatch.setattr(loader.store, 'touch', lambda symbol, interval='1d': touched.append(symbol))
+    monkeypatch.setattr(data_loader, 'fetch_history', lambda *args, **kwargs: pd.DataFrame())
+
+    data = loader.get_market_data('AAPL', '1mo')
+
+    assert data.index[-1] == bars.index[-1]
+    assert touched == ['AAPL']
+    assert data_loader.get_breaker(data_loader.YAHOO_HOST).failures == 0
@@ -0,0 +1,60 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from backend import sweep
+from backend.backtest import STRATEGIES, run_backtest
+from backend.forecast_pool import WORKER_CONTEXT
+from backend.sweep import param_grid, run_sweep
+from tests.conftest import make_bars
+
+
+@pytest.fixture
+def close():
+    return pd.DataFrame({symbol: make_bars(250, seed=seed)['Close'] for seed, symbol in enumerate(['A', 'B'])})
+
+
+GRID = {'fast': [5, 10, 20], 'slow': [10, 30, 50]}
+
+
+def test_param_grid_skips_inverted_pairs():
+    combos = param_grid(GRID)
+
+    assert {'fast': 20, 'slow': 10} not in combos
+    assert len(combos) == 7
+    assert all(params['lower'] < params['upper'] for params in param_grid({'lower': [20, 40], 'upper': [30, 60]}))
+
+
+def test_in_process_sweep_matches_single_backtests(close):
+    results = run_sweep(close, STRATEGIES['Moving Average Crossover'], GRID, fee=0.001, max_workers=1)
+
+    assert list(results.index) == list(range(1, 8))
+    assert results['sharpe_ratio'].is_monotonic_decreasing
+    best = results.iloc[0]
+    single = run_backtest(close, STRATEGIES['Moving Average Crossover'], fee=0.001,
+                          fast=int(best['fast']), slow=int(best['slow']))
+    assert best['total_return'] == pytest.approx(single.summary()['total_return'].mean())
+    assert best['trades'] == single.summary()['trades'].sum()
+
+
+def test_pool_sweep_matches_in_process_sweep(close):
+    grid = {'window': [7, 14], 'lower': [20, 30], 'upper': [70, 80]}
+    serial = run_sweep(close, STRATEGIES['RSI Strategy'], grid, max_workers=1)
+    pooled = run_sweep(close, STRATEGIES['RSI Strategy'], grid)
+    # A second sweep reuses the same worker processes with a new shared block
+    again = run_sweep(close * 2, STRATEGIES['RSI Strategy'], grid)
+
+    pd.testing.assert_frame_equal(pooled, serial)
+    np.testing.assert_allclose(np.sort(again['total_return']), np.sort(serial['total_return']))
+    assert sweep.get_sweep_pool() is sweep.get_sweep_pool()
+    assert sweep.get_sweep_pool()._max_workers == sweep.SWEEP_WORKERS
+    # Started like the forecast workers, so they never re-run the Streamlit page
+    assert sweep.get_sweep_pool()._mp_context is WORKER_CONTEXT
+
+
+def test_worker_count_is_capped(monkeypatch, close):
+    chunks = []
+    monkeypatch.setattr(sweep, '_chunks', lambda combos, count: chunks.append(count) or [combos])
+    run_sweep(close, STRATEGIES['Moving Average Crossover'], GRID, max_workers=64)
+
+    assert chunks == [sweep.SWEEP_WORKERS * 4]
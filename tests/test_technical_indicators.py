@@ -0,0 +1,70 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from backend.data_loader import DataLoader
+from tests.conftest import make_bars
+
+
+def pandas_indicators(data):
+    """The whole-frame pipeline get_technical_indicators replaced"""
+    df = data.copy()
+    df['SMA20'] = df['Close'].rolling(window=20, min_periods=5).mean()
+    df['SMA50'] = df['Close'].rolling(window=50, min_periods=10).mean()
+    delta = df['Close'].diff()
+    gain = delta.where(delta > 0, 0).rolling(window=14, min_periods=1).mean()
+    loss = (-delta.where(delta < 0, 0)).rolling(window=14, min_periods=1).mean()
+    # 100 for windows without losses
+    df['RSI'] = 100 * gain / (gain + loss)
+    exp1 = df['Close'].ewm(span=12, adjust=False, min_periods=12).mean()
+    exp2 = df['Close'].ewm(span=26, adjust=False, min_periods=26).mean()
+    df['MACD'] = exp1 - exp2
+    df['Signal_Line'] = df['MACD'].ewm(span=9, adjust=False, min_periods=9).mean()
+    return df.ffill().bfill().fillna(0)
+
+
+@pytest.fixture
+def gappy_bars() -> pd.DataFrame:
+    bars = make_bars(120)
+    bars.loc[bars.index[:3], 'Volume'] = np.nan
+    bars.loc[bars.index[40], ['Open', 'Close']] = np.nan
+    return bars
+
+
+@pytest.mark.parametrize('periods', [8, 30, 120])
+def test_matches_the_pandas_pipeline(periods):
+    bars = make_bars(periods)
+    result = DataLoader.get_technical_indicators(bars)
+
+    pd.testing.assert_frame_equal(result, pandas_indicators(bars), rtol=1e-9)
+
+
+@pytest.mark.parametrize('seed', [1, 6, 7, 9])
+def test_rsi_of_a_run_of_gains_at_the_start_is_100(seed):
+    bars = make_bars(60, seed=seed)
+    result = DataLoader.get_technical_indicators(bars)
+
+    pd.testing.assert_frame_equal(result, pandas_indicators(bars), rtol=1e-9)
+    assert result['RSI'].iloc[1] == 100
+
+
+def test_fills_gaps_in_bars_and_indicators_like_pandas(gappy_bars):
+    result = DataLoader.get_technical_indicators(gappy_bars)
+
+    assert not result.isna().any().any()
+    pd.testing.assert_frame_equal(result, pandas_indicators(gappy_bars), rtol=1e-9)
+
+
+def test_leaves_the_input_bars_untouched(gappy_bars):
+    before = gappy_bars.copy()
+    result = DataLoader.get_technical_indicators(gappy_bars)
+    # Pages add their own columns to the result
+    result['Signal'] = 1
+    result.loc[result.index[0], 'SMA20'] = -1.0
+
+    pd.testing.assert_frame_equal(gappy_bars, before)
+
+
+@pytest.mark.parametrize('data', [None, make_bars(0)])
+def test_missing_bars_give_none(data):
+    assert DataLoader.get_technical_indicators(data) is None